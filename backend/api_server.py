@@ -122,7 +122,8 @@ def automation_thread(config: AutomationConfig):
         automator = VideoAutomator(
             platform=config.platform, 
             headless=True,  # Run in headless mode for API
-            playback_speed=config.playback_speed
+            playback_speed=config.playback_speed,
+            lean=True  # Nobody watches the headless browser - skip images, ads, audio and HD video
         )
         
         automation_state["automator"] = automator
@@ -0,0 +1,380 @@
+"""
+Browser Automation Benchmark
+Measures VideoAutomator and QuizSolver speed and per-session resource use
+
+Usage:
+    # Full playlist + quiz flows against the local fixture site (no internet needed)
+    python benchmark_automation.py --fixture --videos 5 --video-seconds 8
+    
+    # Selenium vs the async CDP backend (1 and N concurrent sessions)
+    python benchmark_automation.py --compare-backends --videos 6 --sessions 3
+    
+    # 200-video soak run: browser memory over time with the watchdog recycling the driver
+    python benchmark_automation.py --soak --videos 200 --video-seconds 4 --memory-limit 600
+    
+    # Per-session resource use on a real video (normal vs lean mode)
+    python benchmark_automation.py --platform youtube --url "https://www.youtube.com/watch?v=..." --seconds 60
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Dict, List
+import cdp_driver
+import multi_tab_automator
+import quiz_solver
+import video_automator
+from database import Database
+from fixture_site import FixtureSite
+from multi_tab_automator import MultiTabAutomator
+from quiz_solver import QuizSolver
+from selector_cache import use_selector_cache_file
+from video_automator import VideoAutomator
+
+
+# Bytes the page has downloaded so far (scripts, XHR/fetch media segments, images...)
+TRANSFER_SIZE_SCRIPT = """
+return performance.getEntriesByType('resource').reduce((total, e) => total + (e.transferSize || 0), 0);
+"""
+
+
+class RoundTripCounter:
+    """Counts WebDriver commands (each one is an HTTP round trip to chromedriver)"""
+    
+    def __init__(self, driver):
+        self.commands = Counter()
+        self._execute = driver.execute
+        driver.execute = self._counted_execute
+    
+    def _counted_execute(self, driver_command, params=None):
+        self.commands[driver_command] += 1
+        return self._execute(driver_command, params)
+    
+    @property
+    def total(self) -> int:
+        return sum(self.commands.values())
+
+
+class SleepMeter:
+    """Stands in for the `time` module inside the automation modules and adds up explicit sleeps"""
+    
+    def __init__(self):
+        self.total = 0.0
+        self.calls = 0
+    
+    def sleep(self, seconds):
+        self.total += seconds
+        self.calls += 1
+        time.sleep(seconds)
+    
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+SLEEP_METERED_MODULES = (video_automator, multi_tab_automator, quiz_solver)
+
+
+def run_fixture_flow(site: FixtureSite, platform: str, db_dir: str, playback_speed: float,
+                     quiz_questions: int = 1) -> Dict:
+    """automate_playlist + auto_solve_quiz for one platform against the fixture site"""
+    meter = SleepMeter()
+    for module in SLEEP_METERED_MODULES:
+        module.time = meter
+    
+    automator = VideoAutomator(platform, headless=True, playback_speed=playback_speed,
+                               profile_suffix=f'bench_{platform}')
+    automator.db = Database(db_path=os.path.join(db_dir, f'{platform}.db'))  # Keep benchmark runs out of real progress
+    result = {'platform': platform}
+    
+    try:
+        automator.init_driver()
+        counter = RoundTripCounter(automator.driver)
+        
+        start = time.time()
+        automator.automate_playlist(site.playlist_url(platform))
+        elapsed = time.time() - start
+        
+        result.update({
+            'seconds_per_video': round(elapsed / site.videos, 2),
+            'round_trips_per_video': round(counter.total / site.videos, 1),
+            'sleep_share': round(100 * meter.total / elapsed, 1) if elapsed else 0.0,
+            'ad_seconds': automator.get_ad_stats()['adSeconds']
+        })
+        
+        # YouTube has no quizzes
+        if platform != 'youtube':
+            solver = QuizSolver(platform, driver=automator.driver)
+            solver.db = automator.db
+            automator.driver.get(site.quiz_url(platform, quiz_questions))
+            
+            trips_before = counter.total
+            sleep_before = meter.total
+            start = time.time()
+            solved = solver.auto_solve_quiz()
+            result.update({
+                'quiz_seconds': round(time.time() - start, 2),
+                'quiz_round_trips': counter.total - trips_before,
+                'quiz_sleep_seconds': round(meter.total - sleep_before, 1),
+                'quiz_solved': solved
+            })
+    finally:
+        automator.close()
+        for module in SLEEP_METERED_MODULES:
+            module.time = time
+    
+    return result
+
+
+def print_fixture_results(results, site: FixtureSite):
+    print("\n" + "=" * 106)
+    print(f"Fixture site: {site.videos} videos x {site.video_seconds}s per platform")
+    print("-" * 106)
+    print(f"{'Platform':<10}{'s/video':>10}{'trips/video':>13}{'sleep %':>10}{'ad s':>10}"
+          f"{'quiz s':>10}{'quiz trips':>12}{'quiz sleep s':>14}{'solved':>9}")
+    print("-" * 106)
+    for r in results:
+        print(f"{r['platform']:<10}{r['seconds_per_video']:>10}{r['round_trips_per_video']:>13}{r['sleep_share']:>10}"
+              f"{r['ad_seconds']:>10}{str(r.get('quiz_seconds', '-')):>10}{str(r.get('quiz_round_trips', '-')):>12}"
+              f"{str(r.get('quiz_sleep_seconds', '-')):>14}{str(r.get('quiz_solved', '-')):>9}")
+    print("=" * 106)
+
+
+def run_backend_comparison(site: FixtureSite, platform: str, db_dir: str, playback_speed: float,
+                           sessions: int) -> List[Dict]:
+    """Same fixture playlist through Selenium (1 tab, N tabs) and the CDP backend (1 session, N sessions)"""
+    playlist_url = site.playlist_url(platform)
+    results = []
+    
+    def record(backend: str, session_count: int, run):
+        db_path = os.path.join(db_dir, f'{backend}_{session_count}.db')  # Fresh progress for every run
+        peak_threads = [threading.active_count()]
+        stop = threading.Event()
+        
+        def watch_threads():
+            while not stop.wait(0.5):
+                peak_threads[0] = max(peak_threads[0], threading.active_count())
+        
+        watcher = threading.Thread(target=watch_threads, daemon=True)
+        watcher.start()
+        start = time.time()
+        try:
+            run(db_path)
+        finally:
+            stop.set()
+        elapsed = time.time() - start
+        results.append({
+            'backend': backend,
+            'sessions': session_count,
+            'seconds': round(elapsed, 1),
+            'seconds_per_video': round(elapsed / site.videos, 2),
+            'python_threads': peak_threads[0] - 1  # Minus the watcher itself
+        })
+    
+    def selenium(tabs: int):
+        def run(db_path):
+            if tabs > 1:
+                automator = MultiTabAutomator(platform, headless=True, playback_speed=playback_speed, max_tabs=tabs,
+                                              profile_suffix='bench_tabs')
+            else:
+                automator = VideoAutomator(platform, headless=True, playback_speed=playback_speed,
+                                           profile_suffix='bench_backend')
+            automator.db = Database(db_path=db_path)
+            try:
+                automator.init_driver()
+                automator.automate_playlist(playlist_url)
+            finally:
+                automator.close()
+        return run
+    
+    def cdp(session_count: int):
+        def run(db_path):
+            asyncio.run(cdp_driver.run_sessions(platform, playlist_url, sessions=session_count,
+                                                playback_speed=playback_speed, db_path=db_path))
+        return run
+    
+    for backend, session_count, run in (('selenium', 1, selenium(1)), ('selenium', sessions, selenium(sessions)),
+                                        ('cdp', 1, cdp(1)), ('cdp', sessions, cdp(sessions))):
+        print(f"\n▶️  {backend} x{session_count}...")
+        record(backend, session_count, run)
+    return results
+
+
+def print_backend_results(results: List[Dict], site: FixtureSite):
+    print("\n" + "=" * 70)
+    print(f"Fixture site: {site.videos} videos x {site.video_seconds}s")
+    print("-" * 70)
+    print(f"{'Backend':<12}{'Sessions':>10}{'Total s':>12}{'s/video':>12}{'Py threads':>14}")
+    print("-" * 70)
+    for r in results:
+        print(f"{r['backend']:<12}{r['sessions']:>10}{r['seconds']:>12}{r['seconds_per_video']:>12}{r['python_threads']:>14}")
+    print("=" * 70)
+
+
+def run_soak(site: FixtureSite, platform: str, db_dir: str, playback_speed: float, memory_limit_mb: int) -> Dict:
+    """Play the whole fixture playlist while sampling browser RSS every 2 seconds in the background"""
+    automator = VideoAutomator(platform, headless=True, playback_speed=playback_speed, profile_suffix='bench_soak')
+    automator.db = Database(db_path=os.path.join(db_dir, 'soak.db'))
+    automator.memory_limit_mb = memory_limit_mb
+    automator.memory_check_interval = 10
+    
+    samples = []
+    stop = threading.Event()
+    
+    def sample():
+        start = time.time()
+        while not stop.wait(2):
+            usage = automator.get_browser_resource_usage()  # None while the browser is restarting
+            if usage:
+                samples.append((time.time() - start, usage['rss_mb']))
+    
+    sampler = threading.Thread(target=sample, daemon=True)
+    try:
+        automator.init_driver()
+        sampler.start()
+        start = time.time()
+        automator.automate_playlist(site.playlist_url(platform))
+        elapsed = time.time() - start
+    finally:
+        stop.set()
+        automator.close()
+    
+    return {
+        'videos': len(automator.db.get_completed_videos(platform)),
+        'minutes': round(elapsed / 60, 1),
+        'recycles': automator.driver_recycles,
+        'samples': samples
+    }
+
+
+def print_soak_results(result: Dict, memory_limit_mb: int):
+    samples = result['samples']
+    print("\n" + "=" * 70)
+    print(f"Soak run: {result['videos']} videos in {result['minutes']} min, "
+          f"limit {memory_limit_mb} MB, {result['recycles']} browser restart(s)")
+    print("-" * 70)
+    if not samples:
+        print("No memory samples (is psutil installed?)")
+    else:
+        # RSS at each tenth of the run
+        print(f"{'Elapsed (min)':>15}{'RSS (MB)':>12}")
+        for i in range(10):
+            elapsed, rss = samples[min(len(samples) - 1, i * len(samples) // 10)]
+            print(f"{elapsed / 60:>15.1f}{rss:>12}")
+        print("-" * 70)
+        print(f"Peak RSS: {max(rss for _, rss in samples)} MB   Final RSS: {samples[-1][1]} MB")
+    print("=" * 70)
+
+
+def measure_session(platform: str, url: str, seconds: int, lean: bool) -> Dict:
+    """Play one video for `seconds` and sample the browser's memory and CPU every 2 seconds"""
+    automator = VideoAutomator(platform, headless=True, lean=lean, profile_suffix='bench_lean' if lean else 'bench')
+    samples = []
+    
+    try:
+        automator.init_driver()
+        automator.driver.get(url)
+        automator.play_video()
+        
+        start_usage = automator.get_browser_resource_usage()
+        start = time.time()
+        while time.time() - start < seconds:
+            usage = automator.get_browser_resource_usage()
+            if usage:
+                samples.append(usage['rss_mb'])
+            time.sleep(2)
+        end_usage = automator.get_browser_resource_usage()
+        
+        transferred = automator.driver.execute_script(TRANSFER_SIZE_SCRIPT) or 0
+    finally:
+        automator.close()
+    
+    cpu_seconds = None
+    if start_usage and end_usage:
+        cpu_seconds = end_usage['cpu_seconds'] - start_usage['cpu_seconds']
+    
+    return {
+        'mode': 'lean' if lean else 'normal',
+        'peak_rss_mb': max(samples) if samples else None,
+        'avg_rss_mb': round(sum(samples) / len(samples), 1) if samples else None,
+        'cpu_percent': round(100 * cpu_seconds / seconds, 1) if cpu_seconds is not None else None,
+        'transferred_mb': round(transferred / (1024 * 1024), 2)
+    }
+
+
+def print_resource_results(results):
+    print("\n" + "=" * 70)
+    print(f"{'Mode':<10}{'Peak RSS (MB)':>16}{'Avg RSS (MB)':>16}{'CPU %':>10}{'Downloaded (MB)':>18}")
+    print("-" * 70)
+    for r in results:
+        print(f"{r['mode']:<10}{str(r['peak_rss_mb']):>16}{str(r['avg_rss_mb']):>16}"
+              f"{str(r['cpu_percent']):>10}{str(r['transferred_mb']):>18}")
+    print("=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the automation pipeline')
+    parser.add_argument('--platform', default='youtube', choices=['all', 'youtube', 'coursera', 'udemy', 'moodle'])
+    parser.add_argument('--fixture', action='store_true', help='Run full flows against the local fixture site')
+    parser.add_argument('--soak', action='store_true', help='Long fixture playlist with the memory watchdog on')
+    parser.add_argument('--compare-backends', action='store_true', help='Selenium vs async CDP on the fixture site')
+    parser.add_argument('--sessions', type=int, default=3, help='Concurrent tabs/sessions for --compare-backends')
+    parser.add_argument('--memory-limit', type=int, default=600, help='Watchdog limit (MB) for --soak')
+    parser.add_argument('--videos', type=int, default=5, help='Fixture videos per playlist')
+    parser.add_argument('--video-seconds', type=int, default=8, help='Length of each fixture video')
+    parser.add_argument('--quiz-questions', type=int, default=10, help='Questions on each fixture quiz page')
+    parser.add_argument('--speed', type=float, default=2.0, help='Playback speed for fixture runs')
+    parser.add_argument('--url', help='Video URL to play (resource benchmark)')
+    parser.add_argument('--seconds', type=int, default=60, help='How long to play each session')
+    args = parser.parse_args()
+    
+    # Selector statistics from fixture pages would skew the real ordering
+    use_selector_cache_file(os.path.join(tempfile.mkdtemp(prefix='bench_selectors_'), 'selector_stats.json'))
+    
+    if args.fixture:
+        platforms = ['youtube', 'udemy', 'coursera', 'moodle'] if args.platform == 'all' else [args.platform]
+        print("🧪 Fixture site benchmark (headless)")
+        with FixtureSite(videos=args.videos, video_seconds=args.video_seconds) as site:
+            db_dir = tempfile.mkdtemp(prefix='bench_db_')
+            results = []
+            for platform in platforms:
+                print(f"\n▶️  {platform}...")
+                results.append(run_fixture_flow(site, platform, db_dir, args.speed, args.quiz_questions))
+            print_fixture_results(results, site)
+        return
+    
+    if args.compare_backends:
+        platform = 'youtube' if args.platform == 'all' else args.platform
+        print(f"🧪 Backend comparison on {platform} (headless)")
+        with FixtureSite(videos=args.videos, video_seconds=args.video_seconds) as site:
+            results = run_backend_comparison(site, platform, tempfile.mkdtemp(prefix='bench_db_'),
+                                             args.speed, args.sessions)
+            print_backend_results(results, site)
+        return
+    
+    if args.soak:
+        platform = 'youtube' if args.platform == 'all' else args.platform
+        print(f"🧪 Soak benchmark: {args.videos} fixture videos on {platform} (headless)")
+        with FixtureSite(videos=args.videos, video_seconds=args.video_seconds) as site:
+            result = run_soak(site, platform, tempfile.mkdtemp(prefix='bench_db_'), args.speed, args.memory_limit)
+            print_soak_results(result, args.memory_limit)
+        return
+    
+    if not args.url or args.platform == 'all':
+        parser.error('--url and a single --platform are required unless --fixture is given')
+    
+    print("🧪 Per-session resource benchmark")
+    print(f"   {args.platform}: {args.url} ({args.seconds}s per mode)")
+    
+    results = []
+    for lean in (False, True):
+        print(f"\n▶️  Running {'lean' if lean else 'normal'} session...")
+        results.append(measure_session(args.platform, args.url, args.seconds, lean))
+    
+    print_resource_results(results)
+
+
+if __name__ == '__main__':
+    main()
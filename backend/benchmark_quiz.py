@@ -0,0 +1,266 @@
+"""
+Quiz Solving Benchmark
+Questions per second on CPU: the old one-call-per-option loop vs batched scoring,
+and latency/memory of the fp32, int8 and ONNX inference engines
+
+Usage:
+    python benchmark_quiz.py --questions 40 --batch-sizes 1 8 16 32
+    python benchmark_quiz.py --engines fp32 int8 onnx
+    
+    # Extraction latency on saved (padded) fixture quiz pages: page_source + parse vs one JS call
+    python benchmark_quiz.py --extraction --questions 10 --padding-kb 2000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import urllib.request
+from typing import Dict, List
+from bs4 import BeautifulSoup
+import quiz_solver
+from fixture_site import QUIZ_BANK, FixtureSite
+from model_registry import get_model_registry, model_key, _process_rss_mb
+from quiz_solver import QuizSolver
+
+
+def build_questions(count: int) -> List[Dict]:
+    """`count` questions cycled from the fixture quiz bank (each with its context)"""
+    return [QUIZ_BANK[i % len(QUIZ_BANK)] for i in range(count)]
+
+
+def run_loop(solver: QuizSolver, questions: List[Dict]) -> Dict:
+    """Baseline: one pipeline call per option, as solve_question used to do"""
+    correct = 0
+    start = time.perf_counter()
+    for item in questions:
+        best_answer, best_score = None, 0.0
+        for option in item['options']:
+            score = solver.qa_model(question=item['question'], context=f"{item['context']}. {option}")['score']
+            if score > best_score:
+                best_answer, best_score = option, score
+        correct += best_answer == item['answer']
+    elapsed = time.perf_counter() - start
+    return {'mode': 'loop', 'seconds': elapsed, 'correct': correct}
+
+
+def run_batched(solver: QuizSolver, questions: List[Dict], batch_size: int, padding: str) -> Dict:
+    """Every option of every question scored in one batched call (cache bypassed)"""
+    quiz_solver.QA_BATCH_SIZE = batch_size
+    quiz_solver.QA_PADDING = padding
+    
+    pairs = [(item['question'], f"{item['context']}. {option}") for item in questions for option in item['options']]
+    start = time.perf_counter()
+    scores = solver._score_options(pairs)
+    elapsed = time.perf_counter() - start
+    
+    correct = 0
+    offset = 0
+    for item in questions:
+        option_scores = scores[offset:offset + len(item['options'])]
+        offset += len(item['options'])
+        correct += item['options'][option_scores.index(max(option_scores))] == item['answer']
+    return {'mode': f'batch {batch_size} ({padding})', 'seconds': elapsed, 'correct': correct}
+
+
+def print_results(results: List[Dict], count: int):
+    print("\n" + "=" * 70)
+    print(f"{count} questions, {quiz_solver.ML_MODEL_NAME} on CPU")
+    print("-" * 70)
+    print(f"{'Mode':<28}{'Seconds':>10}{'Questions/s':>14}{'Speedup':>10}{'Correct':>8}")
+    print("-" * 70)
+    baseline = results[0]['seconds']
+    for r in results:
+        print(f"{r['mode']:<28}{r['seconds']:>10.2f}{count / r['seconds']:>14.1f}"
+              f"{baseline / r['seconds']:>9.1f}x{r['correct']:>8}")
+    print("=" * 70)
+
+
+def run_engine(engine: str, questions: List[Dict], reference: List[str] = None) -> Dict:
+    """Load one engine, then time batched answering (one question per call, like a quiz page)"""
+    solver = QuizSolver('udemy', engine=engine)
+    if solver.qa_model is None:
+        return {'engine': engine, 'error': 'could not load'}
+    stats = get_model_registry().get_stats()[model_key(quiz_solver.ML_MODEL_NAME, engine)]
+    
+    answers = []
+    latencies = []
+    for item in questions:
+        pairs = [(item['question'], f"{item['context']}. {option}") for option in item['options']]
+        start = time.perf_counter()
+        scores = solver._score_options(pairs)
+        latencies.append(time.perf_counter() - start)
+        answers.append(item['options'][scores.index(max(scores))])
+    
+    latencies.sort()
+    return {
+        'engine': stats['engine'],
+        'load_seconds': stats['load_seconds'],
+        'model_mb': stats['memory_mb'],
+        'rss_mb': round(_process_rss_mb(), 1) if _process_rss_mb() is not None else None,
+        'p50_ms': round(1000 * latencies[len(latencies) // 2], 1),
+        'p95_ms': round(1000 * latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1),
+        'correct': sum(answer == item['answer'] for answer, item in zip(answers, questions)),
+        'agreement': (sum(a == r for a, r in zip(answers, reference)) if reference else len(answers)),
+        'answers': answers
+    }
+
+
+def print_engine_results(results: List[Dict], count: int):
+    print("\n" + "=" * 90)
+    print(f"{count} questions, {quiz_solver.ML_MODEL_NAME} on CPU (RSS is cumulative - engines load in order)")
+    print("-" * 90)
+    print(f"{'Engine':<8}{'Load s':>9}{'Model MB':>10}{'RSS MB':>10}{'p50 ms':>10}{'p95 ms':>10}"
+          f"{'Correct':>10}{'Same as fp32':>15}")
+    print("-" * 90)
+    for r in results:
+        if 'error' in r:
+            print(f"{r['engine']:<8}  {r['error']}")
+            continue
+        print(f"{r['engine']:<8}{r['load_seconds']:>9}{str(r['model_mb']):>10}{str(r['rss_mb']):>10}"
+              f"{r['p50_ms']:>10}{r['p95_ms']:>10}{r['correct']:>10}{r['agreement']:>15}")
+    print("=" * 90)
+
+
+def save_fixture_pages(platforms: List[str], questions: int, padding_kb: int) -> Dict[str, str]:
+    """Fetch each platform's quiz page from the fixture site and save it to disk"""
+    directory = tempfile.mkdtemp(prefix='quiz_pages_')
+    paths = {}
+    with FixtureSite(page_padding_kb=padding_kb) as site:
+        for platform in platforms:
+            html = urllib.request.urlopen(site.quiz_url(platform, questions)).read()
+            paths[platform] = os.path.join(directory, f'{platform}_quiz.html')
+            with open(paths[platform], 'wb') as f:
+                f.write(html)
+    return paths
+
+
+def soup_extract(solver: QuizSolver, html: str, parser: str, strainer=None):
+    """The page-source path: parse everything, then run the platform's BeautifulSoup extractor"""
+    soup = BeautifulSoup(html, parser, parse_only=strainer)
+    extractor = {
+        'coursera': solver._extract_coursera_quiz,
+        'udemy': solver._extract_udemy_quiz,
+        'moodle': solver._extract_moodle_quiz
+    }.get(solver.platform, solver._extract_generic_quiz)
+    return extractor(soup)
+
+
+def median_ms(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return round(1000 * statistics.median(timings), 1)
+
+
+def run_extraction(paths: Dict[str, str], repeat: int) -> List[Dict]:
+    """Time each extraction path per saved page (browser paths only if Chrome can start)"""
+    from video_automator import VideoAutomator
+    
+    automator = VideoAutomator('youtube', headless=True, lean=True, profile_suffix='bench_quiz')
+    try:
+        automator.init_driver()
+    except Exception as e:
+        print(f"⚠️  No browser ({str(e).splitlines()[0]}) - timing offline parsing only")
+        automator.driver = None
+    
+    results = []
+    try:
+        for platform, path in paths.items():
+            with open(path, 'r', encoding='utf-8') as f:
+                html = f.read()
+            solver = QuizSolver(platform, driver=automator.driver)
+            strainer = quiz_solver.GENERIC_QUIZ_STRAINER if platform not in quiz_solver.QUIZ_EXTRACTION else None
+            
+            row = {
+                'platform': platform if platform in quiz_solver.QUIZ_EXTRACTION else 'generic',
+                'page_kb': len(html.encode('utf-8')) // 1024,
+                'html_parser_ms': median_ms(lambda: soup_extract(solver, html, 'html.parser'), repeat),
+                'fallback_ms': median_ms(lambda: soup_extract(solver, html, quiz_solver.SOUP_PARSER, strainer), repeat)
+            }
+            
+            if automator.driver:
+                automator.driver.get('file://' + path)
+                row['page_source_ms'] = median_ms(
+                    lambda: soup_extract(solver, automator.driver.page_source, 'html.parser'), repeat)
+                row['script_ms'] = median_ms(solver.extract_questions, repeat)
+                row['questions'] = len(solver.extract_questions())
+            results.append(row)
+    finally:
+        automator.close()
+    return results
+
+
+def print_extraction_results(results: List[Dict], repeat: int):
+    print("\n" + "=" * 92)
+    print(f"Median of {repeat} runs per path (ms)")
+    print("-" * 92)
+    print(f"{'Platform':<10}{'Page KB':>9}{'html.parser':>13}{'fallback':>10}"
+          f"{'page_source+parse':>19}{'one JS call':>13}{'questions':>11}")
+    print("-" * 92)
+    for r in results:
+        print(f"{r['platform']:<10}{r['page_kb']:>9}{r['html_parser_ms']:>13}{r['fallback_ms']:>10}"
+              f"{str(r.get('page_source_ms', '-')):>19}{str(r.get('script_ms', '-')):>13}"
+              f"{str(r.get('questions', '-')):>11}")
+    print("=" * 92)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batched quiz answering')
+    parser.add_argument('--questions', type=int, default=40, help='Questions to answer per mode')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 16, 32])
+    parser.add_argument('--padding', default='longest', choices=['longest', 'max_length', 'do_not_pad'])
+    parser.add_argument('--engines', nargs='+', choices=['fp32', 'int8', 'onnx'],
+                        help='Compare inference engines instead of batch sizes')
+    parser.add_argument('--extraction', action='store_true', help='Benchmark quiz extraction instead of answering')
+    parser.add_argument('--padding-kb', type=int, default=2000, help='Extra markup per saved page (--extraction)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per extraction path')
+    args = parser.parse_args()
+    
+    if args.extraction:
+        questions = min(args.questions, 20)
+        print(f"🧪 Extraction benchmark: {questions} questions per page, +{args.padding_kb} KB markup")
+        paths = save_fixture_pages(['udemy', 'coursera', 'moodle', 'youtube'], questions, args.padding_kb)  # youtube = generic page
+        print_extraction_results(run_extraction(paths, args.repeat), args.repeat)
+        return
+    
+    if not quiz_solver._transformers_available:
+        print("❌ transformers is not installed - nothing to benchmark")
+        return
+    
+    if args.engines:
+        questions = build_questions(args.questions)
+        print(f"🧪 Engine benchmark: {len(questions)} questions")
+        results = []
+        reference = None
+        for engine in args.engines:
+            print(f"\n▶️  {engine}...")
+            result = run_engine(engine, questions, reference)
+            if engine == 'fp32' and 'answers' in result:
+                reference = result['answers']
+            results.append(result)
+        print_engine_results(results, len(questions))
+        return
+    
+    solver = QuizSolver('udemy')
+    if solver.qa_model is None:
+        print("❌ Could not load the QA model")
+        return
+    
+    questions = build_questions(args.questions)
+    print(f"🧪 Quiz benchmark: {len(questions)} questions")
+    
+    # Warm-up so the first timed mode doesn't pay for lazy initialisation
+    solver._score_options([(questions[0]['question'], questions[0]['context'])])
+    
+    results = [run_loop(solver, questions)]
+    for batch_size in args.batch_sizes:
+        results.append(run_batched(solver, questions, batch_size, args.padding))
+    
+    print_results(results, len(questions))
+
+
+if __name__ == '__main__':
+    main()
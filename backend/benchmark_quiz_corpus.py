@@ -0,0 +1,235 @@
+"""
+Quiz Corpus Benchmark
+Extraction time, solve latency, cache hit rate and accuracy per engine on the saved,
+labelled quiz pages in quiz_corpus/ - written out as a Markdown + JSON comparison report
+
+Modes:
+    fp32     one model call per question (options batched), full-precision model
+    int8     the same with the dynamically quantized model
+    onnx     the same on ONNX Runtime
+    batched  every question on a page in one call (fp32)
+    cached   answers from a warm answer cache and score memo (primed by one batched pass)
+
+Usage:
+    python benchmark_quiz_corpus.py
+    python benchmark_quiz_corpus.py --modes fp32 int8 batched cached --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+import quiz_solver
+from benchmark_quiz import median_ms
+from database import Database
+from model_registry import get_model_registry, model_key
+from quiz_solver import QuizSolver
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), 'quiz_corpus')
+REPORTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'reports')
+MODES = ['fp32', 'int8', 'onnx', 'batched', 'cached']
+MODE_ENGINES = {'fp32': 'fp32', 'int8': 'int8', 'onnx': 'onnx', 'batched': 'fp32', 'cached': 'fp32'}
+
+
+class CountingDatabase(Database):
+    """
+    Throwaway answer cache and score memo that count hits per question
+    `store=False` keeps both empty so every answer comes from the model
+    """
+    
+    def __init__(self, db_path: str, store: bool = False):
+        super().__init__(db_path=db_path)
+        self.store = store
+        self.lookups = 0
+        self.hits = 0
+    
+    def get_cached_answer(self, question_text: str) -> Optional[str]:
+        answer = super().get_cached_answer(question_text)
+        self.lookups += 1
+        self.hits += answer is not None
+        return answer
+    
+    def cache_quiz_answer(self, question_text: str, answer: str):
+        if self.store:
+            super().cache_quiz_answer(question_text, answer)
+    
+    def get_memo_scores(self, memo_keys: List[str]) -> Dict[str, Dict[str, float]]:
+        found = super().get_memo_scores(memo_keys)
+        self.hits += len(found)  # Only questions the answer cache missed are looked up here
+        return found
+    
+    def save_memo_scores(self, entries: List[Dict], **kwargs):
+        if self.store:
+            super().save_memo_scores(entries, **kwargs)
+
+
+def load_corpus() -> List[Dict]:
+    """[{'file', 'platform', 'html', 'questions': [labelled question, ...]}, ...]"""
+    with open(os.path.join(CORPUS_DIR, 'labels.json'), 'r', encoding='utf-8') as f:
+        labels = json.load(f)
+    
+    pages = []
+    for name, page in labels.items():
+        with open(os.path.join(CORPUS_DIR, name), 'r', encoding='utf-8') as f:
+            pages.append({'file': name, 'platform': page['platform'], 'html': f.read(), 'questions': page['questions']})
+    return pages
+
+
+def solver_platform(platform: str) -> str:
+    # Generic forms go through the fallback extractor, which any platform without block selectors uses
+    return platform if platform in quiz_solver.QUIZ_EXTRACTION else 'youtube'
+
+
+def run_extraction(pages: List[Dict], repeat: int) -> List[Dict]:
+    """Offline page-source extraction per page: median time and how many labelled questions were found"""
+    results = []
+    for page in pages:
+        solver = QuizSolver(solver_platform(page['platform']))
+        extracted = solver.parse_quiz_html(page['html'])
+        found = {q['question'] for q in extracted}
+        results.append({
+            'file': page['file'],
+            'platform': page['platform'],
+            'page_kb': round(len(page['html'].encode('utf-8')) / 1024, 1),
+            'extract_ms': median_ms(lambda: solver.parse_quiz_html(page['html']), repeat),
+            'questions': len(page['questions']),
+            'extracted': sum(label['question'] in found for label in page['questions'])
+        })
+    return results
+
+
+def solve_page(solver: QuizSolver, mode: str, questions: List[Dict]) -> List[Optional[str]]:
+    if mode in ('batched', 'cached'):
+        return [answer for answer, _ in solver.solve_questions(questions)]
+    return [solver.solve_question(q['question'], q['options'], q['context'])[0] for q in questions]
+
+
+def run_mode(mode: str, pages: List[Dict], repeat: int, workdir: str) -> Dict:
+    """Solve every corpus page `repeat` times in one mode"""
+    engine = MODE_ENGINES[mode]
+    db = CountingDatabase(os.path.join(workdir, f'{mode}.db'), store=(mode == 'cached'))
+    
+    solvers = {}
+    page_questions = []
+    for page in pages:
+        platform = solver_platform(page['platform'])
+        if platform not in solvers:
+            solvers[platform] = QuizSolver(platform, engine=engine)
+            solvers[platform].db = db
+        labelled = {label['question']: label for label in page['questions']}
+        questions = [dict(q, context=labelled[q['question']]['context'])
+                     for q in solvers[platform].parse_quiz_html(page['html']) if q['question'] in labelled]
+        page_questions.append((solvers[platform], questions, page))
+    
+    if next(iter(solvers.values())).qa_model is None:
+        return {'mode': mode, 'error': 'model not available'}
+    stats = get_model_registry().get_stats().get(model_key(quiz_solver.ML_MODEL_NAME, engine), {})
+    
+    if mode == 'cached':
+        # Prime the cache and memo with one batched pass
+        for solver, questions, _ in page_questions:
+            solver.solve_questions(questions)
+        db.lookups = db.hits = 0
+    
+    latencies = []
+    correct = total = 0
+    for _ in range(repeat):
+        for solver, questions, page in page_questions:
+            start = time.perf_counter()
+            answers = solve_page(solver, mode, questions)
+            latencies.append(time.perf_counter() - start)
+            
+            chosen = {q['question']: answer for q, answer in zip(questions, answers)}
+            correct += sum(chosen.get(label['question']) == label['answer'] for label in page['questions'])
+            total += len(page['questions'])
+    
+    latencies.sort()
+    question_count = sum(len(questions) for _, questions, _ in page_questions) * repeat
+    return {
+        'mode': mode,
+        'engine': stats.get('engine', engine),
+        'load_seconds': stats.get('load_seconds'),
+        'page_p50_ms': round(1000 * statistics.median(latencies), 1),
+        'page_p95_ms': round(1000 * latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1),
+        'question_ms': round(1000 * sum(latencies) / max(1, question_count), 1),
+        'cache_hit_rate': round(db.hits / db.lookups, 3) if db.lookups else 0.0,
+        'accuracy': round(correct / total, 3) if total else 0.0
+    }
+
+
+def format_report(extraction: List[Dict], modes: List[Dict], repeat: int) -> str:
+    """Markdown comparison report"""
+    lines = [
+        f"# Quiz corpus benchmark - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+        '',
+        f"Model: `{quiz_solver.ML_MODEL_NAME}` on CPU, {repeat} run(s) per page, batch size {quiz_solver.QA_BATCH_SIZE}",
+        '',
+        '## Extraction (offline page-source parse)',
+        '',
+        '| Page | Platform | KB | Median ms | Questions found |',
+        '|---|---|---:|---:|---:|'
+    ]
+    for r in extraction:
+        lines.append(f"| {r['file']} | {r['platform']} | {r['page_kb']} | {r['extract_ms']} | "
+                     f"{r['extracted']}/{r['questions']} |")
+    
+    lines += [
+        '',
+        '## Solving',
+        '',
+        '| Mode | Engine | Load s | Page p50 ms | Page p95 ms | ms / question | Cache hit rate | Accuracy |',
+        '|---|---|---:|---:|---:|---:|---:|---:|'
+    ]
+    for r in modes:
+        if 'error' in r:
+            lines.append(f"| {r['mode']} | - | - | - | - | - | - | {r['error']} |")
+            continue
+        lines.append(f"| {r['mode']} | {r['engine']} | {r['load_seconds']} | {r['page_p50_ms']} | {r['page_p95_ms']} | "
+                     f"{r['question_ms']} | {r['cache_hit_rate']:.0%} | {r['accuracy']:.0%} |")
+    return '\n'.join(lines) + '\n'
+
+
+def write_report(report: str, data: Dict, output: Optional[str] = None) -> str:
+    """Save the Markdown report with its raw numbers alongside as JSON; returns the Markdown path"""
+    if not output:
+        os.makedirs(REPORTS_DIR, exist_ok=True)
+        output = os.path.join(REPORTS_DIR, f"quiz_benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md")
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write(report)
+    with open(os.path.splitext(output)[0] + '.json', 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark quiz extraction and solving on the labelled corpus')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=['fp32', 'int8', 'batched', 'cached'])
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per page')
+    parser.add_argument('--output', help='Report path (default: data/reports/quiz_benchmark_<timestamp>.md)')
+    args = parser.parse_args()
+    
+    pages = load_corpus()
+    print(f"🧪 Quiz corpus: {len(pages)} pages, {sum(len(p['questions']) for p in pages)} labelled questions")
+    
+    extraction = run_extraction(pages, args.repeat)
+    
+    modes = []
+    with tempfile.TemporaryDirectory(prefix='quiz_corpus_') as workdir:
+        for mode in args.modes:
+            print(f"▶️  {mode}...")
+            if not quiz_solver._transformers_available:
+                modes.append({'mode': mode, 'error': 'transformers not installed'})
+                continue
+            modes.append(run_mode(mode, pages, args.repeat, workdir))
+    
+    report = format_report(extraction, modes, args.repeat)
+    print('\n' + report)
+    path = write_report(report, {'extraction': extraction, 'modes': modes, 'repeat': args.repeat}, args.output)
+    print(f"📄 Report written to {path}")
+
+
+if __name__ == '__main__':
+    main()
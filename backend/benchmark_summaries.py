@@ -0,0 +1,152 @@
+"""
+Summary Storage Benchmark
+Read latency for the dashboard/extension access patterns at tens of thousands of summaries:
+the old reparse-the-JSON-file approach vs the SQLite store's in-memory cache and search index
+
+Usage:
+    python benchmark_summaries.py --summaries 50000 --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+from summary_store import SummaryStore
+
+TOPICS = ['python', 'javascript', 'sql', 'machine learning', 'statistics', 'networking', 'git', 'docker',
+          'algorithms', 'css', 'react', 'linux', 'security', 'cloud', 'testing', 'databases']
+SEARCH_QUERIES = ['docker', 'sql lesson', 'lesson 4217', 'mach lear', 'practical knowledge']
+
+
+def make_summaries(count: int) -> Dict[str, Dict]:
+    """Synthetic summaries shaped like VideoSummarizer's local ones, with shuffled timestamps"""
+    start = datetime(2024, 1, 1)
+    summaries = {}
+    for i in range(count):
+        topic = TOPICS[i % len(TOPICS)]
+        summaries[f'https://www.youtube.com/watch?v=vid{i:06d}'] = {
+            'quick_summary': f"This video covers {topic} lesson {i}. The material presents key concepts and practical knowledge.",
+            'key_takeaways': [f"Understanding of {topic} lesson {i}", "Practical knowledge applicable to real-world scenarios"],
+            'topics_covered': [topic, TOPICS[(i * 7) % len(TOPICS)]],
+            'action_items': ["Review the main concepts covered"],
+            'difficulty': ['Beginner', 'Intermediate', 'Advanced'][i % 3],
+            'quiz_questions': [],
+            'timestamp': (start + timedelta(seconds=(i * 7919) % count * 60)).isoformat(),
+            'method': 'local_analysis',
+            'duration_minutes': 10.0
+        }
+    return summaries
+
+
+def median_ms(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return round(1000 * statistics.median(timings), 3)
+
+
+def legacy_recent(json_path: str, limit: int) -> List[Dict]:
+    """What get_recent_summaries used to do: parse the whole file, then sort every summary"""
+    with open(json_path, 'r') as f:
+        summaries = json.load(f)
+    summary_list = [{**data, 'url': url} for url, data in summaries.items()]
+    summary_list.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+    return summary_list[:limit]
+
+
+def legacy_all(json_path: str) -> Dict:
+    with open(json_path, 'r') as f:
+        return json.load(f)
+
+
+def legacy_search(summaries: Dict[str, Dict], query: str) -> List[Dict]:
+    """What search_summaries used to do (minus the file parse): a substring scan of every summary"""
+    query_lower = query.lower()
+    results = []
+    for url, data in summaries.items():
+        searchable_text = (data.get('quick_summary', '') + ' ' + ' '.join(data.get('topics_covered', [])) + ' ' +
+                           ' '.join(data.get('key_takeaways', []))).lower()
+        if query_lower in searchable_text:
+            results.append({**data, 'url': url})
+    return results
+
+
+def run(count: int, repeat: int) -> List[Dict]:
+    workdir = tempfile.mkdtemp(prefix='summaries_bench_')
+    summaries = make_summaries(count)
+    json_path = os.path.join(workdir, 'video_summaries.json')
+    with open(json_path, 'w') as f:
+        json.dump(summaries, f, indent=2)
+    
+    start = time.perf_counter()
+    store = SummaryStore(os.path.join(workdir, 'video_summaries.db'), legacy_json=json_path)
+    migrate_ms = round(1000 * (time.perf_counter() - start), 1)
+    
+    # Reads must agree with the old implementation
+    assert [s['url'] for s in store.get_recent(10)] == [s['url'] for s in legacy_recent(json_path, 10)], \
+        "recent order differs from the JSON implementation"
+    
+    def cold_load():
+        store._cache = None
+        store.get_all()
+    
+    some_url = next(iter(summaries))
+    counter = iter(range(10 ** 9))
+    results = [
+        {'operation': 'get_all_summaries', 'legacy_ms': median_ms(lambda: legacy_all(json_path), repeat),
+         'store_ms': median_ms(store.get_all, repeat)},
+        {'operation': 'get_recent_summaries(10)', 'legacy_ms': median_ms(lambda: legacy_recent(json_path, 10), repeat),
+         'store_ms': median_ms(lambda: store.get_recent(10), repeat)},
+        {'operation': 'get_summary(url)', 'legacy_ms': median_ms(lambda: legacy_all(json_path).get(some_url), repeat),
+         'store_ms': median_ms(lambda: store.get(some_url), repeat)},
+        {'operation': 'cache reload (after another process writes)', 'legacy_ms': None,
+         'store_ms': median_ms(cold_load, repeat)},
+        {'operation': 'save one summary', 'legacy_ms': None,
+         'store_ms': median_ms(lambda: store.put(f'https://example.org/new{next(counter)}',
+                                                 {'quick_summary': 'new', 'timestamp': datetime.now().isoformat()}),
+                               repeat)},
+        {'operation': 'one-time JSON migration', 'legacy_ms': None, 'store_ms': migrate_ms}
+    ]
+    
+    start = time.perf_counter()
+    store.search('warm up')
+    results.append({'operation': 'build search index (first search)', 'legacy_ms': None,
+                    'store_ms': round(1000 * (time.perf_counter() - start), 1)})
+    all_summaries = store.get_all()
+    for query in SEARCH_QUERIES:
+        results.append({'operation': f"search_summaries('{query}', limit=20)",
+                        'legacy_ms': median_ms(lambda: legacy_search(all_summaries, query), repeat),
+                        'store_ms': median_ms(lambda: store.search(query, 20), repeat)})
+    return results
+
+
+def print_results(results: List[Dict], count: int, repeat: int):
+    print("\n" + "=" * 84)
+    print(f"{count} summaries, median of {repeat} runs (ms)")
+    print("-" * 84)
+    print(f"{'Operation':<52}{'JSON file':>12}{'Store':>10}{'Speedup':>10}")
+    print("-" * 84)
+    for r in results:
+        legacy = f"{r['legacy_ms']:.1f}" if r['legacy_ms'] is not None else '-'
+        speedup = f"{r['legacy_ms'] / max(r['store_ms'], 0.001):.0f}x" if r['legacy_ms'] is not None else '-'
+        print(f"{r['operation']:<52}{legacy:>12}{r['store_ms']:>10.3f}{speedup:>10}")
+    print("=" * 84)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark summary storage reads')
+    parser.add_argument('--summaries', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    print(f"🧪 Summary storage benchmark: {args.summaries} summaries")
+    print_results(run(args.summaries, args.repeat), args.summaries, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Batch Summarization Benchmark
+Wall time and connections opened when summarizing a batch of videos against the local
+OpenAI stand-in: one video at a time with a new connection per request (the old behaviour)
+vs summarize_many over the pooled session, and re-summarizing the same content under new URLs
+
+Usage:
+    python benchmark_summarize.py --videos 40 --latency 0.5 --workers 2 4 8
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, List
+import requests
+from openai_stub import OpenAIStub
+from summary_store import SummaryStore
+from video_summarizer import VideoSummarizer, RateLimiter, get_http_session
+
+
+def make_videos(count: int) -> List[Dict]:
+    return [{'title': f'Benchmark Lesson {i}', 'platform': 'youtube', 'url': f'https://youtube.com/watch?v=bench{i}',
+             'duration': 900, 'transcript': f'Transcript of lesson {i}. ' * 50} for i in range(count)]
+
+
+def run_mode(summarizer: VideoSummarizer, stub: OpenAIStub, videos: List[Dict], label: str, workers: int = 0,
+             force_refresh: bool = True) -> Dict:
+    """Summarize every video once - one at a time (workers=0) or with summarize_many"""
+    stub.reset_stats()
+    start = time.perf_counter()
+    if not workers:
+        summaries = [summarizer.summarize_video(video, force_refresh=force_refresh) for video in videos]
+    else:
+        summaries = summarizer.summarize_many(videos, workers=workers, force_refresh=force_refresh)
+    elapsed = time.perf_counter() - start
+    stats = stub.get_stats()
+    return {
+        'mode': label,
+        'seconds': round(elapsed, 2),
+        'videos_per_second': round(len(videos) / elapsed, 1),
+        'connections': stats['connections'],
+        'peak_in_flight': stats['max_active'],
+        'retried': stats['failures'],
+        'api_summaries': sum(1 for s in summaries if s and s.get('method') == 'openai_gpt4')
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batch video summarization')
+    parser.add_argument('--videos', type=int, default=40)
+    parser.add_argument('--latency', type=float, default=0.5, help='Stand-in seconds per completion')
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4, 8])
+    parser.add_argument('--rate', type=float, default=0, help='Requests per second limit (0 = unlimited)')
+    parser.add_argument('--fail-every', type=int, default=0, help='Throttle every Nth request with a 429')
+    args = parser.parse_args()
+    
+    videos = make_videos(args.videos)
+    summarizer = VideoSummarizer(store=SummaryStore(os.path.join(tempfile.mkdtemp(prefix='summarize_bench_'),
+                                                                 'video_summaries.db')))
+    summarizer.openai_api_key = 'benchmark-key'
+    summarizer.rate_limiter = RateLimiter(args.rate)
+    
+    print(f"🧪 Summarizing {args.videos} videos, {args.latency}s per request")
+    results = []
+    with OpenAIStub(latency=args.latency, fail_every=args.fail_every) as stub:
+        summarizer.api_url = stub.completions_url
+        
+        summarizer.session = requests  # requests.post: a new connection for every video
+        results.append(run_mode(summarizer, stub, videos, 'sequential, no session'))
+        
+        summarizer.session = get_http_session()
+        results.append(run_mode(summarizer, stub, videos, 'sequential, pooled session'))
+        for workers in args.workers:
+            # The shared pool keeps SUMMARY_WORKERS connections; size it for this run
+            summarizer.session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=workers)
+            summarizer.session.mount('http://', adapter)
+            results.append(run_mode(summarizer, stub, videos, f'summarize_many(workers={workers})', workers))
+        
+        # Same lectures reached through playlist-index URLs: served from the content cache
+        variants = [dict(video, url=video['url'] + f'&list=PLBENCH&index={i}') for i, video in enumerate(videos)]
+        results.append(run_mode(summarizer, stub, variants, 'same content, new URLs (cached)', force_refresh=False))
+    
+    print("\n" + "=" * 92)
+    print(f"{'Mode':<34}{'Seconds':>9}{'Videos/s':>10}{'Connections':>13}{'Peak':>7}{'Retried':>9}{'API':>6}")
+    print("-" * 92)
+    for r in results:
+        print(f"{r['mode']:<34}{r['seconds']:>9.2f}{r['videos_per_second']:>10.1f}{r['connections']:>13}"
+              f"{r['peak_in_flight']:>7}{r['retried']:>9}{r['api_summaries']:>6}")
+    print("=" * 92)
+    stats = VideoSummarizer.get_cache_stats()
+    print(f"♻️ Content cache: {stats['hits']} hits, {stats['misses']} misses, {stats['refreshes']} forced refreshes, "
+          f"{stats['api_calls_saved']} API calls saved")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,670 @@
+"""
+Async CDP Driver Module
+Alternative browser backend that speaks the Chrome DevTools Protocol over a websocket directly.
+No chromedriver and no blocking HTTP round trips - one asyncio event loop supervises many
+playback sessions and learns about finished videos from page events instead of polling.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from string import Template
+from typing import Callable, Dict, List, Optional
+import websockets
+from config import (PLATFORMS, MACHINE_ID, DATABASE_PATH, CHROME_BINARY, CDP_SESSIONS,
+                    LEAN_MODE, LEAN_BLOCKED_URLS)
+from database import Database
+from video_automator import (VIDEO_STATUS_SCRIPT, YOUTUBE_PLAYLIST_SCRIPT, PLAYLIST_ITEM_LINKS_SCRIPT,
+                             AD_SKIPPER_SCRIPT, AD_SKIPPER_STATS_SCRIPT, AD_SKIP_SELECTORS,
+                             AD_OVERLAY_SELECTORS, playlist_page_url, video_key)
+
+logger = logging.getLogger(__name__)
+
+CHROME_CANDIDATES = ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome']
+
+# Seconds between fallback status checks while waiting for the page to report completion
+COMPLETION_CHECK_INTERVAL = 15
+
+# Reports a finished video through the __smartVideoEvent binding (same 3-second rule as
+# VideoAutomator.is_video_complete). Media events don't bubble, so listen in the capture phase.
+VIDEO_EVENTS_SCRIPT = Template("""
+(() => {
+    if (window.__smartVideoEvents) return;
+    window.__smartVideoEvents = true;
+    const VIDEO = $video_selector;
+    let reported = null;
+    const report = (video) => {
+        if (document.querySelector('.ad-showing')) return;  // The ad plays in the same element on YouTube
+        if (reported === location.href) return;
+        reported = location.href;
+        window.__smartVideoEvent(JSON.stringify({type: 'complete', url: location.href}));
+    };
+    const matches = (el) => el && el.matches && el.matches(VIDEO);
+    document.addEventListener('ended', (e) => { if (matches(e.target)) report(e.target); }, true);
+    document.addEventListener('timeupdate', (e) => {
+        const v = e.target;
+        if (!matches(v) || !isFinite(v.duration) || v.duration <= 0 || v.currentTime <= 0) return;
+        if (v.duration - v.currentTime < 3) report(v);
+    }, true);
+})();
+""")
+
+# Waits (in the page) for the video to report a usable duration, then starts it at the given rate
+PLAY_SCRIPT = """
+const deadline = Date.now() + 10000;
+let video = document.querySelector(arguments[0]);
+while ((!video || !(video.duration > 0)) && Date.now() < deadline) {
+    await new Promise(resolve => setTimeout(resolve, 250));
+    video = document.querySelector(arguments[0]);
+}
+if (!video) return null;
+video.playbackRate = arguments[1];
+if (video.paused) {
+    try { await video.play(); } catch (e) {}
+}
+return {duration: video.duration, paused: video.paused};
+"""
+
+CLICK_SCRIPT = """
+const el = document.querySelector(arguments[0]);
+if (!el) return false;
+el.click();
+return true;
+"""
+
+
+def cdp_profile_dir(user_id: int = None) -> str:
+    """Chrome profile for the CDP backend - separate from Selenium's, Chrome locks a profile to one process"""
+    if user_id:
+        profile_name = f'cdp_profile_user{user_id}_{MACHINE_ID}'
+    else:
+        profile_name = f'cdp_profile_{MACHINE_ID}'
+    return os.path.join(tempfile.gettempdir(), profile_name)
+
+
+class CDPError(RuntimeError):
+    """A DevTools command failed or the browser connection was lost"""
+
+
+class CDPConnection:
+    """
+    One websocket to the browser. Commands are matched to replies by id,
+    events fan out to listeners keyed on (sessionId, method).
+    """
+    
+    def __init__(self, ws_url: str):
+        self.ws_url = ws_url
+        self.ws = None
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._listeners: Dict[tuple, List[Callable]] = {}
+        self._reader = None
+    
+    async def connect(self):
+        self.ws = await websockets.connect(self.ws_url, max_size=None, ping_interval=None)
+        self._reader = asyncio.create_task(self._read_loop())
+    
+    async def send(self, method: str, params: Dict = None, session_id: str = None, timeout: float = 30) -> Dict:
+        """Send a command and wait for its reply (timeouts and a closed connection raise CDPError)"""
+        message_id = next(self._ids)
+        message = {'id': message_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        try:
+            await self.ws.send(json.dumps(message))
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise CDPError(f'{method} timed out after {timeout}s')
+        except websockets.exceptions.ConnectionClosed:
+            raise CDPError('Browser connection closed')
+        finally:
+            self._pending.pop(message_id, None)
+    
+    def on(self, method: str, handler: Callable, session_id: str = None):
+        self._listeners.setdefault((session_id, method), []).append(handler)
+    
+    def off(self, method: str, handler: Callable, session_id: str = None):
+        handlers = self._listeners.get((session_id, method), [])
+        if handler in handlers:
+            handlers.remove(handler)
+    
+    def expect(self, method: str, session_id: str = None, predicate: Callable = None) -> asyncio.Future:
+        """Future for the next matching event - listening starts now, so call it before triggering the event"""
+        future = asyncio.get_running_loop().create_future()
+        
+        def handler(params):
+            if not future.done() and (predicate is None or predicate(params)):
+                future.set_result(params)
+        
+        self.on(method, handler, session_id)
+        future.add_done_callback(lambda _: self.off(method, handler, session_id))
+        return future
+    
+    async def wait_for(self, method: str, session_id: str = None, predicate: Callable = None, timeout: float = 30) -> Dict:
+        try:
+            return await asyncio.wait_for(self.expect(method, session_id, predicate), timeout)
+        except asyncio.TimeoutError:
+            raise CDPError(f'No {method} event within {timeout}s')
+    
+    async def _read_loop(self):
+        try:
+            async for raw in self.ws:
+                message = json.loads(raw)
+                if 'id' in message:
+                    future = self._pending.get(message['id'])
+                    if future and not future.done():
+                        if 'error' in message:
+                            future.set_exception(CDPError(message['error'].get('message', 'CDP error')))
+                        else:
+                            future.set_result(message.get('result', {}))
+                    continue
+                
+                key = (message.get('sessionId'), message.get('method'))
+                for handler in list(self._listeners.get(key, [])):
+                    try:
+                        handler(message.get('params', {}))
+                    except Exception as e:
+                        logger.debug(f"CDP listener error ({key[1]}): {str(e)}")
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CDPError('Browser connection closed'))
+    
+    async def close(self):
+        if self.ws:
+            await self.ws.close()
+        if self._reader:
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+
+class CDPPage:
+    """One tab, attached as a flat-mode session on the shared browser connection"""
+    
+    def __init__(self, connection: CDPConnection, target_id: str, session_id: str):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+    
+    async def send(self, method: str, params: Dict = None, timeout: float = 30) -> Dict:
+        return await self.connection.send(method, params, session_id=self.session_id, timeout=timeout)
+    
+    def on(self, method: str, handler: Callable):
+        self.connection.on(method, handler, self.session_id)
+    
+    def expect(self, method: str, predicate: Callable = None) -> asyncio.Future:
+        return self.connection.expect(method, self.session_id, predicate)
+    
+    async def navigate(self, url: str, timeout: float = 30):
+        """Load a URL and wait for the load event"""
+        loaded = self.expect('Page.loadEventFired')
+        result = await self.send('Page.navigate', {'url': url})
+        if result.get('errorText'):
+            loaded.cancel()
+            raise CDPError(f"Navigation to {url} failed: {result['errorText']}")
+        try:
+            await asyncio.wait_for(loaded, timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Page load event not seen within {timeout}s: {url}")
+    
+    async def evaluate(self, body: str, *args, timeout: float = 30):
+        """
+        Run a Selenium-style script body (uses `return` and `arguments[i]`) and return its value
+        The body may `await`; the result comes back by value
+        """
+        expression = f"(async function() {{ {body} }}).apply(null, {json.dumps(list(args))})"
+        result = await self.send('Runtime.evaluate', {
+            'expression': expression,
+            'awaitPromise': True,
+            'returnByValue': True
+        }, timeout=timeout)
+        if result.get('exceptionDetails'):
+            details = result['exceptionDetails']
+            raise CDPError(details.get('exception', {}).get('description') or details.get('text', 'Script error'))
+        return result.get('result', {}).get('value')
+    
+    async def add_script(self, source: str):
+        """Run `source` in every document this tab loads, before the page's own scripts"""
+        await self.send('Page.addScriptToEvaluateOnNewDocument', {'source': source})
+    
+    async def current_url(self) -> str:
+        return await self.evaluate('return location.href;')
+
+
+class CDPBrowser:
+    """A Chrome process started with remote debugging plus the websocket connection to it"""
+    
+    def __init__(self, profile_dir: str, headless: bool = True, lean: bool = LEAN_MODE):
+        self.profile_dir = profile_dir
+        self.headless = headless
+        self.lean = lean
+        self.process = None
+        self.connection = None
+    
+    def _chrome_binary(self) -> str:
+        if CHROME_BINARY:
+            return CHROME_BINARY
+        for name in CHROME_CANDIDATES:
+            path = shutil.which(name)
+            if path:
+                return path
+        raise CDPError('Chrome not found - install it or set CHROME_BINARY')
+    
+    def _arguments(self) -> List[str]:
+        args = [
+            self._chrome_binary(),
+            '--remote-debugging-port=0',  # Chrome picks a free port and writes it to DevToolsActivePort
+            f'--user-data-dir={self.profile_dir}',
+            '--no-first-run',
+            '--no-default-browser-check',
+            '--no-sandbox',
+            '--disable-dev-shm-usage',
+            '--autoplay-policy=no-user-gesture-required',
+            # Every session is a background tab to Chrome - keep them all playing at full speed
+            '--disable-background-media-suspend',
+            '--disable-background-timer-throttling',
+            '--disable-renderer-backgrounding',
+            '--disable-backgrounding-occluded-windows'
+        ]
+        if self.headless:
+            args.append('--headless=new')
+        if self.lean:
+            args.extend(['--mute-audio', '--disable-gpu', '--blink-settings=imagesEnabled=false', '--disable-extensions'])
+        args.append('about:blank')
+        return args
+    
+    async def start(self, timeout: float = 30):
+        """Launch Chrome and connect to its browser-level websocket"""
+        os.makedirs(self.profile_dir, exist_ok=True)
+        port_file = os.path.join(self.profile_dir, 'DevToolsActivePort')
+        if os.path.exists(port_file):
+            os.remove(port_file)  # Left over from a previous run
+        
+        self.process = subprocess.Popen(self._arguments(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        
+        deadline = time.time() + timeout
+        while True:
+            try:
+                with open(port_file, 'r') as f:
+                    port, path = f.read().split()[:2]
+                break
+            except (OSError, ValueError):
+                if self.process.poll() is not None:
+                    raise CDPError(f'Chrome exited during startup (code {self.process.returncode})')
+                if time.time() > deadline:
+                    raise CDPError('Chrome did not open its DevTools port in time')
+                await asyncio.sleep(0.1)
+        
+        self.connection = CDPConnection(f'ws://127.0.0.1:{port}{path}')
+        await self.connection.connect()
+        logger.info(f"🔌 CDP connected to Chrome (pid {self.process.pid}, port {port})")
+    
+    async def new_page(self) -> CDPPage:
+        """Open a tab and attach to it"""
+        target = await self.connection.send('Target.createTarget', {'url': 'about:blank'})
+        attached = await self.connection.send('Target.attachToTarget', {'targetId': target['targetId'], 'flatten': True})
+        page = CDPPage(self.connection, target['targetId'], attached['sessionId'])
+        await page.send('Page.enable')
+        await page.send('Runtime.enable')
+        if self.lean:
+            await page.send('Network.enable')
+            await page.send('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+        return page
+    
+    async def close_page(self, page: CDPPage):
+        try:
+            await self.connection.send('Target.closeTarget', {'targetId': page.target_id})
+        except CDPError:
+            pass
+    
+    async def close(self):
+        if self.connection:
+            try:
+                await self.connection.send('Browser.close', timeout=5)
+            except (CDPError, asyncio.TimeoutError):
+                pass
+            await self.connection.close()
+        if self.process:
+            try:
+                # Popen.wait blocks; other sessions on this loop keep running meanwhile
+                await asyncio.to_thread(self.process.wait, timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                await asyncio.to_thread(self.process.wait)
+
+
+class AsyncVideoAutomator:
+    """
+    asyncio counterpart of VideoAutomator: navigate, play, set speed, detect completion, next.
+    Several automators can share one CDPBrowser (one tab each) on the same event loop.
+    """
+    
+    def __init__(self, platform: str, headless: bool = True, playback_speed: float = 1.0, user_id: int = None,
+                 browser: CDPBrowser = None, lean: bool = LEAN_MODE, db_path: str = DATABASE_PATH):
+        self.platform = platform.lower()
+        if self.platform not in PLATFORMS:
+            raise ValueError(f"Unsupported platform: {platform}")
+        
+        self.config = PLATFORMS[self.platform]
+        self.db = Database(db_path=db_path, user_id=user_id)
+        self.user_id = user_id
+        self.headless = headless
+        self.playback_speed = playback_speed
+        self.lean = lean
+        self.browser = browser
+        self._owns_browser = browser is None
+        self.page: Optional[CDPPage] = None
+        self._completed = asyncio.Event()
+        self.logger = logging.getLogger(__name__)
+    
+    async def init_driver(self):
+        """Start (or join) the browser and open this session's tab"""
+        if self.browser is None:
+            self.browser = CDPBrowser(cdp_profile_dir(self.user_id), headless=self.headless, lean=self.lean)
+            await self.browser.start()
+        
+        self.page = await self.browser.new_page()
+        video_selector = json.dumps(self.config['selectors']['video_player'])
+        
+        # Completion arrives as an event; the ad skipper runs in-page as in the Selenium backend
+        await self.page.send('Runtime.addBinding', {'name': '__smartVideoEvent'})
+        self.page.on('Runtime.bindingCalled', self._on_binding_called)
+        await self.page.add_script(VIDEO_EVENTS_SCRIPT.substitute(video_selector=video_selector))
+        await self.page.add_script(AD_SKIPPER_SCRIPT.substitute(
+            skip_selectors=json.dumps(AD_SKIP_SELECTORS),
+            overlay_selectors=json.dumps(AD_OVERLAY_SELECTORS),
+            video_selector=video_selector
+        ))
+        
+        self.logger.info(f"CDP session initialized for {self.platform} (user: {self.user_id})")
+        await asyncio.to_thread(self.db.add_log, 'driver_init', f'CDP session initialized for {self.platform}',
+                                'success')
+    
+    def _on_binding_called(self, params: Dict):
+        if params.get('name') == '__smartVideoEvent':
+            self._completed.set()
+    
+    async def navigate_to_playlist(self, playlist_url: str):
+        await self.page.navigate(playlist_url)
+        self.logger.info(f"Navigated to playlist: {playlist_url}")
+        await asyncio.to_thread(self.db.add_log, 'navigate', f'Opened playlist: {playlist_url}', 'info')
+    
+    async def enumerate_playlist(self, playlist_url: str, refresh: bool = False) -> List[Dict]:
+        """Same contract as VideoAutomator.enumerate_playlist (shares its database cache)"""
+        if not refresh:
+            items = await asyncio.to_thread(self.db.get_playlist_items, playlist_url)
+            if items:
+                return items
+        
+        await self.page.navigate(playlist_page_url(playlist_url) if self.platform == 'youtube' else playlist_url)
+        items = None
+        try:
+            if self.platform == 'youtube':
+                items = await self.page.evaluate(YOUTUBE_PLAYLIST_SCRIPT, timeout=60)  # Follows continuations
+            if not items and self.config['selectors'].get('playlist_item'):
+                items = await self.page.evaluate(PLAYLIST_ITEM_LINKS_SCRIPT, self.config['selectors']['playlist_item'])
+        except CDPError as e:
+            self.logger.error(f"Error collecting playlist items: {str(e)}")
+        
+        unique = {}
+        for item in items or []:
+            if item.get('url'):
+                unique.setdefault(video_key(item['url']), item)
+        if unique:
+            await asyncio.to_thread(self.db.save_playlist_items, playlist_url, list(unique.values()))
+        self.logger.info(f"Found {len(unique)} videos in playlist")
+        return await asyncio.to_thread(self.db.get_playlist_items, playlist_url) if unique else []
+    
+    async def get_pending_items(self, playlist_url: str, refresh: bool = False) -> List[Dict]:
+        """Same contract as VideoAutomator.get_pending_items (re-reads the playlist before reporting it done)"""
+        items = await self.enumerate_playlist(playlist_url, refresh=refresh)
+        completed_videos = await asyncio.to_thread(self.db.get_completed_videos, self.platform)
+        completed = {video_key(v['video_url']) for v in completed_videos}
+        pending = [item for item in items if video_key(item['url']) not in completed]
+        if items and not pending and not refresh:
+            return await self.get_pending_items(playlist_url, refresh=True)
+        return pending
+    
+    async def set_playback_speed(self, speed: float = None) -> bool:
+        if speed is None:
+            speed = self.playback_speed
+        try:
+            found = await self.page.evaluate(
+                "const v = document.querySelector(arguments[0]); if (!v) return false; v.playbackRate = arguments[1]; return true;",
+                self.config['selectors']['video_player'], speed
+            )
+            if found:
+                self.logger.info(f"Playback speed set to {speed}x")
+            return bool(found)
+        except CDPError as e:
+            self.logger.error(f"Error setting playback speed: {str(e)}")
+            return False
+    
+    async def play_video(self) -> bool:
+        """Start the current video at the configured speed (one round trip)"""
+        self._completed.clear()
+        try:
+            state = await self.page.evaluate(PLAY_SCRIPT, self.config['selectors']['video_player'], self.playback_speed)
+        except CDPError as e:
+            self.logger.error(f"Error playing video: {str(e)}")
+            await asyncio.to_thread(self.db.add_log, 'video_play', f'Error: {str(e)}', 'error')
+            return False
+        
+        if not state:
+            self.logger.error("Video player not found")
+            await asyncio.to_thread(self.db.add_log, 'video_play', 'Video player not found', 'error')
+            return False
+        
+        # Hand the playback rate to the ad skipper so it can restore it after an ad
+        await self.page.evaluate(AD_SKIPPER_STATS_SCRIPT, self.playback_speed)
+        
+        url = await self.page.current_url()
+        title = await self.page.evaluate('return document.title;')
+        await asyncio.to_thread(self.db.add_video, self.platform, url, title=title)
+        await asyncio.to_thread(self.db.add_log, 'video_play', f'Started playing: {title}', 'success')
+        self.logger.info(f"▶️ Playing: {title}")
+        return True
+    
+    async def is_video_complete(self) -> bool:
+        """Ended, or within the last 3 seconds (one status read)"""
+        try:
+            status = await self.page.evaluate(VIDEO_STATUS_SCRIPT, self.config['selectors']['video_player'])
+        except CDPError:
+            return False
+        if not status:
+            return False
+        if status.get('ended'):
+            return True
+        duration = status.get('duration')
+        current_time = status.get('currentTime')
+        if not duration or duration <= 0 or float('inf') == duration or not current_time:
+            return False
+        return duration - current_time < 3
+    
+    async def wait_for_completion(self, max_stalled_checks: int = 4) -> bool:
+        """
+        Wait for the page to report the video finished. A status read every
+        COMPLETION_CHECK_INTERVAL seconds covers lost events and resumes paused playback.
+        """
+        stalled_checks = 0
+        while True:
+            try:
+                await asyncio.wait_for(self._completed.wait(), COMPLETION_CHECK_INTERVAL)
+                return True
+            except asyncio.TimeoutError:
+                pass
+            
+            if await self.is_video_complete():
+                return True
+            
+            status = await self.page.evaluate(VIDEO_STATUS_SCRIPT, self.config['selectors']['video_player'])
+            if not status:
+                stalled_checks += 1
+                if stalled_checks >= max_stalled_checks:
+                    return False
+                continue
+            stalled_checks = 0
+            
+            if status.get('paused') and not status.get('ended'):
+                await self.page.evaluate(
+                    "const v = document.querySelector(arguments[0]); v.playbackRate = arguments[1]; await v.play();",
+                    self.config['selectors']['video_player'], self.playback_speed
+                )
+    
+    async def next_video(self) -> bool:
+        """Click the platform's next button and wait for the URL to change"""
+        current_url = await self.page.current_url()
+        await asyncio.to_thread(self.db.mark_video_completed, current_url)
+        
+        # Full page load or an in-page (SPA) navigation, whichever the platform does
+        navigated = [
+            self.page.expect('Page.frameNavigated', lambda p: not p.get('frame', {}).get('parentId')),
+            self.page.expect('Page.navigatedWithinDocument')
+        ]
+        try:
+            if not await self.page.evaluate(CLICK_SCRIPT, self.config['selectors']['next_button']):
+                return False
+            await asyncio.wait(navigated, timeout=15, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for future in navigated:
+                future.cancel()
+        
+        new_url = await self.page.current_url()
+        if video_key(new_url) == video_key(current_url):
+            return False
+        await asyncio.to_thread(self.db.add_log, 'video_next', 'Moved to next video via button', 'success')
+        return True
+    
+    async def watch_video(self, video_url: str) -> bool:
+        """Open one video, play it to the end and mark it completed"""
+        await self.page.navigate(video_url)
+        if not await self.play_video():
+            return False
+        if not await self.wait_for_completion():
+            self.logger.error(f"❌ No playable video at {video_url}")
+            await asyncio.to_thread(self.db.add_log, 'video_play', f'No playable video: {video_url}', 'error')
+            return False
+        
+        await asyncio.to_thread(self.db.mark_video_completed, await self.page.current_url())
+        self.logger.info(f"✅ Completed: {video_url}")
+        return True
+    
+    async def automate_playlist(self, playlist_url: str, video_limit: int = None, playback_speed: float = None) -> int:
+        """Watch the playlist's unwatched items in order; returns the number of videos watched"""
+        if playback_speed:
+            self.playback_speed = playback_speed
+        
+        videos_watched = 0
+        pending = await self.get_pending_items(playlist_url)
+        if pending:
+            attempted = set()
+            while pending:
+                for item in pending:
+                    if video_limit and videos_watched >= video_limit:
+                        break
+                    attempted.add(video_key(item['url']))
+                    if await self.watch_video(item['url']):
+                        videos_watched += 1
+                        await asyncio.to_thread(self.db.add_videos_watched, playlist_url)
+                if video_limit and videos_watched >= video_limit:
+                    break
+                # Re-read the playlist before ending - items may have been added or not enumerated
+                pending = [item for item in await self.get_pending_items(playlist_url, refresh=True)
+                           if video_key(item['url']) not in attempted]
+        else:
+            # Playlist could not be enumerated - follow the next button instead
+            await self.navigate_to_playlist(playlist_url)
+            while not video_limit or videos_watched < video_limit:
+                if not await self.play_video() or not await self.wait_for_completion():
+                    break
+                videos_watched += 1
+                await asyncio.to_thread(self.db.add_videos_watched, playlist_url)
+                if not await self.next_video():
+                    self.logger.info("🏁 Reached end of playlist (no more videos)")
+                    break
+        
+        self.logger.info(f"🎉 Automation complete. Watched {videos_watched} videos")
+        await asyncio.to_thread(self.db.add_log, 'automation_complete',
+                                f'Watched {videos_watched} videos from {playlist_url}', 'success')
+        return videos_watched
+    
+    async def close(self):
+        if self.browser and self.page:
+            await self.browser.close_page(self.page)
+        if self._owns_browser and self.browser:
+            await self.browser.close()
+            self.logger.info("Browser closed")
+            await asyncio.to_thread(self.db.add_log, 'driver_close', 'Browser closed', 'info')
+
+
+async def run_sessions(platform: str, playlist_url: str, sessions: int = CDP_SESSIONS, video_limit: int = None,
+                       playback_speed: float = 1.0, user_id: int = None, headless: bool = True,
+                       lean: bool = LEAN_MODE, db_path: str = DATABASE_PATH) -> int:
+    """
+    Watch a playlist with `sessions` tabs of one browser, all driven by the current event loop.
+    Items are handed out from a shared queue as tabs finish. Returns the number of videos watched.
+    """
+    browser = CDPBrowser(cdp_profile_dir(user_id), headless=headless, lean=lean)
+    await browser.start()
+    
+    automators = []
+    try:
+        probe = AsyncVideoAutomator(platform, headless=headless, playback_speed=playback_speed,
+                                    user_id=user_id, browser=browser, lean=lean, db_path=db_path)
+        await probe.init_driver()
+        automators.append(probe)
+        
+        pending = await probe.get_pending_items(playlist_url)
+        if video_limit:
+            pending = pending[:video_limit]
+        if not pending:
+            logger.info("Nothing to watch - playlist empty or already completed")
+            return 0
+        
+        for _ in range(min(sessions, len(pending)) - 1):
+            automator = AsyncVideoAutomator(platform, headless=headless, playback_speed=playback_speed,
+                                            user_id=user_id, browser=browser, lean=lean, db_path=db_path)
+            await automator.init_driver()
+            automators.append(automator)
+        
+        queue = asyncio.Queue()
+        for item in pending:
+            queue.put_nowait(item['url'])
+        
+        async def worker(automator: AsyncVideoAutomator) -> int:
+            watched = 0
+            while True:
+                try:
+                    url = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return watched
+                try:
+                    if await automator.watch_video(url):
+                        watched += 1
+                        await asyncio.to_thread(automator.db.add_videos_watched, playlist_url)
+                except Exception as e:
+                    # One bad video (timeout, crashed tab) fails only that video, not every session
+                    logger.error(f"❌ Session error on {url}: {str(e)}")
+        
+        logger.info(f"Starting CDP automation: {len(pending)} videos, {len(automators)} sessions")
+        results = await asyncio.gather(*(worker(a) for a in automators))
+        watched = sum(results)
+        
+        # Workers already added their videos to the count
+        is_complete = not await probe.get_pending_items(playlist_url)
+        await asyncio.to_thread(probe.db.set_playlist_complete, playlist_url, is_complete)
+        logger.info(f"🎉 CDP automation complete. Watched {watched} videos")
+        return watched
+    finally:
+        for automator in automators:
+            await automator.close()
+        await browser.close()
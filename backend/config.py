@@ -19,7 +19,8 @@ PLATFORMS = {
             'video_player': 'video.html5-main-video',
             'next_button': 'a.ytp-next-button',
             'play_button': 'button.ytp-play-button',
-            'ad_skip': 'button.ytp-ad-skip-button'
+            'ad_skip': 'button.ytp-ad-skip-button',
+            'playlist_item': 'ytd-playlist-panel-video-renderer a#wc-endpoint, ytd-playlist-video-renderer a#video-title'
         }
     },
     'coursera': {
@@ -28,7 +29,8 @@ PLATFORMS = {
             'video_player': 'video',
             'next_button': 'button[data-test="next-button"]',
             'quiz_container': 'div[data-test="quiz-question"]',
-            'submit_button': 'button[type="submit"]'
+            'submit_button': 'button[type="submit"]',
+            'playlist_item': 'a[href*="/lecture/"]'
         }
     },
     'udemy': {
@@ -37,7 +39,8 @@ PLATFORMS = {
             'video_player': 'video.vp-center',
             'next_button': 'button[data-purpose="next-item"]',
             'quiz_option': 'label.mc-quiz-question--answer-label',
-            'submit_button': 'button[data-purpose="submit-quiz"]'
+            'submit_button': 'button[data-purpose="submit-quiz"]',
+            'playlist_item': 'a[href*="/lecture/"]'
         }
     },
     'moodle': {
@@ -46,11 +49,40 @@ PLATFORMS = {
             'video_player': 'video',
             'next_button': 'a.next-activity-link',
             'quiz_container': 'div.que',
-            'submit_button': 'input[type="submit"]'
+            'submit_button': 'input[type="submit"]',
+            'playlist_item': 'li.activity a.aalink'
         }
     }
 }
 
+# Selector statistics (which fallback selector works per platform) - unique per machine/user
+SELECTOR_CACHE_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', f'selector_stats_{MACHINE_ID}.json')
+
+# Lean Browser Mode - blocks heavy resources and plays the lowest video quality
+LEAN_MODE = os.getenv('LEAN_MODE', 'false').lower() == 'true'
+LEAN_BLOCKED_URLS = [
+    # Images, fonts and thumbnails
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.ico', '*.svg',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*i.ytimg.com*', '*yt3.ggpht.com*', '*img-c.udemycdn.com*',
+    # Ads and trackers
+    '*doubleclick.net*', '*googlesyndication.com*', '*googleadservices.com*',
+    '*google-analytics.com*', '*googletagmanager.com*', '*youtube.com/pagead/*',
+    '*youtube.com/api/stats/ads*', '*youtube.com/ptracking*', '*facebook.net*',
+    '*hotjar.com*', '*segment.io*', '*optimizely.com*'
+]
+# Quality menus for players without a scriptable quality API (last entry = lowest quality)
+LEAN_QUALITY_MENUS = {
+    'udemy': {
+        'menu_button': 'button[data-purpose="settings-button"]',
+        'options': 'ul[data-purpose="quality-menu"] button, [data-purpose="quality-menu"] [role="menuitemradio"]'
+    },
+    'coursera': {
+        'menu_button': 'button[aria-label*="Quality"], button[aria-label*="quality"]',
+        'options': '[role="menu"] [role="menuitemradio"]'
+    }
+}
+
 # Database Configuration - Unique per machine/user to prevent cross-device conflicts
 DATABASE_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', f'learning_progress_{MACHINE_ID}.db')
 
@@ -65,10 +97,42 @@ VIDEO_CHECK_INTERVAL = 2  # seconds
 MAX_RETRIES = 3
 DEFAULT_PLAYBACK_SPEED = 1.0  # 1x normal speed (options: 1.0, 1.25, 1.5, 2.0)
 AVAILABLE_SPEEDS = [0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0]
+MAX_CONCURRENT_TABS = int(os.getenv('MAX_CONCURRENT_TABS', 3))  # Tabs played at once in multi-tab mode
+SHARD_WORKERS = int(os.getenv('SHARD_WORKERS', 2))  # Browser processes for sharded playlist runs
+BROWSER_MEMORY_LIMIT_MB = int(os.getenv('BROWSER_MEMORY_LIMIT_MB', 1500))  # Restart the browser above this RSS (0 = never)
+MEMORY_CHECK_INTERVAL = 30  # seconds between browser memory samples
+CHROME_BINARY = os.getenv('CHROME_BINARY', '')  # Chrome for the async CDP backend (found on PATH if empty)
+CDP_SESSIONS = int(os.getenv('CDP_SESSIONS', 3))  # Tabs one event loop drives at once with the CDP backend
 
 # ML Model Configuration
 ML_MODEL_NAME = 'distilbert-base-cased-distilled-squad'
 CONFIDENCE_THRESHOLD = 0.7
+QUIZ_MEMO_MAX_ENTRIES = int(os.getenv('QUIZ_MEMO_MAX_ENTRIES', 5000))  # Memoized score vectors kept (least recently used evicted)
+QA_BATCH_SIZE = int(os.getenv('QA_BATCH_SIZE', 16))  # (question, option) pairs per forward pass
+QA_PADDING = os.getenv('QA_PADDING', 'longest')  # Tokenizer padding: 'longest', 'max_length' or 'do_not_pad'
+QA_ENGINE = os.getenv('QA_ENGINE', 'fp32')  # 'fp32', 'int8' (dynamic quantization) or 'onnx' (ONNX Runtime)
+MODEL_CACHE_DIR = os.path.join(os.path.dirname(__file__), 'models')  # Exported ONNX graphs (<name>-onnx)
+QUIZ_WORKERS = int(os.getenv('QUIZ_WORKERS', 2))  # Quiz-solving processes shared by all automations (0 = solve in-thread)
+QUIZ_QUEUE_DEPTH = int(os.getenv('QUIZ_QUEUE_DEPTH', 8))  # Quiz pages queued or being solved at once
+QUIZ_SOLVE_TIMEOUT = 120  # seconds to wait for a page's answers (includes the first model load)
+RETRIEVAL_ENABLED = os.getenv('RETRIEVAL_ENABLED', 'true').lower() == 'true'  # Quiz context from watched videos
+RETRIEVAL_TOP_K = int(os.getenv('RETRIEVAL_TOP_K', 3))  # Summary/transcript chunks given to the QA model per question
+RETRIEVAL_CHUNK_WORDS = 80  # Words per indexed chunk
+
+# Video Summaries - OpenAI-compatible chat completions endpoint
+OPENAI_API_URL = os.getenv('OPENAI_API_URL', 'https://api.openai.com/v1/chat/completions')
+OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4')
+SUMMARY_WORKERS = int(os.getenv('SUMMARY_WORKERS', 4))  # Videos summarized at once by summarize_many
+SUMMARY_RATE_LIMIT = float(os.getenv('SUMMARY_RATE_LIMIT', 3))  # API requests per second across all threads (0 = unlimited)
+SUMMARY_MAX_RETRIES = int(os.getenv('SUMMARY_MAX_RETRIES', 3))  # Retries after a 429/5xx/connection error
+SUMMARY_BACKOFF_BASE = 1.0  # seconds; retry n waits up to base * 2^n (full jitter)
+SUMMARY_BACKOFF_MAX = 30.0  # seconds
+SUMMARY_REQUEST_TIMEOUT = 30  # seconds per API request
+
+# Tracing - per-phase timing spans (near-zero overhead when disabled)
+TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'false').lower() == 'true'
+TRACE_BUFFER_SIZE = int(os.getenv('TRACE_BUFFER_SIZE', 20000))  # Spans kept in memory (ring buffer)
+TRACE_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'traces')
 
 # Security Settings
 ENCRYPT_CREDENTIALS = True
@@ -10,9 +10,11 @@ from datetime import datetime
 import time
 import threading
 from main import run_automation
+from tracing import get_tracer
 from report_generator import generate_user_report
 from analytics import Analytics
 import os
+import json
 import plotly.express as px
 import plotly.graph_objects as go
 
@@ -1116,6 +1118,24 @@ def dashboard_page():
             st.metric("Total Actions", weekly['total_actions'])
         with col3:
             st.metric("Week Starting", weekly['week_start'])
+        
+        st.markdown("---")
+        st.markdown("### ⏱️ Pipeline Timing")
+        
+        tracer = get_tracer()
+        timing = tracer.summarize()
+        if timing:
+            st.dataframe(pd.DataFrame(timing), use_container_width=True, hide_index=True)
+            st.download_button(
+                label="📥 Download Trace (chrome://tracing)",
+                data=json.dumps(tracer.to_chrome_trace()),
+                file_name=f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                mime="application/json"
+            )
+        elif not tracer.enabled:
+            st.caption("Set TRACING_ENABLED=true before starting the dashboard to time each automation step.")
+        else:
+            st.info("No timing data yet. Run an automation to collect it!")
     
     with tab5:
         st.markdown("### 🤖 AI Video Summaries")
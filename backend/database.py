@@ -7,7 +7,7 @@ import json
 from datetime import datetime
 from typing import List, Dict, Optional
 import os
-from config import DATABASE_PATH
+from config import DATABASE_PATH, QUIZ_MEMO_MAX_ENTRIES
 
 
 class Database:
@@ -26,7 +26,8 @@ class Database:
     
     def get_connection(self):
         """Create a database connection"""
-        return sqlite3.connect(self.db_path)
+        # Generous timeout: parallel playlist workers write to the same file
+        return sqlite3.connect(self.db_path, timeout=30)
     
     def init_database(self):
         """Initialize database tables"""
@@ -94,6 +95,19 @@ class Database:
             )
         ''')
         
+        # Ordered playlist items, enumerated once per playlist
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS playlist_items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER,
+                playlist_url TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                video_url TEXT NOT NULL,
+                title TEXT,
+                UNIQUE(user_id, playlist_url, position)
+            )
+        ''')
+        
         # Quiz answer cache
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS quiz_cache (
@@ -107,6 +121,18 @@ class Database:
             )
         ''')
         
+        # Model scores for every option of a question, at any confidence (keyed on question + option set)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS quiz_memo (
+                memo_key TEXT PRIMARY KEY,
+                question_text TEXT,
+                scores TEXT NOT NULL,
+                hits INTEGER DEFAULT 0,
+                last_used TIMESTAMP
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_quiz_memo_last_used ON quiz_memo(last_used)')
+        
         conn.commit()
         conn.close()
     
@@ -193,6 +219,27 @@ class Database:
         conn.commit()
         conn.close()
     
+    def save_quiz_attempts(self, platform: str, attempts: List[Dict]):
+        """
+        Save several quiz attempts in one transaction
+        attempts: [{'question_text', 'options', 'user_answer', 'correct_answer'?, 'is_correct'?, 'confidence'?}, ...]
+        """
+        if not attempts:
+            return
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.executemany('''
+            INSERT INTO quizzes 
+            (user_id, platform, question_text, options, user_answer, correct_answer, is_correct, confidence_score)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [(self.user_id, platform, a['question_text'], json.dumps(a['options']), a['user_answer'],
+               a.get('correct_answer'), a.get('is_correct'), a.get('confidence')) for a in attempts])
+        
+        conn.commit()
+        conn.close()
+    
     def get_quiz_stats(self, platform: str = None) -> Dict:
         """Get quiz statistics"""
         conn = self.get_connection()
@@ -307,19 +354,107 @@ class Database:
         
         return result[0] if result else None
     
+    def get_memo_scores(self, memo_keys: List[str]) -> Dict[str, Dict[str, float]]:
+        """Stored option scores for each memo key found ({memo_key: {option: score}}); marks them recently used"""
+        if not memo_keys:
+            return {}
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        placeholders = ','.join('?' * len(memo_keys))
+        cursor.execute(f'SELECT memo_key, scores FROM quiz_memo WHERE memo_key IN ({placeholders})', memo_keys)
+        found = {key: json.loads(scores) for key, scores in cursor.fetchall()}
+        
+        if found:
+            cursor.executemany('UPDATE quiz_memo SET hits = hits + 1, last_used = ? WHERE memo_key = ?',
+                               [(datetime.now(), key) for key in found])
+            conn.commit()
+        conn.close()
+        return found
+    
+    def save_memo_scores(self, entries: List[Dict], max_entries: int = QUIZ_MEMO_MAX_ENTRIES):
+        """
+        Store option scores in one transaction, then evict the least recently used entries beyond `max_entries`
+        entries: [{'memo_key', 'question_text', 'scores': {option: score}}, ...]
+        """
+        if not entries:
+            return
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        now = datetime.now()
+        cursor.executemany('''
+            INSERT OR REPLACE INTO quiz_memo (memo_key, question_text, scores, hits, last_used)
+            VALUES (?, ?, ?, 0, ?)
+        ''', [(e['memo_key'], e['question_text'], json.dumps(e['scores']), now) for e in entries])
+        
+        cursor.execute('''
+            DELETE FROM quiz_memo WHERE memo_key IN (
+                SELECT memo_key FROM quiz_memo ORDER BY last_used DESC LIMIT -1 OFFSET ?
+            )
+        ''', (max_entries,))
+        
+        conn.commit()
+        conn.close()
+    
     def increment_video_count(self, playlist_url: str, count: int):
         """Update playlist progress - increment video count"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
+        cursor.execute('BEGIN IMMEDIATE')  # NULL user_ids never hit ON CONFLICT - see add_videos_watched
+        cursor.execute(
+            'UPDATE playlist_progress SET total_videos_watched = ?, last_watched_at = ? WHERE playlist_url = ? AND user_id IS ?',
+            (count, datetime.now(), playlist_url, self.user_id)
+        )
+        if cursor.rowcount == 0:
+            cursor.execute('''
+                INSERT INTO playlist_progress (user_id, playlist_url, total_videos_watched, last_watched_at)
+                VALUES (?, ?, ?, ?)
+            ''', (self.user_id, playlist_url, count, datetime.now()))
+        
+        conn.commit()
+        conn.close()
+    
+    def add_videos_watched(self, playlist_url: str, count: int = 1):
+        """Atomically add to a playlist's watched count (safe across worker processes)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        # Update-then-insert rather than ON CONFLICT: NULL user_ids never conflict, so every
+        # call would add a row. BEGIN IMMEDIATE keeps two workers from both inserting.
+        cursor.execute('BEGIN IMMEDIATE')
         cursor.execute('''
-            INSERT INTO playlist_progress (user_id, playlist_url, total_videos_watched, last_watched_at)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(user_id, playlist_url) 
-            DO UPDATE SET 
-                total_videos_watched = ?,
-                last_watched_at = ?
-        ''', (self.user_id, playlist_url, count, datetime.now(), count, datetime.now()))
+            UPDATE playlist_progress
+            SET total_videos_watched = COALESCE(total_videos_watched, 0) + ?, last_watched_at = ?
+            WHERE playlist_url = ? AND user_id IS ?
+        ''', (count, datetime.now(), playlist_url, self.user_id))
+        if cursor.rowcount == 0:
+            cursor.execute('''
+                INSERT INTO playlist_progress (user_id, playlist_url, total_videos_watched, last_watched_at)
+                VALUES (?, ?, ?, ?)
+            ''', (self.user_id, playlist_url, count, datetime.now()))
+        
+        conn.commit()
+        conn.close()
+    
+    def set_playlist_complete(self, playlist_url: str, is_complete: bool):
+        """Record whether a playlist is finished without touching its watched count"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('BEGIN IMMEDIATE')
+        cursor.execute(
+            'UPDATE playlist_progress SET is_complete = ?, last_watched_at = ? WHERE playlist_url = ? AND user_id IS ?',
+            (is_complete, datetime.now(), playlist_url, self.user_id)
+        )
+        if cursor.rowcount == 0:
+            cursor.execute('''
+                INSERT INTO playlist_progress (user_id, playlist_url, total_videos_watched, last_watched_at, is_complete)
+                VALUES (?, ?, 0, ?, ?)
+            ''', (self.user_id, playlist_url, datetime.now(), is_complete))
         
         conn.commit()
         conn.close()
@@ -329,17 +464,17 @@ class Database:
         conn = self.get_connection()
         cursor = conn.cursor()
         
+        cursor.execute('BEGIN IMMEDIATE')  # NULL user_ids never hit ON CONFLICT - see add_videos_watched
         cursor.execute('''
-            INSERT INTO playlist_progress 
-            (user_id, playlist_url, total_videos_watched, last_watched_at, is_complete)
-            VALUES (?, ?, ?, ?, ?)
-            ON CONFLICT(user_id, playlist_url) 
-            DO UPDATE SET 
-                total_videos_watched = ?,
-                last_watched_at = ?,
-                is_complete = ?
-        ''', (self.user_id, playlist_url, videos_watched, datetime.now(), is_complete, 
-              videos_watched, datetime.now(), is_complete))
+            UPDATE playlist_progress SET total_videos_watched = ?, last_watched_at = ?, is_complete = ?
+            WHERE playlist_url = ? AND user_id IS ?
+        ''', (videos_watched, datetime.now(), is_complete, playlist_url, self.user_id))
+        if cursor.rowcount == 0:
+            cursor.execute('''
+                INSERT INTO playlist_progress
+                (user_id, playlist_url, total_videos_watched, last_watched_at, is_complete)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (self.user_id, playlist_url, videos_watched, datetime.now(), is_complete))
         
         conn.commit()
         conn.close()
@@ -381,3 +516,58 @@ class Database:
             progress = [dict(zip(columns, row)) for row in cursor.fetchall()]
             conn.close()
             return progress
+    
+    def save_playlist_items(self, playlist_url: str, items: List[Dict]):
+        """Store the ordered list of videos in a playlist (replaces any previous list)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(
+                'DELETE FROM playlist_items WHERE playlist_url = ? AND user_id IS ?',
+                (playlist_url, self.user_id)
+            )
+            cursor.executemany('''
+                INSERT INTO playlist_items (user_id, playlist_url, position, video_url, title)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [(self.user_id, playlist_url, position, item['url'], item.get('title'))
+                  for position, item in enumerate(items)])
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            conn.close()
+    
+    def get_playlist_items(self, playlist_url: str) -> List[Dict]:
+        """Get the stored playlist items in playlist order"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT position, video_url, title FROM playlist_items
+            WHERE playlist_url = ? AND user_id IS ?
+            ORDER BY position
+        ''', (playlist_url, self.user_id))
+        
+        items = [{'position': row[0], 'url': row[1], 'title': row[2]} for row in cursor.fetchall()]
+        conn.close()
+        return items
+    
+    def set_last_video(self, playlist_url: str, video_url: str):
+        """Remember the video currently being watched so a restart can resume from it"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(
+            'UPDATE playlist_progress SET last_video_url = ? WHERE playlist_url = ? AND user_id IS ?',
+            (video_url, playlist_url, self.user_id)
+        )
+        if cursor.rowcount == 0:
+            cursor.execute('''
+                INSERT INTO playlist_progress (user_id, playlist_url, last_video_url, last_watched_at)
+                VALUES (?, ?, ?, ?)
+            ''', (self.user_id, playlist_url, video_url, datetime.now()))
+        
+        conn.commit()
+        conn.close()
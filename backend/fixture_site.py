@@ -0,0 +1,417 @@
+"""
+Local Fixture Learning Site
+Offline stand-in for YouTube, Udemy, Coursera and Moodle used by the benchmarks.
+Pages reuse the selectors from config.PLATFORMS; videos are short generated clips.
+
+Usage:
+    with FixtureSite(videos=5, video_seconds=8) as site:
+        automator.automate_playlist(site.playlist_url('youtube'))
+    
+    python fixture_site.py --port 8765   # browse it manually
+"""
+import argparse
+import io
+import json
+import struct
+import threading
+import wave
+from html import escape
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from string import Template
+from urllib.parse import urlparse, parse_qs
+from typing import Dict, List
+
+
+# Questions served on the quiz pages (answers are used to score the quiz solver)
+QUIZ_BANK = [
+    {
+        'question': 'Which keyword is used to define a function in Python?',
+        'options': ['func', 'def', 'lambda', 'function'],
+        'answer': 'def',
+        'context': 'In Python a function is defined with the def keyword, followed by its name and parameters.'
+    },
+    {
+        'question': 'What data structure uses first-in, first-out ordering?',
+        'options': ['Stack', 'Queue', 'Tree', 'Graph'],
+        'answer': 'Queue',
+        'context': 'A queue processes items in first-in, first-out order, while a stack is last-in, first-out.'
+    },
+    {
+        'question': 'Which HTTP method is normally used to submit a form that creates a resource?',
+        'options': ['GET', 'POST', 'HEAD', 'OPTIONS'],
+        'answer': 'POST',
+        'context': 'Forms that create a new resource on the server are submitted with the POST method.'
+    },
+    {
+        'question': 'What does CSS stand for?',
+        'options': ['Computer Style Sheets', 'Cascading Style Sheets', 'Creative Style System', 'Colorful Style Sheets'],
+        'answer': 'Cascading Style Sheets',
+        'context': 'CSS stands for Cascading Style Sheets and describes how HTML elements are displayed.'
+    },
+    {
+        'question': 'Which SQL clause filters rows before grouping?',
+        'options': ['HAVING', 'ORDER BY', 'WHERE', 'LIMIT'],
+        'answer': 'WHERE',
+        'context': 'The WHERE clause filters rows before GROUP BY is applied; HAVING filters groups afterwards.'
+    }
+]
+
+
+PAGE = Template("""<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>$title</title></head>
+<body>
+$body
+<script>
+const video = document.querySelector('video');
+if (video) {
+    video.muted = true;
+    const play = () => video.play().catch(() => {});
+    document.querySelectorAll('.fixture-play').forEach(b => b.addEventListener('click', play));
+    video.addEventListener('click', play);
+    $autoplay
+}
+</script>
+</body>
+</html>
+""")
+
+# YouTube-style ad overlay; the skip button is inserted after a delay like the real one
+AD_SNIPPET = Template("""
+<div class="video-ads ytp-ad-module">
+  <div class="ytp-ad-player-overlay">Advertisement</div>
+</div>
+<script>
+setTimeout(() => {
+    const ads = document.querySelector('.video-ads');
+    if (!ads) return;
+    const skip = document.createElement('button');
+    skip.className = 'ytp-ad-skip-button ytp-ad-skip-button-modern';
+    skip.textContent = 'Skip Ad';
+    skip.addEventListener('click', () => ads.remove());
+    ads.appendChild(skip);
+}, $skip_delay_ms);
+</script>
+""")
+
+# Minimal player API used by lean mode's quality switch
+YOUTUBE_PLAYER_STUB = """
+<script>
+const player = document.getElementById('movie_player');
+player.getAvailableQualityLevels = () => ['hd720', 'large', 'medium', 'small', 'tiny', 'auto'];
+player.setPlaybackQuality = (q) => { player.dataset.quality = q; };
+player.setPlaybackQualityRange = (lo, hi) => { player.dataset.quality = lo; };
+</script>
+"""
+
+
+def generate_clip(seconds: int, sample_rate: int = 8000) -> bytes:
+    """Silent mono 8-bit WAV - tiny, but a real media file with a real duration"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as clip:
+        clip.setnchannels(1)
+        clip.setsampwidth(1)
+        clip.setframerate(sample_rate)
+        clip.writeframes(struct.pack('B', 128) * (sample_rate * seconds))
+    return buffer.getvalue()
+
+
+class FixtureSite:
+    """
+    Serves the fixture pages from a background thread
+    
+    videos: Items per playlist/course
+    video_seconds: Length of every clip
+    ad_every: Show a skippable ad on every Nth video (0 = never)
+    page_padding_kb: Extra markup per page to mimic heavy production pages
+    """
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, videos: int = 5, video_seconds: int = 8,
+                 ad_every: int = 2, page_padding_kb: int = 0):
+        self.videos = videos
+        self.video_seconds = video_seconds
+        self.ad_every = ad_every
+        self.page_padding_kb = page_padding_kb
+        self._clips: Dict[int, bytes] = {}
+        
+        site = self
+        
+        class Handler(FixtureRequestHandler):
+            fixture = site
+        
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.thread = None
+    
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+    
+    def playlist_url(self, platform: str) -> str:
+        """Start URL for each platform's playlist/course"""
+        return self.base_url + {
+            'youtube': '/youtube/playlist?list=FIXTURE',
+            'udemy': '/udemy/course/fixture-course/learn/lecture/0',
+            'coursera': '/coursera/learn/fixture-course/lecture/0',
+            'moodle': '/moodle/course/view.php?id=1'
+        }[platform]
+    
+    def quiz_url(self, platform: str, questions: int = 1) -> str:
+        """Quiz page for each platform (questions > 1 = several questions on one page)"""
+        return self.base_url + {
+            'youtube': '/generic/quiz',
+            'udemy': '/udemy/course/fixture-course/learn/quiz/1',
+            'coursera': '/coursera/learn/fixture-course/quiz/1',
+            'moodle': '/moodle/mod/quiz/attempt.php?attempt=1'
+        }[platform] + ('&' if platform == 'moodle' else '?') + f'questions={questions}'
+    
+    def clip(self, seconds: int) -> bytes:
+        if seconds not in self._clips:
+            self._clips[seconds] = generate_clip(seconds)
+        return self._clips[seconds]
+    
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    """Routes fixture URLs to page builders"""
+    
+    fixture: FixtureSite = None
+    
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+    
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = [p for p in url.path.split('/') if p]
+        
+        try:
+            if url.path == '/media/clip.wav':
+                seconds = int(query.get('seconds', [self.fixture.video_seconds])[0])
+                return self._send(self.fixture.clip(seconds), 'audio/wav')
+            if url.path == '/quiz/submitted':
+                return self._send_page('Quiz submitted', '<h1 class="quiz-result">Quiz submitted</h1>')
+            
+            platform = parts[0] if parts else ''
+            questions = int(query.get('questions', ['1'])[0])
+            
+            if platform == 'youtube' and url.path == '/youtube/playlist':
+                return self._youtube_playlist(query.get('list', ['FIXTURE'])[0])
+            if platform == 'youtube' and url.path == '/youtube/watch':
+                video_id = query.get('v', ['vid0'])[0]
+                return self._youtube_watch(int(video_id.replace('vid', '') or 0), query.get('list', ['FIXTURE'])[0])
+            if platform in ('udemy', 'coursera') and 'lecture' in parts:
+                return self._lecture(platform, int(parts[-1]))
+            if platform in ('udemy', 'coursera') and 'quiz' in parts:
+                return self._quiz(platform, questions)
+            if url.path == '/moodle/course/view.php':
+                return self._moodle_course()
+            if url.path == '/moodle/mod/page/view.php':
+                return self._lecture('moodle', int(query.get('id', ['0'])[0]))
+            if url.path == '/moodle/mod/quiz/attempt.php':
+                return self._quiz('moodle', questions)
+            if url.path == '/generic/quiz':
+                return self._quiz('generic', questions)
+        except (ValueError, IndexError):
+            pass
+        
+        self.send_error(404)
+    
+    # ---- helpers -----------------------------------------------------------
+    
+    def _send(self, payload: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def _send_page(self, title: str, body: str, autoplay: str = ''):
+        if self.fixture.page_padding_kb:
+            # Inert markup so page_source is as heavy as a production page
+            filler = '<div class="filler">' + 'x' * 1000 + '</div>\n'
+            body += '<div hidden>' + filler * self.fixture.page_padding_kb + '</div>'
+        html = PAGE.substitute(title=escape(title), body=body, autoplay=autoplay)
+        self._send(html.encode('utf-8'), 'text/html; charset=utf-8')
+    
+    def _video_tag(self, css_class: str = '') -> str:
+        src = f'/media/clip.wav?seconds={self.fixture.video_seconds}'
+        class_attr = f' class="{css_class}"' if css_class else ''
+        return f'<video{class_attr} src="{src}" preload="auto"></video>'
+    
+    def _ad(self, index: int) -> str:
+        if self.fixture.ad_every and index % self.fixture.ad_every == 1:
+            return AD_SNIPPET.substitute(skip_delay_ms=1000)
+        return ''
+    
+    # ---- YouTube -----------------------------------------------------------
+    
+    def _youtube_items(self, list_id: str) -> List[Dict]:
+        return [{'videoId': f'vid{i}', 'title': {'simpleText': f'Fixture lecture {i + 1}'}}
+                for i in range(self.fixture.videos)]
+    
+    def _youtube_playlist(self, list_id: str):
+        renderers = [{'playlistVideoRenderer': item} for item in self._youtube_items(list_id)]
+        links = ''.join(
+            f'<ytd-playlist-video-renderer><a id="video-title" href="/youtube/watch?v=vid{i}&list={list_id}">'
+            f'Fixture lecture {i + 1}</a></ytd-playlist-video-renderer>'
+            for i in range(self.fixture.videos)
+        )
+        body = (f'<script>var ytInitialData = {json.dumps({"contents": renderers})};</script>'
+                f'<div id="playlist">{links}</div>')
+        self._send_page('Fixture playlist - YouTube', body)
+    
+    def _youtube_watch(self, index: int, list_id: str):
+        last = index >= self.fixture.videos - 1
+        renderers = [{'playlistPanelVideoRenderer': item} for item in self._youtube_items(list_id)]
+        next_href = f'/youtube/watch?v=vid{index + 1}&list={list_id}'
+        next_button = ('<a class="ytp-next-button ytp-button ytp-button-disabled"></a>' if last
+                       else f'<a class="ytp-next-button ytp-button" href="{next_href}">Next</a>')
+        body = f"""
+<script>var ytInitialData = {json.dumps({"contents": renderers})};</script>
+<div id="movie_player">
+  {self._video_tag('html5-main-video')}
+  <button class="ytp-play-button ytp-button fixture-play" aria-label="Play">Play</button>
+  {next_button}
+  <button class="ytp-button" data-tooltip-target-id="ytp-autonav-toggle-button" aria-checked="true"
+          onclick="this.setAttribute('aria-checked', this.getAttribute('aria-checked') === 'true' ? 'false' : 'true')">
+    Autoplay</button>
+</div>
+{self._ad(index)}
+{YOUTUBE_PLAYER_STUB}
+"""
+        # YouTube autoplays the next item when the toggle is on
+        autoplay = '' if last else (
+            "video.addEventListener('ended', () => {"
+            " if (document.querySelector('[data-tooltip-target-id=\"ytp-autonav-toggle-button\"]')"
+            ".getAttribute('aria-checked') === 'true') location.href = '" + next_href + "'; });"
+        )
+        self._send_page(f'Fixture lecture {index + 1} - YouTube', body, autoplay)
+    
+    # ---- Udemy / Coursera / Moodle lectures --------------------------------
+    
+    def _lecture_href(self, platform: str, index: int) -> str:
+        return {
+            'udemy': f'/udemy/course/fixture-course/learn/lecture/{index}',
+            'coursera': f'/coursera/learn/fixture-course/lecture/{index}',
+            'moodle': f'/moodle/mod/page/view.php?id={index}'
+        }[platform]
+    
+    def _lecture(self, platform: str, index: int):
+        last = index >= self.fixture.videos - 1
+        next_href = self._lecture_href(platform, index + 1)
+        
+        if platform == 'udemy':
+            video = self._video_tag('vp-center')
+            next_button = '' if last else \
+                f'<button data-purpose="next-item" onclick="location.href=\'{next_href}\'">Next</button>'
+        elif platform == 'coursera':
+            video = self._video_tag()
+            next_button = '' if last else \
+                f'<button data-test="next-button" onclick="location.href=\'{next_href}\'">Next</button>'
+        else:
+            video = self._video_tag()
+            next_button = '' if last else f'<a class="next-activity-link" href="{next_href}">Next activity</a>'
+        
+        curriculum = ''.join(
+            f'<li><a href="{self._lecture_href(platform, i)}">Fixture lecture {i + 1}</a></li>'
+            for i in range(self.fixture.videos)
+        ) if platform != 'moodle' else ''
+        
+        body = f"""
+<div class="player">
+  {video}
+  <button class="fixture-play" aria-label="Play">Play</button>
+  {next_button}
+</div>
+<ul class="curriculum">{curriculum}</ul>
+"""
+        self._send_page(f'Fixture lecture {index + 1} - {platform.title()}', body)
+    
+    def _moodle_course(self):
+        activities = ''.join(
+            f'<li class="activity modtype_page"><a class="aalink" href="{self._lecture_href("moodle", i)}">'
+            f'Fixture lecture {i + 1}</a></li>'
+            for i in range(self.fixture.videos)
+        )
+        self._send_page('Fixture course - Moodle', f'<ul class="topics">{activities}</ul>')
+    
+    # ---- Quizzes -----------------------------------------------------------
+    
+    def _quiz(self, platform: str, questions: int):
+        blocks = []
+        for n in range(max(1, questions)):
+            item = QUIZ_BANK[n % len(QUIZ_BANK)]
+            name = f'q{n}'
+            question = escape(item['question'])
+            
+            if platform == 'udemy':
+                options = ''.join(
+                    f'<li><label class="mc-quiz-question--answer-label"><input type="radio" name="{name}" '
+                    f'value="{escape(o)}">{escape(o)}</label></li>' for o in item['options'])
+                blocks.append(f'<div class="mc-quiz-question"><div data-purpose="question-prompt">{question}</div>'
+                              f'<ul>{options}</ul></div>')
+            elif platform == 'coursera':
+                options = ''.join(
+                    f'<label class="rc-Option"><input type="radio" name="{name}" value="{escape(o)}">'
+                    f'<span>{escape(o)}</span></label>' for o in item['options'])
+                blocks.append(f'<div class="rc-FormPartsQuestion"><div data-test="quiz-question">{question}</div>'
+                              f'{options}</div>')
+            elif platform == 'moodle':
+                options = ''.join(
+                    f'<div class="r{i % 2}"><input type="radio" id="{name}_{i}" name="{name}" value="{i}">'
+                    f'<label for="{name}_{i}">{escape(o)}</label></div>' for i, o in enumerate(item['options']))
+                blocks.append(f'<div class="que multichoice"><div class="formulation"><div class="qtext">{question}</div>'
+                              f'<div class="answer">{options}</div></div></div>')
+            else:
+                options = ''.join(
+                    f'<div><input type="radio" id="{name}_{i}" name="{name}" value="{i}">'
+                    f'<label for="{name}_{i}">{escape(o)}</label></div>' for i, o in enumerate(item['options']))
+                blocks.append(f'<fieldset><h3>{question}</h3>{options}</fieldset>')
+        
+        if platform == 'udemy':
+            submit = '<button type="submit" data-purpose="submit-quiz">Check answer</button>'
+        elif platform == 'moodle':
+            submit = '<input type="submit" value="Finish attempt">'
+        else:
+            submit = '<button type="submit">Submit</button>'
+        
+        body = f'<form action="/quiz/submitted" method="get">{"".join(blocks)}{submit}</form>'
+        self._send_page(f'Fixture quiz - {platform.title()}', body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the local fixture learning site')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--videos', type=int, default=5)
+    parser.add_argument('--seconds', type=int, default=8, help='Length of every video')
+    args = parser.parse_args()
+    
+    site = FixtureSite(port=args.port, videos=args.videos, video_seconds=args.seconds)
+    print(f"🧪 Fixture site running at {site.base_url}")
+    for platform in ('youtube', 'udemy', 'coursera', 'moodle'):
+        print(f"   {platform:<9} playlist: {site.playlist_url(platform)}")
+        print(f"   {'':<9} quiz:     {site.quiz_url(platform)}")
+    try:
+        site.server.serve_forever()
+    except KeyboardInterrupt:
+        site.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -4,8 +4,18 @@ Main entry point for Smart E-Learning Automator
 import argparse
 import logging
 from video_automator import VideoAutomator
+from multi_tab_automator import MultiTabAutomator
+from sharded_runner import run_sharded_automation
 from quiz_solver import QuizSolver
 from database import Database
+from tracing import get_tracer, traced
+from model_registry import get_model_registry
+from quiz_service import get_quiz_service
+from config import TRACE_DIR, CDP_SESSIONS
+from cdp_driver import run_sessions
+from datetime import datetime
+import os
+import asyncio
 import time
 
 
@@ -22,9 +32,10 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@traced('run_automation')
 def run_automation(platform: str, playlist_url: str, credentials: dict = None, 
                    auto_quiz: bool = True, video_limit: int = None, playback_speed: float = 1.0,
-                   user_id: int = None):
+                   user_id: int = None, tabs: int = 1):
     """
     Run the complete automation
     
@@ -36,17 +47,31 @@ def run_automation(platform: str, playlist_url: str, credentials: dict = None,
         video_limit: Maximum number of videos to watch (None = all)
         playback_speed: Video speed (0.5x to 2.0x, default 1.0x)
         user_id: User ID for multi-user support (creates user-specific database)
+        tabs: Number of videos to play at once in separate tabs (1 = sequential)
     """
     db = Database(user_id=user_id)  # Create user-specific database
     video_automator = None
     
+    # Load the quiz model in the background while the browser starts and the videos play
+    if auto_quiz:
+        quiz_service = get_quiz_service()
+        if quiz_service:
+            quiz_service.start()  # Each worker process loads its own copy
+        else:
+            get_model_registry().warm_up()
+    
     try:
         logger.info(f"Starting automation for {platform} at {playback_speed}x speed (user_id: {user_id})")
         db.add_log('automation_start', f'Starting automation for {platform} at {playback_speed}x speed', 'info')
         
         # Initialize video automator with user_id
-        video_automator = VideoAutomator(platform=platform, headless=False, 
-                                        playback_speed=playback_speed, user_id=user_id)
+        if tabs and tabs > 1:
+            video_automator = MultiTabAutomator(platform=platform, headless=False,
+                                                playback_speed=playback_speed, user_id=user_id,
+                                                max_tabs=tabs)
+        else:
+            video_automator = VideoAutomator(platform=platform, headless=False, 
+                                            playback_speed=playback_speed, user_id=user_id)
         video_automator.init_driver()
         
         # Login if credentials provided
@@ -86,6 +111,18 @@ def run_automation(platform: str, playlist_url: str, credentials: dict = None,
             video_automator.close()
 
 
+def export_trace():
+    """Write the collected timing spans as Chrome trace JSON (when TRACING_ENABLED=true)"""
+    tracer = get_tracer()
+    if not tracer.enabled:
+        return None
+    
+    trace_file = os.path.join(TRACE_DIR, f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    tracer.export_chrome_trace(trace_file)
+    logger.info(f"⏱️ Trace written to {trace_file} (open in chrome://tracing)")
+    return trace_file
+
+
 def main():
     """CLI interface"""
     parser = argparse.ArgumentParser(description='Smart E-Learning Automator')
@@ -113,6 +150,15 @@ def main():
                        choices=[0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0],
                        help='Video playback speed (0.5x to 2.0x, default: 1.0x)')
     
+    parser.add_argument('--tabs', type=int, default=1,
+                       help='Play this many videos at once in separate tabs (default: 1)')
+    
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Split the playlist across this many browser processes (default: 1)')
+    
+    parser.add_argument('--backend', default='selenium', choices=['selenium', 'cdp'],
+                       help='Browser driver: selenium, or async Chrome DevTools (cdp, no login/quizzes)')
+    
     parser.add_argument('--dashboard', action='store_true',
                        help='Launch Streamlit dashboard instead')
     
@@ -132,6 +178,31 @@ def main():
             'password': args.password
         }
     
+    # Async CDP backend: one event loop drives --tabs sessions (default CDP_SESSIONS)
+    if args.backend == 'cdp':
+        asyncio.run(run_sessions(
+            platform=args.platform,
+            playlist_url=args.url,
+            sessions=args.tabs if args.tabs > 1 else CDP_SESSIONS,
+            video_limit=args.limit,
+            playback_speed=args.speed
+        ))
+        export_trace()
+        return
+    
+    # Sharded run: several browsers each take a slice of the playlist
+    if args.workers > 1:
+        run_sharded_automation(
+            platform=args.platform,
+            playlist_url=args.url,
+            workers=args.workers,
+            credentials=credentials,
+            video_limit=args.limit,
+            playback_speed=args.speed
+        )
+        export_trace()
+        return
+    
     # Run automation
     run_automation(
         platform=args.platform,
@@ -139,8 +210,10 @@ def main():
         credentials=credentials,
         auto_quiz=not args.no_quiz,
         video_limit=args.limit,
-        playback_speed=args.speed
+        playback_speed=args.speed,
+        tabs=args.tabs
     )
+    export_trace()
 
 
 if __name__ == '__main__':
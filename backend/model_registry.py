@@ -0,0 +1,192 @@
+"""
+Model Registry Module
+Loads each QA model once per process and shares it between every QuizSolver
+"""
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+from config import ML_MODEL_NAME, QA_ENGINE, MODEL_CACHE_DIR
+from tracing import get_tracer
+
+# Lazy import for transformers to avoid runtime errors
+_transformers_available = True
+try:
+    import torch
+    from transformers import pipeline, AutoModelForQuestionAnswering, AutoTokenizer
+except Exception as e:
+    _transformers_available = False
+    logging.warning(f"Transformers not available: {e}. Quiz solving will use simpler methods.")
+
+# ONNX Runtime is optional - only needed for QA_ENGINE=onnx
+_onnx_available = True
+try:
+    from optimum.onnxruntime import ORTModelForQuestionAnswering
+except Exception:
+    _onnx_available = False
+
+ENGINES = ['fp32', 'int8', 'onnx']
+
+# psutil is optional - only needed to report how much memory a model took
+_psutil_available = True
+try:
+    import psutil
+except ImportError:
+    _psutil_available = False
+
+
+def _process_rss_mb() -> Optional[float]:
+    if not _psutil_available:
+        return None
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+class SharedModel:
+    """
+    A loaded pipeline shared across threads
+    Calls are serialized - Hugging Face tokenizers are not safe to use from two threads at once
+    """
+    
+    def __init__(self, model, name: str):
+        self.model = model
+        self.name = name
+        self.lock = threading.Lock()
+    
+    def __call__(self, *args, **kwargs):
+        with self.lock:
+            return self.model(*args, **kwargs)
+
+
+def model_key(name: str, engine: str) -> str:
+    return f'{name}:{engine}'
+
+
+def onnx_export_dir(name: str) -> str:
+    """Where the exported ONNX graph for a Hugging Face model name is kept"""
+    return os.path.join(MODEL_CACHE_DIR, name.replace('/', '--') + '-onnx')
+
+
+class ModelRegistry:
+    """Process-wide cache of loaded models (one per name and engine) with their load time and memory cost"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.models: Dict[str, SharedModel] = {}
+        self.load_locks: Dict[str, threading.Lock] = {}  # One loader per model; other callers wait for it
+        self.stats: Dict[str, Dict] = {}
+        self.logger = logging.getLogger(__name__)
+    
+    def _load(self, name: str, engine: str):
+        """
+        Build the question-answering pipeline for an inference engine
+        Returns (pipeline, engine actually used)
+        """
+        if engine == 'onnx':
+            if _onnx_available:
+                model, tokenizer = self._load_onnx(name)
+                return pipeline("question-answering", model=model, tokenizer=tokenizer), 'onnx'
+            self.logger.warning("ONNX Runtime (optimum[onnxruntime]) not installed - using the int8 engine instead")
+            engine = 'int8'
+        
+        if engine == 'int8':
+            # Dynamic quantization: Linear weights stored as int8, activations quantized on the fly (CPU only)
+            model = AutoModelForQuestionAnswering.from_pretrained(name)
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            return pipeline("question-answering", model=model, tokenizer=AutoTokenizer.from_pretrained(name)), 'int8'
+        
+        return pipeline("question-answering", model=name), 'fp32'
+    
+    def _load_onnx(self, name: str):
+        """Load the saved ONNX graph, exporting it from the PyTorch weights on first use only"""
+        export_dir = onnx_export_dir(name)
+        if os.path.exists(os.path.join(export_dir, 'model.onnx')):
+            return ORTModelForQuestionAnswering.from_pretrained(export_dir), AutoTokenizer.from_pretrained(export_dir)
+        
+        self.logger.info(f"Exporting {name} to ONNX (once) - saving to {export_dir}")
+        model = ORTModelForQuestionAnswering.from_pretrained(name, export=True)
+        tokenizer = AutoTokenizer.from_pretrained(name)
+        try:
+            # Save next to the target and rename, so a concurrent worker never loads a half-written graph
+            os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+            tmp_dir = tempfile.mkdtemp(prefix='.onnx-export-', dir=MODEL_CACHE_DIR)
+            model.save_pretrained(tmp_dir)
+            tokenizer.save_pretrained(tmp_dir)
+            try:
+                os.rename(tmp_dir, export_dir)
+            except OSError:
+                shutil.rmtree(tmp_dir, ignore_errors=True)  # Another process saved it first
+        except Exception as e:
+            self.logger.warning(f"Could not save the ONNX export ({e}) - it will be exported again next start")
+        return model, tokenizer
+    
+    def get(self, name: str = ML_MODEL_NAME, engine: str = QA_ENGINE) -> Optional[SharedModel]:
+        """The shared model, loading it on first use (None if it can't be loaded)"""
+        if engine not in ENGINES:
+            raise ValueError(f"Unsupported QA engine: {engine}")
+        
+        key = model_key(name, engine)
+        model = self.models.get(key)
+        if model is not None:
+            return model
+        if not _transformers_available:
+            return None
+        
+        with self.lock:
+            load_lock = self.load_locks.setdefault(key, threading.Lock())
+        
+        with load_lock:
+            # Another thread may have finished loading while we waited
+            if key in self.models:
+                return self.models[key]
+            if self.stats.get(key, {}).get('error'):
+                return None  # Don't retry a failed load on every question
+            
+            self.logger.info(f"Loading ML model: {name} ({engine})")
+            rss_before = _process_rss_mb()
+            start = time.perf_counter()
+            try:
+                with get_tracer().span('quiz.model_load', 'quiz', model=name, engine=engine):
+                    qa_pipeline, used_engine = self._load(name, engine)
+                    model = SharedModel(qa_pipeline, key)
+            except Exception as e:
+                self.logger.error(f"Failed to load ML model: {e}")
+                self.stats[key] = {'error': str(e)}
+                return None
+            
+            rss_after = _process_rss_mb()
+            self.stats[key] = {
+                'engine': used_engine,
+                'load_seconds': round(time.perf_counter() - start, 2),
+                'memory_mb': round(rss_after - rss_before, 1) if rss_before is not None else None,
+                'loaded_at': time.time(),
+                'thread': threading.current_thread().name
+            }
+            self.models[key] = model
+            self.logger.info(f"🧠 Loaded {name} ({used_engine}) in {self.stats[key]['load_seconds']}s "
+                             f"(+{self.stats[key]['memory_mb']} MB)")
+            return model
+    
+    def warm_up(self, name: str = ML_MODEL_NAME, engine: str = QA_ENGINE) -> Optional[threading.Thread]:
+        """Start loading the model in a background thread (no-op if it is loaded or unavailable)"""
+        if model_key(name, engine) in self.models or not _transformers_available:
+            return None
+        thread = threading.Thread(target=self.get, args=(name, engine), name=f'warmup-{name}-{engine}', daemon=True)
+        thread.start()
+        return thread
+    
+    def is_loaded(self, name: str = ML_MODEL_NAME, engine: str = QA_ENGINE) -> bool:
+        return model_key(name, engine) in self.models
+    
+    def get_stats(self) -> Dict[str, Dict]:
+        return {name: dict(stats) for name, stats in self.stats.items()}
+
+
+# One registry per process, shared by every QuizSolver
+_model_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    return _model_registry
@@ -0,0 +1,238 @@
+"""
+Multi-Tab Video Automation Module
+Plays several playlist videos at the same time, one per browser tab
+"""
+from selenium.webdriver.chrome.options import Options
+from collections import deque
+import time
+from typing import Dict, List, Optional
+from config import VIDEO_CHECK_INTERVAL, MAX_CONCURRENT_TABS, MAX_RETRIES, LEAN_MODE
+from video_automator import VideoAutomator, VIDEO_STATUS_SCRIPT
+from tracing import traced
+
+
+class MultiTabAutomator(VideoAutomator):
+    """
+    Drives up to `max_tabs` videos concurrently inside one Chrome instance.
+    A round-robin scheduler switches focus between tabs, checks completion,
+    and loads the next playlist item into each tab as it finishes.
+    """
+    
+    def __init__(self, platform: str, headless: bool = False, playback_speed: float = 1.0,
+                 user_id: int = None, max_tabs: int = MAX_CONCURRENT_TABS, profile_suffix: str = None,
+                 lean: bool = LEAN_MODE):
+        super().__init__(platform, headless=headless, playback_speed=playback_speed, user_id=user_id,
+                         profile_suffix=profile_suffix, lean=lean)
+        self.max_tabs = max(1, max_tabs)
+        self.tabs: Dict[str, str] = {}  # window handle -> video URL playing in it
+    
+    def _build_chrome_options(self) -> Options:
+        """Keep background tabs playing at full speed"""
+        chrome_options = super()._build_chrome_options()
+        chrome_options.add_argument('--disable-background-media-suspend')
+        chrome_options.add_argument('--disable-background-timer-throttling')
+        chrome_options.add_argument('--disable-renderer-backgrounding')
+        chrome_options.add_argument('--disable-backgrounding-occluded-windows')
+        chrome_options.add_argument('--autoplay-policy=no-user-gesture-required')
+        return chrome_options
+    
+    @traced('tabs.open')
+    def _open_in_tab(self, handle: str, video_url: str):
+        """Load a video into a tab and start playback"""
+        self.driver.switch_to.window(handle)
+        self.driver.get(video_url)
+        self.play_video()  # Also registers the video with add_video()
+        self.tabs[handle] = self.driver.current_url
+        self.logger.info(f"🗂️ Tab {handle[-6:]}: playing {self.driver.title}")
+    
+    @traced('tabs.status_poll')
+    def _tab_status(self, handle: str) -> Optional[Dict]:
+        """Focus a tab and read its video state"""
+        self.driver.switch_to.window(handle)
+        return self.driver.execute_script(VIDEO_STATUS_SCRIPT, self.config['selectors']['video_player'])
+    
+    @staticmethod
+    def _is_complete(status: Dict) -> bool:
+        """Same rule as is_video_complete(): ended, or within the last 3 seconds"""
+        if status.get('ended'):
+            return True
+        duration = status.get('duration')
+        current_time = status.get('currentTime')
+        if not duration or duration <= 0 or float('inf') == duration:
+            return False
+        if not current_time or current_time < 0:
+            return False
+        return duration - current_time < 3
+    
+    def _close_tab(self, handle: str):
+        """Close a finished tab, always keeping one window open"""
+        self.tabs.pop(handle, None)
+        try:
+            if len(self.driver.window_handles) > 1:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+                self.driver.switch_to.window(self.driver.window_handles[0])
+        except Exception as e:
+            self.logger.debug(f"Could not close tab {handle[-6:]}: {str(e)}")
+    
+    def _fill_tab(self, handle: str, pending: deque, errors: Dict[str, int]):
+        """
+        Load the next pending video into a tab (or close it when nothing is left)
+        A video that fails to load is skipped and counts against the tab's retries
+        """
+        while pending:
+            video_url = pending.popleft()
+            try:
+                self._open_in_tab(handle, video_url)
+                return
+            except Exception as e:
+                self.tabs.pop(handle, None)
+                errors[handle] = errors.get(handle, 0) + 1
+                self.logger.error(f"❌ Tab {handle[-6:]} could not open {video_url}: {str(e)}")
+                self.db.add_log('multi_tab_error', f'Could not open {video_url}: {str(e)}', 'error')
+                if errors[handle] >= MAX_RETRIES:
+                    self.logger.error(f"❌ Tab {handle[-6:]} failed {errors[handle]} times, closing it")
+                    break
+        errors.pop(handle, None)
+        self._close_tab(handle)
+    
+    @traced('tabs.recycle')
+    def recycle_driver(self) -> bool:
+        """Restart the browser from the same profile and reopen every tab at its video's position"""
+        checkpoints = []
+        for handle, video_url in self.tabs.items():
+            try:
+                status = self._tab_status(handle) or {}
+            except Exception:
+                status = {}
+            checkpoints.append((video_url, status.get('currentTime') or 0))
+        if not checkpoints:
+            return False
+        
+        self._collect_ad_stats()
+        try:
+            self.driver.quit()
+        except Exception:
+            pass  # The renderer may already be gone
+        self.driver = None
+        self.tabs = {}
+        
+        self.init_driver()
+        pending = deque(url for url, _ in checkpoints)
+        errors: Dict[str, int] = {}
+        for handle in self._open_tabs(len(checkpoints)):
+            self._fill_tab(handle, pending, errors)
+        
+        positions = dict(checkpoints)
+        for handle, video_url in self.tabs.items():
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.execute_script(
+                    "const v = document.querySelector(arguments[0]); if (v) v.currentTime = arguments[1];",
+                    self.config['selectors']['video_player'], positions.get(video_url, 0)
+                )
+            except Exception as e:
+                self.logger.warning(f"Could not seek tab {handle[-6:]}: {str(e)}")
+        
+        self.driver_recycles += 1
+        self._last_memory_check = time.time()
+        self.logger.info(f"♻️ Browser restarted, reopened {len(self.tabs)} tabs where they left off")
+        self.db.add_log('driver_recycle', f'Browser restarted with {len(self.tabs)} tabs', 'info')
+        return True
+    
+    def _open_tabs(self, count: int) -> List[str]:
+        """Window handles for up to `count` tabs (the current window plus new ones)"""
+        handles = [self.driver.current_window_handle]
+        while len(handles) < count:
+            try:
+                self.driver.switch_to.new_window('tab')
+                self._install_ad_skipper()  # CDP scripts are registered per tab
+            except Exception as e:
+                self.logger.warning(f"Could not open another tab, continuing with {len(handles)}: {str(e)}")
+                break
+            handles.append(self.driver.current_window_handle)
+        return handles
+    
+    @traced('tabs.playlist')
+    def automate_playlist(self, playlist_url: str, video_limit: int = None, playback_speed: float = None):
+        """
+        Watch a playlist with several tabs playing at once
+        video_limit: Maximum number of videos to watch (None = all videos)
+        playback_speed: Speed multiplier (0.5x to 2.0x)
+        """
+        if playback_speed:
+            self.playback_speed = playback_speed
+        
+        items = self.get_playlist_items(playlist_url)
+        if not items:
+            # Nothing to schedule - fall back to the sequential flow
+            self.logger.warning("No playlist items found, falling back to single-tab playback")
+            return super().automate_playlist(playlist_url, video_limit, playback_speed)
+        
+        if video_limit:
+            items = items[:video_limit]
+        
+        pending = deque(items)
+        errors: Dict[str, int] = {}
+        videos_watched = 0
+        
+        self.logger.info(f"Starting multi-tab automation: {len(items)} videos, {self.max_tabs} tabs")
+        self.db.add_log('multi_tab_start', f'{len(items)} videos across {self.max_tabs} tabs', 'info')
+        
+        # Open the tabs and fill each one with a video
+        for handle in self._open_tabs(min(self.max_tabs, len(items))):
+            self._fill_tab(handle, pending, errors)
+        
+        try:
+            while self.tabs:
+                # Restart the browser (same profile, every tab at its position) if its memory has grown too far
+                if self._memory_watchdog():
+                    errors.clear()  # Tabs have new handles
+                
+                for handle in list(self.tabs):
+                    video_url = self.tabs[handle]
+                    
+                    try:
+                        status = self._tab_status(handle)
+                    except Exception as e:
+                        self.logger.debug(f"Tab status check: {str(e)}")
+                        status = None
+                    
+                    if status is None:
+                        errors[handle] = errors.get(handle, 0) + 1
+                        if errors[handle] >= MAX_RETRIES:
+                            self.logger.error(f"❌ Tab {handle[-6:]} has no video, giving up on {video_url}")
+                            self.db.add_log('multi_tab_error', f'No video found: {video_url}', 'error')
+                            errors.pop(handle)
+                            self._fill_tab(handle, pending, errors)
+                        continue
+                    errors.pop(handle, None)
+                    
+                    if self._is_complete(status):
+                        self.db.mark_video_completed(video_url)
+                        videos_watched += 1
+                        self.db.add_videos_watched(playlist_url)
+                        self.logger.info(f"✅ Completed video {videos_watched}/{len(items)}")
+                        self._fill_tab(handle, pending, errors)
+                    
+                    elif status.get('paused'):
+                        # Background tabs can get paused by the page; resume and keep the speed
+                        try:
+                            self.driver.execute_script(
+                                "const v = document.querySelector(arguments[0]); v.play(); v.playbackRate = arguments[1];",
+                                self.config['selectors']['video_player'], self.playback_speed
+                            )
+                        except Exception as e:
+                            self.logger.debug(f"Could not resume tab {handle[-6:]}: {str(e)}")
+                
+                time.sleep(VIDEO_CHECK_INTERVAL)
+        
+        except KeyboardInterrupt:
+            self.logger.info("⏹️ Automation stopped by user")
+        except Exception as e:
+            self.logger.error(f"❌ Multi-tab automation stopped: {str(e)}")
+            self.db.add_log('multi_tab_error', f'Automation stopped: {str(e)}', 'error')
+        
+        self.logger.info(f"🎉 Multi-tab automation complete. Watched {videos_watched} videos")
+        self.db.add_log('automation_complete', f'Watched {videos_watched} videos from {playlist_url} ({self.max_tabs} tabs)', 'success')
+        self.db.set_playlist_complete(playlist_url, not video_limit and videos_watched == len(items))
@@ -0,0 +1,170 @@
+"""
+Local OpenAI Stand-in
+Minimal OpenAI-compatible chat completions server for the summarizer tests and benchmarks:
+fixed response latency, optional injected throttling/server errors, and counters for
+requests, connections and peak concurrency.
+
+Usage:
+    with OpenAIStub(latency=0.2, fail_every=5) as stub:
+        summarizer.api_url = stub.completions_url
+        summarizer.summarize_many(videos)
+    
+    python openai_stub.py --port 8766 --latency 0.5   # point OPENAI_API_URL at it
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict
+
+
+class OpenAIStub:
+    """
+    Serves /v1/chat/completions from a background thread
+    
+    latency: Seconds every completion takes
+    fail_every: Answer every Nth request with `fail_status` instead (0 = never)
+    retry_after: Retry-After header sent with injected failures (None = omit)
+    """
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, fail_every: int = 0,
+                 fail_status: int = 429, retry_after: str = '0'):
+        self.latency = latency
+        self.fail_every = fail_every
+        self.fail_status = fail_status
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'completions': 0, 'failures': 0, 'connections': 0, 'active': 0, 'max_active': 0}
+        
+        stub = self
+        
+        class Handler(OpenAIStubHandler):
+            fixture = stub
+        
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = None
+    
+    @property
+    def completions_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}/v1/chat/completions'
+    
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return dict(self.stats)
+    
+    def reset_stats(self):
+        with self.lock:
+            self.stats = {key: 0 for key in self.stats}
+    
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class OpenAIStubHandler(BaseHTTPRequestHandler):
+    """Answers chat completion requests with a summary built from the prompt's title"""
+    
+    protocol_version = 'HTTP/1.1'  # Keep-alive, so connection reuse shows up in the counters
+    disable_nagle_algorithm = True  # Headers and body go out in separate writes; don't stall reused connections
+    fixture: OpenAIStub = None
+    
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+    
+    def setup(self):
+        super().setup()
+        with self.fixture.lock:
+            self.fixture.stats['connections'] += 1
+    
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path.rstrip('/') != '/v1/chat/completions':
+            return self._send_json(404, {'error': {'message': 'Not found'}})
+        
+        stub = self.fixture
+        with stub.lock:
+            stub.stats['requests'] += 1
+            number = stub.stats['requests']
+            stub.stats['active'] += 1
+            stub.stats['max_active'] = max(stub.stats['max_active'], stub.stats['active'])
+        try:
+            time.sleep(stub.latency)
+            if stub.fail_every and number % stub.fail_every == 0:
+                with stub.lock:
+                    stub.stats['failures'] += 1
+                headers = {'Retry-After': stub.retry_after} if stub.retry_after is not None else {}
+                return self._send_json(stub.fail_status, {'error': {'message': 'Injected failure'}}, headers)
+            
+            try:
+                prompt = json.loads(body)['messages'][-1]['content']
+            except (ValueError, KeyError, IndexError, TypeError):
+                return self._send_json(400, {'error': {'message': 'Invalid request body'}})
+            with stub.lock:
+                stub.stats['completions'] += 1
+            self._send_json(200, {
+                'id': f'chatcmpl-stub-{number}',
+                'object': 'chat.completion',
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': json.dumps(stub_summary(prompt))}}]
+            })
+        finally:
+            with stub.lock:
+                stub.stats['active'] -= 1
+    
+    def _send_json(self, status: int, payload: Dict, headers: Dict = None):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def stub_summary(prompt: str) -> Dict:
+    """A summary in the format VideoSummarizer asks for, derived from the prompt's title"""
+    match = re.search(r'Title:\s*(.+)', prompt)
+    title = match.group(1).strip() if match else 'Unknown Video'
+    return {
+        'quick_summary': f"This video covers {title}.",
+        'key_takeaways': [f"Understanding of {title}"],
+        'topics_covered': [word for word in title.lower().split() if len(word) > 3][:5],
+        'action_items': ["Review the main concepts covered"],
+        'difficulty': 'Intermediate',
+        'quiz_questions': [{'question': f"What is the main topic covered in '{title}'?", 'type': 'text'}]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a local OpenAI-compatible chat completions endpoint')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--latency', type=float, default=0.5, help='Seconds per completion')
+    parser.add_argument('--fail-every', type=int, default=0, help='Throttle every Nth request with a 429')
+    args = parser.parse_args()
+    
+    stub = OpenAIStub(port=args.port, latency=args.latency, fail_every=args.fail_every)
+    print(f"🧪 OpenAI stand-in running at {stub.completions_url}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == '__main__':
+    main()
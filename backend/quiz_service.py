@@ -0,0 +1,128 @@
+"""
+Quiz Service Module
+Solves quiz questions in a pool of worker processes so the browser thread never waits on the model
+"""
+import atexit
+import logging
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from config import ML_MODEL_NAME, QA_ENGINE, QUIZ_WORKERS, QUIZ_QUEUE_DEPTH, QUIZ_SOLVE_TIMEOUT
+
+
+logger = logging.getLogger(__name__)
+
+
+class QuizServiceBusy(RuntimeError):
+    """Raised when the request queue stays full for longer than the submit timeout"""
+
+
+# Worker process state: one solver per platform, all sharing the worker's model
+_worker_solvers: Dict[str, object] = {}
+
+
+def _init_worker(engine: str):
+    """Worker process start-up: load the model before the first request arrives"""
+    from model_registry import get_model_registry
+    get_model_registry().get(ML_MODEL_NAME, engine)
+
+
+def _solve_in_worker(platform: str, engine: str, questions: List[Dict]) -> List[Tuple[str, float]]:
+    """Worker process: answer one page of questions (each carries its own context - no retrieval here)"""
+    from quiz_solver import QuizSolver
+    
+    solver = _worker_solvers.get(platform)
+    if solver is None:
+        solver = _worker_solvers[platform] = QuizSolver(platform, engine=engine)
+    return solver.solve_questions(questions, retrieve=False)
+
+
+class QuizService:
+    """
+    Request/response front end for a shared process pool
+    
+    submit() queues a page of questions and returns a Future right away; at most
+    `max_pending` requests are queued or running at once, so a burst from many
+    automations blocks the submitters instead of piling up work in the pool.
+    """
+    
+    def __init__(self, workers: int = QUIZ_WORKERS, max_pending: int = QUIZ_QUEUE_DEPTH, engine: str = QA_ENGINE):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.engine = engine
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.lock = threading.Lock()
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0, 'pending': 0}
+    
+    def start(self) -> 'QuizService':
+        """Start the worker processes (each loads the model in the background)"""
+        with self.lock:
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                initargs=(self.engine,))
+                atexit.register(self.shutdown)
+                logger.info(f"🧠 Quiz service started: {self.workers} workers, queue depth {self.max_pending}")
+        return self
+    
+    def submit(self, platform: str, questions: List[Dict], timeout: Optional[float] = None) -> Future:
+        """
+        Queue questions for solving and return a Future of [(answer, confidence), ...]
+        questions: [{'question': str, 'options': [str, ...], 'context': str}, ...]
+        Blocks while the queue is full; raises QuizServiceBusy if it stays full past `timeout`
+        """
+        if not self.slots.acquire(timeout=timeout):
+            with self.lock:
+                self.stats['rejected'] += 1
+            raise QuizServiceBusy(f"Quiz service queue full ({self.max_pending} requests pending)")
+        
+        # Only plain data crosses the process boundary (no WebElement handles)
+        payload = [{'question': q['question'], 'options': list(q['options']), 'context': q.get('context', '')}
+                   for q in questions]
+        try:
+            future = self.start().pool.submit(_solve_in_worker, platform, self.engine, payload)
+        except Exception:
+            self.slots.release()
+            raise
+        
+        with self.lock:
+            self.stats['submitted'] += 1
+            self.stats['pending'] += 1
+        future.add_done_callback(self._on_done)
+        return future
+    
+    def _on_done(self, future: Future):
+        self.slots.release()
+        with self.lock:
+            self.stats['pending'] -= 1
+            self.stats['failed' if future.cancelled() or future.exception() else 'completed'] += 1
+    
+    def collect(self, future: Future, timeout: float = QUIZ_SOLVE_TIMEOUT) -> List[Tuple[str, float]]:
+        """Wait for a submitted request's answers"""
+        return future.result(timeout=timeout)
+    
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return dict(self.stats, workers=self.workers, max_pending=self.max_pending, running=self.pool is not None)
+    
+    def shutdown(self, wait: bool = True):
+        with self.lock:
+            pool, self.pool = self.pool, None
+        if pool:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# One pool per process, shared by every automation running in it
+_quiz_service = None
+_quiz_service_lock = threading.Lock()
+
+
+def get_quiz_service() -> Optional[QuizService]:
+    """The shared quiz service (None when QUIZ_WORKERS=0 - questions are then solved in-thread)"""
+    global _quiz_service
+    if QUIZ_WORKERS <= 0:
+        return None
+    with _quiz_service_lock:
+        if _quiz_service is None:
+            _quiz_service = QuizService()
+        return _quiz_service
@@ -6,32 +6,141 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import hashlib
 import logging
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 import time
-from config import ML_MODEL_NAME, CONFIDENCE_THRESHOLD, PLATFORMS
+from config import (ML_MODEL_NAME, CONFIDENCE_THRESHOLD, PLATFORMS, QA_BATCH_SIZE, QA_PADDING, QA_ENGINE,
+                    RETRIEVAL_ENABLED, QUIZ_SOLVE_TIMEOUT)
 from database import Database
+from retrieval_index import get_retrieval_index, course_key
+from quiz_service import get_quiz_service
+from concurrent.futures import Future
+from tracing import get_tracer, traced
+from model_registry import get_model_registry, model_key, _transformers_available
 
-# Lazy import for transformers to avoid runtime errors
-_transformers_available = True
+# lxml parses several times faster than html.parser; fall back if it isn't installed
+_lxml_available = True
 try:
-    from transformers import pipeline
-except Exception as e:
-    _transformers_available = False
-    logging.warning(f"Transformers not available: {e}. Quiz solving will use simpler methods.")
+    import lxml  # noqa: F401
+except ImportError:
+    _lxml_available = False
+SOUP_PARSER = 'lxml' if _lxml_available else 'html.parser'
+
+# Where each platform keeps a question: block (one per question), prompt text and option labels
+QUIZ_EXTRACTION = {
+    'coursera': {'block': '.rc-FormPartsQuestion', 'prompt': 'div[data-test="quiz-question"]', 'option': 'label.rc-Option'},
+    'udemy': {'block': '.mc-quiz-question', 'prompt': 'div[data-purpose="question-prompt"]',
+              'option': 'label.mc-quiz-question--answer-label'},
+    'moodle': {'block': 'div.que', 'prompt': 'div.qtext', 'option': 'div.answer label'}
+}
+
+# Every question on the page in one round trip: text plus the option label elements (clickable handles)
+QUIZ_EXTRACT_SCRIPT = """
+const spec = arguments[0];
+const clean = (el) => (el.textContent || '').replace(/\\s+/g, ' ').trim();
+const questions = [];
+
+if (spec) {
+    let blocks = Array.from(document.querySelectorAll(spec.block));
+    if (!blocks.length) blocks = [document];  // Unwrapped layout - prompt and options anywhere on the page
+    for (const block of blocks) {
+        const prompt = block.querySelector(spec.prompt);
+        const labels = Array.from(block.querySelectorAll(spec.option));
+        if (prompt && labels.length) {
+            questions.push({question: clean(prompt), options: labels.map(clean), elements: labels});
+        }
+    }
+    return questions;
+}
+
+// Generic: group radio/checkbox inputs by name, question text from the group's container
+const groups = new Map();
+for (const input of document.querySelectorAll('input[type=radio], input[type=checkbox]')) {
+    const label = (input.id && document.querySelector('label[for="' + CSS.escape(input.id) + '"]'))
+        || input.closest('label')
+        || (input.nextElementSibling && input.nextElementSibling.tagName === 'LABEL' ? input.nextElementSibling : null);
+    if (!label) continue;
+    const key = input.name || input.id;
+    if (!groups.has(key)) groups.set(key, {input: input, labels: []});
+    groups.get(key).labels.push(label);
+}
+for (const group of groups.values()) {
+    const container = group.input.closest('fieldset, .question, .que, li, form') || document.body;
+    const heading = Array.from(container.querySelectorAll('legend, h1, h2, h3, h4, p'))
+        .find((el) => clean(el).includes('?')) || container.querySelector('legend, h1, h2, h3, h4');
+    if (heading) {
+        questions.push({question: clean(heading), options: group.labels.map(clean), elements: group.labels});
+    }
+}
+return questions;
+"""
+
+# Click every chosen option in one round trip. Each target is an element handle, a
+# {block, option} index pair from page-source extraction, or {text} to match a label exactly
+SELECT_OPTIONS_SCRIPT = """
+const targets = arguments[0];
+const spec = arguments[1];
+const clean = (el) => (el.textContent || '').replace(/\\s+/g, ' ').trim();
+const optionSelector = spec ? spec.option : 'label';
+
+const locate = (target) => {
+    if (target instanceof Element) return target;
+    if (target.text !== undefined) {
+        const labels = Array.from(document.querySelectorAll(optionSelector));
+        return labels.find((el) => clean(el) === target.text) || labels.find((el) => clean(el).includes(target.text));
+    }
+    const blocks = spec ? document.querySelectorAll(spec.block) : [];
+    const block = blocks[target.block] || document;
+    return block.querySelectorAll(optionSelector)[target.option];
+};
+
+return targets.map((target) => {
+    const el = locate(target);
+    if (!el) return false;
+    el.scrollIntoView({block: 'center'});
+    el.click();
+    const input = el.matches('input') ? el : (el.control || el.querySelector('input'));
+    return input ? input.checked : true;
+});
+"""
+
+# Generic fallback only needs headings, paragraphs, labels and inputs - skip building the rest of the tree
+GENERIC_QUIZ_STRAINER = SoupStrainer(['h1', 'h2', 'h3', 'h4', 'legend', 'p', 'label', 'input'])
+
+
+def normalize_text(text: str) -> str:
+    return ' '.join(text.lower().split())
+
+
+def memo_key(question: str, options: List[str], context: str = "") -> str:
+    """
+    Hash of the normalized question, its options in sorted order (option order on the page doesn't matter)
+    and the context it was scored against (the same question scores differently with other context)
+    """
+    options_text = '\x1f'.join(sorted(normalize_text(option) for option in options))
+    context_hash = hashlib.sha1(normalize_text(context).encode('utf-8')).hexdigest()
+    return hashlib.sha1(f"{normalize_text(question)}\x1e{options_text}\x1e{context_hash}".encode('utf-8')).hexdigest()
+
+
+def best_option(options: List[str], scores: Dict[str, float]) -> Tuple[str, float]:
+    """Highest-scoring option (scores keyed by normalized text); ties go to the alphabetically first option"""
+    best = min(options, key=lambda option: (-scores.get(normalize_text(option), 0.0), normalize_text(option)))
+    return best, scores.get(normalize_text(best), 0.0)
 
 
 class QuizSolver:
     """Solves quiz questions using ML/NLP and caching"""
     
-    def __init__(self, platform: str, driver: webdriver.Chrome = None):
+    def __init__(self, platform: str, driver: webdriver.Chrome = None, engine: str = QA_ENGINE):
         self.platform = platform.lower()
+        self.engine = engine  # Inference engine: fp32, int8 or onnx
         self.driver = driver
         self.db = Database()
         self.logger = logging.getLogger(__name__)
         
-        # Initialize QA model (lazy loading)
+        # QA model comes from the process-wide registry (loaded once, shared by every solver)
         self._qa_model = None
         
         if self.platform not in PLATFORMS:
@@ -41,40 +150,89 @@ class QuizSolver:
     
     @property
     def qa_model(self):
-        """Lazy load the QA model"""
+        """Shared QA model (waits for a background warm-up if one is in progress)"""
         if self._qa_model is None:
             if not _transformers_available:
                 self.logger.warning("Transformers not available. ML quiz solving disabled.")
                 return None
-            self.logger.info(f"Loading ML model: {ML_MODEL_NAME}")
-            try:
-                self._qa_model = pipeline("question-answering", model=ML_MODEL_NAME)
-                self.db.add_log('ml_model', f'Loaded model: {ML_MODEL_NAME}', 'success')
-            except Exception as e:
-                self.logger.error(f"Failed to load ML model: {e}")
-                self._qa_model = None
+            registry = get_model_registry()
+            self._qa_model = registry.get(ML_MODEL_NAME, self.engine)
+            if self._qa_model is not None:
+                stats = registry.get_stats().get(model_key(ML_MODEL_NAME, self.engine), {})
+                self.db.add_log('ml_model', f"Using model: {ML_MODEL_NAME} ({stats.get('engine')}, loaded in "
+                                            f"{stats.get('load_seconds')}s, {stats.get('memory_mb')} MB)", 'success')
         return self._qa_model
     
-    def extract_quiz_from_page(self) -> Optional[Dict]:
-        """Extract quiz question and options from current page"""
+    @traced('quiz.extract', 'quiz')
+    def extract_questions(self) -> List[Dict]:
+        """
+        Every question on the current page:
+        [{'question', 'options', 'option_elements', 'type'}, ...]
+        One JS call per page; the page source is only parsed if the script finds nothing
+        """
         try:
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            # Platform-specific extraction
-            if self.platform == 'coursera':
-                return self._extract_coursera_quiz(soup)
-            elif self.platform == 'udemy':
-                return self._extract_udemy_quiz(soup)
-            elif self.platform == 'moodle':
-                return self._extract_moodle_quiz(soup)
-            else:
-                return self._extract_generic_quiz(soup)
+            found = self.driver.execute_script(QUIZ_EXTRACT_SCRIPT, QUIZ_EXTRACTION.get(self.platform))
+            if found:
+                return [{
+                    'question': item['question'],
+                    'options': item['options'],
+                    'option_elements': item['elements'],  # Same order as options
+                    'type': 'multiple_choice'
+                } for item in found]
+        except Exception as e:
+            self.logger.debug(f"Script extraction failed, parsing page source: {str(e)}")
         
+        return self._extract_from_page_source()
+    
+    def extract_quiz_from_page(self) -> Optional[Dict]:
+        """Extract quiz question and options from current page (the first question)"""
+        questions = self.extract_questions()
+        return questions[0] if questions else None
+    
+    def _extract_from_page_source(self) -> List[Dict]:
+        """Fallback: parse driver.page_source (no element handles - answers are selected by block index or text)"""
+        try:
+            return self.parse_quiz_html(self.driver.page_source)
         except Exception as e:
             self.logger.error(f"Error extracting quiz: {str(e)}")
             self.db.add_log('quiz_extract', f'Error: {str(e)}', 'error')
-            return None
+            return []
+    
+    def parse_quiz_html(self, page_source: str) -> List[Dict]:
+        """Every question in a quiz page's HTML (works offline, e.g. on saved pages)"""
+        if self.platform not in QUIZ_EXTRACTION:
+            quiz = self._extract_generic_quiz(BeautifulSoup(page_source, SOUP_PARSER,
+                                                            parse_only=GENERIC_QUIZ_STRAINER))
+            return [quiz] if quiz else []
+        
+        soup = BeautifulSoup(page_source, SOUP_PARSER)
+        questions = self._extract_question_blocks(soup, QUIZ_EXTRACTION[self.platform])
+        if questions:
+            return questions
+        
+        # Platform-specific extraction (single question, no block wrappers)
+        if self.platform == 'coursera':
+            quiz = self._extract_coursera_quiz(soup)
+        elif self.platform == 'udemy':
+            quiz = self._extract_udemy_quiz(soup)
+        else:
+            quiz = self._extract_moodle_quiz(soup)
+        return [quiz] if quiz else []
+    
+    def _extract_question_blocks(self, soup: BeautifulSoup, spec: Dict) -> List[Dict]:
+        """One question per block, using the same selectors as QUIZ_EXTRACT_SCRIPT"""
+        questions = []
+        for index, block in enumerate(soup.select(spec['block'])):
+            prompt = block.select_one(spec['prompt'])
+            options = [label.get_text(' ', strip=True) for label in block.select(spec['option'])]
+            if prompt and options:
+                questions.append({
+                    'question': prompt.get_text(' ', strip=True),
+                    'options': options,
+                    'block_index': index,  # Lets select_answers click by position instead of searching by text
+                    'type': 'multiple_choice'
+                })
+        return questions
     
     def _extract_coursera_quiz(self, soup: BeautifulSoup) -> Optional[Dict]:
         """Extract quiz from Coursera"""
@@ -133,9 +291,10 @@ class QuizSolver:
             
             question_text = question_elem.get_text(strip=True)
             
-            # Get options
+            # Get options (one label per choice inside the answer block)
             options = []
-            option_elems = soup.find_all('div', {'class': 'answer'})
+            answer_block = question_elem.find_next('div', {'class': 'answer'})
+            option_elems = answer_block.find_all('label') if answer_block else []
             for opt in option_elems:
                 options.append(opt.get_text(strip=True))
             
@@ -176,90 +335,181 @@ class QuizSolver:
         
         return None
     
-    def solve_question(self, question: str, options: List[str], context: str = "") -> Tuple[str, float]:
+    def _score_options(self, pairs: List[Tuple[str, str]]) -> List[float]:
         """
-        Solve a quiz question using ML/NLP
-        Returns: (best_answer, confidence_score)
+        Score (question, context) pairs with one batched pipeline call
+        Batches of QA_BATCH_SIZE pairs, padded per QA_PADDING
         """
-        # Check cache first
-        cached_answer = self.db.get_cached_answer(question)
-        if cached_answer and cached_answer in options:
-            self.logger.info(f"Using cached answer for: {question[:50]}...")
-            return cached_answer, 1.0
+        if not pairs:
+            return []
         
-        # Use ML model to find best answer
-        best_answer = None
-        best_score = 0.0
+        results = self.qa_model(
+            question=[question for question, _ in pairs],
+            context=[context for _, context in pairs],
+            batch_size=QA_BATCH_SIZE,
+            padding=QA_PADDING
+        )
+        if isinstance(results, dict):
+            results = [results]  # The pipeline unwraps single inputs
+        return [result['score'] for result in results]
+    
+    def _retrieved_context(self, question: str, options: List[str]) -> str:
+        """Most relevant summary/transcript chunks from videos watched in this course ('' if none)"""
+        if not RETRIEVAL_ENABLED:
+            return ""
+        try:
+            course = course_key(self.driver.current_url) if self.driver else None
+            with get_tracer().span('quiz.retrieve', 'quiz'):
+                return get_retrieval_index().context_for(question, options, course=course)
+        except Exception as e:
+            self.logger.debug(f"Context retrieval failed: {e}")
+            return ""
+    
+    @traced('quiz.solve', 'quiz')
+    def solve_questions(self, questions: List[Dict], context: str = "",
+                        retrieve: bool = True) -> List[Tuple[str, float]]:
+        """
+        Solve several questions at once: every option of every question not in the answer cache or
+        score memo is scored in one batch (and memoized)
+        Without an explicit context, each question uses its own 'context' or the top matching chunks from watched videos
+        retrieve: False when the questions already carry the retrieved context (even an empty one)
+        questions: [{'question': str, 'options': [str, ...], 'context': str (optional)}, ...]
+        Returns: [(best_answer, confidence_score), ...] in the same order
+        """
+        answers: List[Optional[Tuple[str, float]]] = [None] * len(questions)
+        uncached = []
         
-        # If context is provided, use it; otherwise use question as context
-        if not context:
-            context = question
+        for index, item in enumerate(questions):
+            # Check cache first
+            cached_answer = self.db.get_cached_answer(item['question'])
+            if cached_answer and cached_answer in item['options']:
+                self.logger.info(f"Using cached answer for: {item['question'][:50]}...")
+                answers[index] = (cached_answer, 1.0)
+            else:
+                uncached.append(index)
         
-        try:
-            for option in options:
-                # Use the QA model to score each option
-                result = self.qa_model(question=question, context=f"{context}. {option}")
-                score = result['score']
-                
-                if score > best_score:
-                    best_score = score
-                    best_answer = option
+        # If context is provided, use it; otherwise retrieve it, and fall back to the question itself
+        contexts: Dict[int, str] = {}
+        for index in uncached:
+            question, options = questions[index]['question'], questions[index]['options']
+            contexts[index] = (context or questions[index].get('context')
+                               or (retrieve and self._retrieved_context(question, options)) or question)
+        keys = {index: memo_key(questions[index]['question'], questions[index]['options'], contexts[index])
+                for index in uncached}
+        
+        # Then the score memo: an earlier result for the same question, options and context, at any confidence
+        memo = self.db.get_memo_scores(list(keys.values()))
+        pairs = []
+        owners = []  # (question index, option) for each scored pair
+        
+        for index in uncached:
+            question, options = questions[index]['question'], questions[index]['options']
+            stored = memo.get(keys[index])
+            if stored:
+                self.logger.info(f"Using memoized scores for: {question[:50]}...")
+                answers[index] = best_option(options, stored)
+                continue
             
+            question_context = contexts[index]
+            for option in options:
+                pairs.append((question, f"{question_context}. {option}"))
+                owners.append((index, option))
+        
+        if not pairs:
+            return answers
+        
+        try:
+            scores = self._score_options(pairs)
+        except Exception as e:
+            self.logger.error(f"Error solving questions: {str(e)}")
+            # Fallback: first option
+            return [answer or ((item['options'][0] if item['options'] else None), 0.0)
+                    for answer, item in zip(answers, questions)]
+        
+        option_scores: Dict[int, Dict[str, float]] = {}
+        for (index, option), score in zip(owners, scores):
+            option_scores.setdefault(index, {})[normalize_text(option)] = score
+        best = {index: best_option(questions[index]['options'], option_scores[index]) for index in option_scores}
+        
+        self.db.save_memo_scores([{'memo_key': keys[index], 'question_text': questions[index]['question'],
+                                   'scores': option_scores[index]} for index in option_scores])
+        
+        for index, item in enumerate(questions):
+            if answers[index]:
+                continue
+            best_answer, best_score = best.get(index, (None, 0.0))
             self.logger.info(f"ML Answer: {best_answer} (confidence: {best_score:.2f})")
             
             # Cache if confidence is high
             if best_score >= CONFIDENCE_THRESHOLD and best_answer:
-                self.db.cache_quiz_answer(question, best_answer)
-            
-            return best_answer, best_score
+                self.db.cache_quiz_answer(item['question'], best_answer)
+            answers[index] = (best_answer, best_score)
         
-        except Exception as e:
-            self.logger.error(f"Error solving question: {str(e)}")
-            # Fallback: return first option
-            return options[0] if options else None, 0.0
+        return answers
     
-    def select_answer(self, answer: str):
-        """Select the answer on the page"""
-        try:
-            # Platform-specific answer selection
-            if self.platform == 'coursera':
-                # Find the option with matching text
-                option = self.driver.find_element(
-                    By.XPATH, 
-                    f"//label[contains(., '{answer}')]"
-                )
-                option.click()
-            
-            elif self.platform == 'udemy':
-                option = self.driver.find_element(
-                    By.XPATH,
-                    f"//label[contains(@class, 'mc-quiz-question--answer-label') and contains(., '{answer}')]"
-                )
-                option.click()
-            
-            elif self.platform == 'moodle':
-                option = self.driver.find_element(
-                    By.XPATH,
-                    f"//div[contains(@class, 'answer')]//label[contains(., '{answer}')]"
-                )
-                option.click()
-            
+    def submit_questions(self, questions: List[Dict], context: str = "") -> Future:
+        """
+        Start solving in the shared quiz worker pool and return a Future of solve_questions' result
+        Context is retrieved here (the workers have no browser); solved in-thread when the pool is off
+        """
+        payload = [{'question': q['question'], 'options': q['options'],
+                     'context': context or self._retrieved_context(q['question'], q['options'])}
+                    for q in questions]
+        
+        service = get_quiz_service()
+        if service is not None:
+            try:
+                return service.submit(self.platform, payload, timeout=QUIZ_SOLVE_TIMEOUT)
+            except Exception as e:
+                self.logger.warning(f"Quiz service unavailable, solving in-thread: {str(e)}")
+        
+        future = Future()
+        future.set_result(self.solve_questions(payload, retrieve=False))
+        return future
+    
+    def solve_question(self, question: str, options: List[str], context: str = "") -> Tuple[str, float]:
+        """
+        Solve a quiz question using ML/NLP
+        Returns: (best_answer, confidence_score)
+        """
+        return self.solve_questions([{'question': question, 'options': options}], context)[0]
+    
+    @traced('quiz.select', 'quiz')
+    def select_answers(self, selections: List[Tuple[Optional[Dict], str]]) -> List[bool]:
+        """
+        Click several answers with one script call
+        selections: [(question from extract_questions or None, answer text), ...]
+        Options are clicked through their element handle, else by block/option index, else by exact label text
+        """
+        targets = []
+        for question, answer in selections:
+            options = (question or {}).get('options', [])
+            if answer in options and question.get('option_elements'):
+                targets.append(question['option_elements'][options.index(answer)])
+            elif answer in options and 'block_index' in question:
+                targets.append({'block': question['block_index'], 'option': options.index(answer)})
             else:
-                # Generic: find any radio/checkbox with matching label
-                option = self.driver.find_element(
-                    By.XPATH,
-                    f"//label[contains(., '{answer}')]"
-                )
-                option.click()
-            
-            self.logger.info(f"Selected answer: {answer}")
-            time.sleep(0.5)
-            return True
+                targets.append({'text': ' '.join(answer.split())})
         
+        try:
+            selected = self.driver.execute_script(SELECT_OPTIONS_SCRIPT, targets, QUIZ_EXTRACTION.get(self.platform))
         except Exception as e:
-            self.logger.error(f"Error selecting answer: {str(e)}")
-            return False
+            self.logger.error(f"Error selecting answers: {str(e)}")
+            return [False] * len(selections)
+        
+        for (_, answer), ok in zip(selections, selected):
+            if ok:
+                self.logger.info(f"Selected answer: {answer}")
+            else:
+                self.logger.error(f"Could not select answer: {answer}")
+        time.sleep(0.5)
+        return [bool(ok) for ok in selected]
     
+    def select_answer(self, answer: str) -> bool:
+        """Select the answer on the page by its label text"""
+        return self.select_answers([(None, answer)])[0]
+    
+    @traced('quiz.submit', 'quiz')
     def submit_quiz(self):
         """Submit the quiz"""
         try:
@@ -279,47 +529,70 @@ class QuizSolver:
             self.db.add_log('quiz_submit', f'Error: {str(e)}', 'error')
             return False
     
-    def auto_solve_quiz(self, context: str = "") -> bool:
+    def _scroll_into_view(self, question: Dict):
+        elements = question.get('option_elements')
+        if self.driver and elements:
+            try:
+                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", elements[0])
+            except Exception:
+                pass
+    
+    def auto_solve_quiz(self, context: str = "", while_waiting: Callable[[], None] = None) -> bool:
         """
-        Automatically solve and submit current quiz
+        Automatically solve and submit the quiz on the current page
+        Every question is extracted and answered in one batch, then the page is submitted once
         context: Additional context to help answer questions (e.g., video transcript)
+        while_waiting: Browser work to do while the quiz workers think (e.g. pre-fetch the next page)
         """
         try:
             # Extract quiz
-            quiz_data = self.extract_quiz_from_page()
-            if not quiz_data:
+            questions = self.extract_questions()
+            if not questions:
                 self.logger.warning("No quiz found on page")
                 return False
             
-            question = quiz_data['question']
-            options = quiz_data['options']
+            self.logger.info(f"Found {len(questions)} question(s)")
             
-            self.logger.info(f"Question: {question}")
-            self.logger.info(f"Options: {options}")
+            # Solve every question with one batched model call, off this thread
+            pending = self.submit_questions(questions, context)
             
-            # Solve question
-            answer, confidence = self.solve_question(question, options, context)
+            # Keep the browser busy meanwhile: bring the quiz into view, then the caller's work
+            self._scroll_into_view(questions[0])
+            if while_waiting:
+                try:
+                    while_waiting()
+                except Exception as e:
+                    self.logger.debug(f"Work while solving failed: {str(e)}")
             
-            if not answer:
-                self.logger.error("Could not determine answer")
-                return False
+            answers = pending.result(timeout=QUIZ_SOLVE_TIMEOUT)
             
-            # Select answer
-            if not self.select_answer(answer):
+            attempts = []
+            for question, (answer, confidence) in zip(questions, answers):
+                self.logger.info(f"Question: {question['question']}")
+                self.logger.info(f"Options: {question['options']}")
+                
+                if not answer:
+                    self.logger.error("Could not determine answer")
+                    return False
+                
+                attempts.append({
+                    'question_text': question['question'],
+                    'options': question['options'],
+                    'user_answer': answer,
+                    'confidence': confidence
+                })
+            
+            # Select every answer with one script call, then submit once for the whole page
+            selected = self.select_answers([(question, answer) for question, (answer, _) in zip(questions, answers)])
+            if not all(selected):
                 return False
             
-            # Submit
             if not self.submit_quiz():
                 return False
             
-            # Save attempt
-            self.db.save_quiz_attempt(
-                platform=self.platform,
-                question_text=question,
-                options=options,
-                user_answer=answer,
-                confidence=confidence
-            )
+            # Save attempts
+            self.db.save_quiz_attempts(self.platform, attempts)
+            self.logger.info(f"✅ Answered {len(attempts)} question(s) with one submit")
             
             return True
         
@@ -0,0 +1,182 @@
+"""
+Retrieval Index Module
+BM25 index over video summaries and transcripts, used to give the quiz model relevant context
+"""
+import logging
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+import numpy as np
+from scipy import sparse
+from config import RETRIEVAL_TOP_K, RETRIEVAL_CHUNK_WORDS
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+STOP_WORDS = {
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'from',
+    'is', 'are', 'was', 'were', 'be', 'been', 'it', 'its', 'this', 'that', 'these', 'those', 'as',
+    'which', 'what', 'who', 'how', 'when', 'where', 'why', 'do', 'does', 'did', 'can', 'will', 'not'
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOP_WORDS]
+
+
+def course_key(url: str) -> str:
+    """Course a video belongs to: the YouTube playlist, or host + first two path segments"""
+    parsed = urlparse(url or '')
+    playlist = parse_qs(parsed.query).get('list')
+    if playlist:
+        return f'youtube:{playlist[0]}'
+    segments = [s for s in parsed.path.split('/') if s]
+    return f"{parsed.netloc}/{'/'.join(segments[:2])}"
+
+
+def chunk_text(text: str, words: int = RETRIEVAL_CHUNK_WORDS) -> List[str]:
+    """Split text into windows of `words` words that overlap by a quarter"""
+    tokens = text.split()
+    if len(tokens) <= words:
+        return [text] if tokens else []
+    step = max(1, words - words // 4)
+    return [' '.join(tokens[i:i + words]) for i in range(0, len(tokens) - words // 4, step)]
+
+
+class RetrievalIndex:
+    """
+    Okapi BM25 over text chunks, stored as a SciPy sparse matrix
+    
+    Chunks are appended as summaries and transcripts arrive; the weighted matrix is
+    rebuilt lazily on the next query, so adding stays cheap and querying is one sparse slice.
+    """
+    
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.lock = threading.Lock()
+        self.vocabulary: Dict[str, int] = {}
+        self.chunks: List[Dict] = []  # {'text', 'url', 'course', 'source'}
+        self.courses: Dict[str, int] = {}
+        self._chunk_courses: List[int] = []
+        self.sources: Dict[tuple, List[int]] = {}  # (url, source) -> chunk ids, so re-saves replace old chunks
+        self._rows: List[int] = []
+        self._cols: List[int] = []
+        self._counts: List[int] = []
+        self._removed = set()
+        self._weights = None  # CSC matrix of BM25 term weights (chunks x terms)
+        self._course_array = None
+        self.logger = logging.getLogger(__name__)
+    
+    def add_document(self, url: str, text: str, source: str = 'summary', course: str = None):
+        """Index a video's text (replaces whatever was indexed for the same url and source)"""
+        course = course or course_key(url)
+        with self.lock:
+            for chunk_id in self.sources.pop((url, source), []):
+                self._removed.add(chunk_id)
+            
+            chunk_ids = []
+            for chunk in chunk_text(text):
+                counts: Dict[int, int] = {}
+                for token in tokenize(chunk):
+                    column = self.vocabulary.setdefault(token, len(self.vocabulary))
+                    counts[column] = counts.get(column, 0) + 1
+                if not counts:
+                    continue
+                
+                chunk_id = len(self.chunks)
+                self.chunks.append({'text': chunk, 'url': url, 'course': course, 'source': source})
+                self._chunk_courses.append(self.courses.setdefault(course, len(self.courses)))
+                self._rows.extend([chunk_id] * len(counts))
+                self._cols.extend(counts.keys())
+                self._counts.extend(counts.values())
+                chunk_ids.append(chunk_id)
+            
+            self.sources[(url, source)] = chunk_ids
+            self._weights = None
+    
+    def add_summary(self, url: str, summary: Dict, video_data: Optional[Dict] = None):
+        """Index a VideoSummarizer summary (and the transcript it was built from, if any)"""
+        parts = [summary.get('quick_summary', '')]
+        parts.extend(summary.get('key_takeaways', []))
+        parts.extend(summary.get('topics_covered', []))
+        self.add_document(url, '. '.join(p for p in parts if isinstance(p, str)), 'summary')
+        
+        transcript = (video_data or {}).get('transcript') or summary.get('transcript')
+        if transcript:
+            self.add_document(url, transcript, 'transcript')
+    
+    def _build(self):
+        """BM25 weight for every (chunk, term) pair"""
+        n_chunks, n_terms = len(self.chunks), len(self.vocabulary)
+        rows = np.asarray(self._rows, dtype=np.int64)
+        cols = np.asarray(self._cols, dtype=np.int64)
+        counts = np.asarray(self._counts, dtype=np.float64)
+        
+        if self._removed:
+            keep = ~np.isin(rows, np.fromiter(self._removed, dtype=np.int64))
+            rows, cols, counts = rows[keep], cols[keep], counts[keep]
+        
+        lengths = np.bincount(rows, weights=counts, minlength=n_chunks)
+        live = max(1, n_chunks - len(self._removed))
+        avg_length = lengths.sum() / live or 1.0
+        
+        document_frequency = np.bincount(cols, minlength=n_terms)
+        idf = np.log(1 + (live - document_frequency + 0.5) / (document_frequency + 0.5))
+        
+        norm = self.k1 * (1 - self.b + self.b * lengths[rows] / avg_length)
+        weights = idf[cols] * counts * (self.k1 + 1) / (counts + norm)
+        self._weights = sparse.csc_matrix((weights, (rows, cols)), shape=(n_chunks, n_terms))
+        self._course_array = np.asarray(self._chunk_courses, dtype=np.int64)
+    
+    def search(self, query: str, k: int = RETRIEVAL_TOP_K, course: str = None) -> List[Dict]:
+        """Top-k chunks for the query, optionally limited to one course"""
+        with self.lock:
+            columns = sorted({self.vocabulary[t] for t in tokenize(query) if t in self.vocabulary})
+            if not columns or not self.chunks:
+                return []
+            if self._weights is None:
+                self._build()
+            
+            scores = np.asarray(self._weights[:, columns].sum(axis=1)).ravel()
+            if course in self.courses:  # Other courses only if this one has nothing indexed
+                scores = np.where(self._course_array == self.courses[course], scores, 0.0)
+            
+            k = min(k, int((scores > 0).sum()))
+            if k == 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [{**self.chunks[i], 'score': float(scores[i])} for i in top]
+    
+    def context_for(self, question: str, options: List[str] = None, course: str = None,
+                    k: int = RETRIEVAL_TOP_K) -> str:
+        """Top chunks joined into one QA context ('' if nothing relevant is indexed)"""
+        start = time.perf_counter()
+        results = self.search(' '.join([question] + (options or [])), k=k, course=course)
+        self.logger.debug(f"Retrieved {len(results)} chunks in {1000 * (time.perf_counter() - start):.2f} ms")
+        return ' '.join(r['text'] for r in results)
+    
+    def __len__(self):
+        return len(self.chunks) - len(self._removed)
+
+
+# One index per process, fed by every VideoSummarizer
+_retrieval_index = None
+_retrieval_index_lock = threading.Lock()
+
+
+def get_retrieval_index() -> RetrievalIndex:
+    """The shared index, built from saved summaries on first use and kept current through save listeners"""
+    global _retrieval_index
+    with _retrieval_index_lock:
+        if _retrieval_index is None:
+            from video_summarizer import VideoSummarizer
+            
+            index = RetrievalIndex()
+            for url, summary in VideoSummarizer().get_all_summaries().items():
+                index.add_summary(url, summary)
+            VideoSummarizer.add_save_listener(index.add_summary)
+            _retrieval_index = index
+        return _retrieval_index
@@ -0,0 +1,193 @@
+"""
+Selector Cache Module
+Learns which CSS selector works for each platform/page type so the winner is tried first next time
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List
+from config import SELECTOR_CACHE_FILE
+
+
+class SelectorCache:
+    """
+    Winner and hit/miss statistics for fallback selector lists, persisted between runs
+    
+    stats layout: {platform: {page_type: {'last': selector, 'hits': {selector: n}, 'misses': {selector: n}}}}
+    The last winner is always tried first, so a DOM change costs one wasted lookup rather
+    than as many as the old winner had hits; the rest are ranked by hits minus misses.
+    """
+    
+    def __init__(self, cache_file: str = SELECTOR_CACHE_FILE):
+        self.cache_file = cache_file
+        self.lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, Dict]] = self._load()
+        self.unsaved: Dict[str, Dict[str, Dict]] = {}  # Learned since the last save, same layout as stats
+        self.counters = {
+            'lookups': 0,             # selector lists resolved
+            'first_try_hits': 0,      # resolved by the first selector tried
+            'misses': 0,              # no selector matched
+            'round_trips': 0,         # find_element calls actually made
+            'round_trips_saved': 0    # calls avoided compared to the original selector order
+        }
+    
+    def _load(self) -> Dict:
+        try:
+            with open(self.cache_file, 'r') as f:
+                stats = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        
+        for pages in stats.values():
+            for page_type, entry in pages.items():
+                if 'hits' not in entry:
+                    # Older files kept only {selector: hits}
+                    top = max(entry, key=entry.get) if entry else None
+                    pages[page_type] = {'last': top, 'hits': entry, 'misses': {}}
+        return stats
+    
+    @staticmethod
+    def _entry(stats: Dict, platform: str, page_type: str) -> Dict:
+        return stats.setdefault(platform, {}).setdefault(page_type, {'last': None, 'hits': {}, 'misses': {}})
+    
+    def _count(self, platform: str, page_type: str, winner: str = None, missed: Iterable[str] = ()):
+        """Add a lookup's outcome to the statistics and to the unsaved changes"""
+        for stats in (self.stats, self.unsaved):
+            entry = self._entry(stats, platform, page_type)
+            if winner:
+                entry['last'] = winner
+                entry['hits'][winner] = entry['hits'].get(winner, 0) + 1
+            for selector in missed:
+                entry['misses'][selector] = entry['misses'].get(selector, 0) + 1
+    
+    @contextmanager
+    def _file_lock(self, timeout: float = 5.0, stale_after: float = 30.0):
+        """
+        Hold <file>.lock while merging, so saves from sharded workers take turns
+        Gives up waiting after `timeout` (the merge still narrows the window); locks left by a crash expire
+        """
+        lock_file = f'{self.cache_file}.lock'
+        deadline = time.time() + timeout
+        acquired = False
+        while not acquired:
+            try:
+                os.close(os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                acquired = True
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_file) > stale_after:
+                        os.remove(lock_file)
+                        continue
+                except OSError:
+                    continue
+                if time.time() > deadline:
+                    break
+                time.sleep(0.01)
+            except OSError:
+                break
+        try:
+            yield
+        finally:
+            if acquired:
+                try:
+                    os.remove(lock_file)
+                except OSError:
+                    pass
+    
+    def save(self):
+        """
+        Merge this process's unsaved statistics into the file and replace it atomically
+        Sharded workers share the file, so each adds its counts to what the others saved
+        """
+        try:
+            os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+        except OSError:
+            return
+        
+        with self.lock, self._file_lock():
+            merged = self._load()
+            for platform, pages in self.unsaved.items():
+                for page_type, changes in pages.items():
+                    entry = self._entry(merged, platform, page_type)
+                    entry['last'] = changes['last'] or entry['last']
+                    for field in ('hits', 'misses'):
+                        for selector, count in changes[field].items():
+                            entry[field][selector] = entry[field].get(selector, 0) + count
+            
+            try:
+                directory = os.path.dirname(self.cache_file) or '.'
+                fd, tmp_file = tempfile.mkstemp(prefix='.selector_stats-', suffix='.tmp', dir=directory)
+                try:
+                    with os.fdopen(fd, 'w') as f:
+                        json.dump(merged, f, indent=2)
+                    os.replace(tmp_file, self.cache_file)
+                except OSError:
+                    os.remove(tmp_file)
+                    raise
+            except OSError:
+                return  # Statistics are an optimisation - never fail the run over them
+            
+            self.stats = merged
+            self.unsaved = {}
+    
+    def order(self, platform: str, page_type: str, selectors: List[str]) -> List[str]:
+        """Last winner first, then by hits minus misses (ties keep the original order)"""
+        with self.lock:
+            entry = self.stats.get(platform, {}).get(page_type)
+            if not entry:
+                return list(selectors)
+            hits, misses, last = entry['hits'], entry['misses'], entry['last']
+            return sorted(selectors, key=lambda s: (s != last, misses.get(s, 0) - hits.get(s, 0)))
+    
+    def record_hit(self, platform: str, page_type: str, selectors: List[str], winner: str,
+                   missed: Iterable[str] = ()):
+        """A lookup succeeded with `winner` after trying (and missing) the `missed` selectors"""
+        missed = [s for s in missed if s != winner]
+        attempts = len(missed) + 1
+        with self.lock:
+            self._count(platform, page_type, winner, missed)
+            
+            self.counters['lookups'] += 1
+            self.counters['round_trips'] += attempts
+            if attempts == 1:
+                self.counters['first_try_hits'] += 1
+            # Without the cache the lookup would have walked the list in its original order
+            self.counters['round_trips_saved'] += max(0, selectors.index(winner) + 1 - attempts)
+    
+    def record_miss(self, platform: str, page_type: str, missed: Iterable[str]):
+        """No selector matched (every one in `missed` was tried)"""
+        missed = list(missed)
+        with self.lock:
+            self._count(platform, page_type, missed=missed)
+            
+            self.counters['lookups'] += 1
+            self.counters['misses'] += 1
+            self.counters['round_trips'] += len(missed)
+    
+    def get_counters(self) -> Dict:
+        with self.lock:
+            return dict(self.counters)
+
+
+# One cache per process, shared by every automator
+_selector_cache = None
+_selector_cache_lock = threading.Lock()
+
+
+def get_selector_cache() -> SelectorCache:
+    global _selector_cache
+    with _selector_cache_lock:
+        if _selector_cache is None:
+            _selector_cache = SelectorCache()
+        return _selector_cache
+
+
+def use_selector_cache_file(cache_file: str) -> SelectorCache:
+    """Point the shared cache at another file (tests and benchmarks keep data/ untouched)"""
+    global _selector_cache
+    with _selector_cache_lock:
+        _selector_cache = SelectorCache(cache_file)
+        return _selector_cache
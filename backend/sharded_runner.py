@@ -0,0 +1,141 @@
+"""
+Sharded Playlist Runner
+Splits a playlist across several browser processes that play in parallel
+"""
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import logging
+from typing import Dict, List, Optional
+from config import MAX_RETRIES, SHARD_WORKERS
+from database import Database
+from video_automator import VideoAutomator, video_key
+
+
+logger = logging.getLogger(__name__)
+
+
+def _watch_shard(shard_id: int, platform: str, playlist_url: str, video_urls: List[str],
+                 playback_speed: float, user_id: Optional[int], credentials: Optional[Dict],
+                 headless: bool) -> Dict:
+    """
+    Worker process: play one shard's videos in order with its own browser profile
+    Progress is merged through the shared playlist_progress table as each video finishes
+    """
+    automator = VideoAutomator(platform=platform, headless=headless, playback_speed=playback_speed,
+                               user_id=user_id, profile_suffix=f'shard{shard_id}')
+    watched = []
+    failed = []
+    
+    try:
+        automator.init_driver()
+        if credentials:
+            automator.login(credentials)
+        
+        for video_url in video_urls:
+            for attempt in range(1, MAX_RETRIES + 1):
+                try:
+                    if automator.watch_video(video_url):
+                        watched.append(video_url)
+                        automator.db.add_videos_watched(playlist_url, 1)
+                        break
+                except Exception as e:
+                    logger.warning(f"Shard {shard_id}: attempt {attempt}/{MAX_RETRIES} failed for {video_url}: {str(e)}")
+            else:
+                failed.append(video_url)
+                automator.db.add_log('shard_video_failed', f'Shard {shard_id} gave up on {video_url}', 'error')
+    finally:
+        automator.close()
+    
+    return {'shard': shard_id, 'watched': watched, 'failed': failed}
+
+
+def split_into_shards(items: List[str], workers: int) -> List[List[str]]:
+    """Deal items round-robin so every shard starts near the front of the playlist"""
+    workers = max(1, min(workers, len(items)))
+    return [items[i::workers] for i in range(workers)]
+
+
+def run_sharded_automation(platform: str, playlist_url: str, workers: int = SHARD_WORKERS,
+                           credentials: dict = None, video_limit: int = None,
+                           playback_speed: float = 1.0, user_id: int = None,
+                           headless: bool = True) -> Dict:
+    """
+    Watch a playlist with `workers` browsers in parallel
+    
+    Args:
+        platform: Learning platform (youtube, coursera, udemy, moodle)
+        playlist_url: URL of the playlist/course
+        workers: Number of browser processes
+        credentials: Login credentials (each worker logs in with its own profile)
+        video_limit: Maximum number of videos to watch across all workers (None = all)
+        playback_speed: Video speed (0.5x to 2.0x)
+        user_id: User ID for multi-user support
+        headless: Run the worker browsers headless
+    
+    Returns:
+        {'watched': int, 'failed': [urls], 'shards': int}
+    """
+    db = Database(user_id=user_id)
+    
+    # Enumerate the playlist once (already-watched videos are skipped), then hand out the items
+    lister = VideoAutomator(platform=platform, headless=True, user_id=user_id)
+    try:
+        lister.init_driver()
+        if credentials:
+            lister.login(credentials)
+        items = lister.get_playlist_items(playlist_url)
+    finally:
+        lister.close()
+    
+    if video_limit:
+        items = items[:video_limit]
+    if not items:
+        logger.warning("No playlist items found, nothing to shard")
+        db.add_log('sharded_run', f'No playlist items found at {playlist_url}', 'warning')
+        return {'watched': 0, 'failed': [], 'shards': 0}
+    
+    shards = split_into_shards(items, workers)
+    logger.info(f"Sharding {len(items)} videos across {len(shards)} browsers")
+    db.add_log('sharded_run', f'{len(items)} videos across {len(shards)} browsers', 'info')
+    
+    watched = []
+    failed = []
+    
+    with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+        running = {}
+        for shard_id, urls in enumerate(shards):
+            future = pool.submit(_watch_shard, shard_id, platform, playlist_url, urls,
+                                 playback_speed, user_id, credentials, headless)
+            running[future] = (shard_id, urls, 1)
+        
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                shard_id, urls, attempt = running.pop(future)
+                try:
+                    result = future.result()
+                    watched.extend(result['watched'])
+                    failed.extend(result['failed'])
+                    logger.info(f"✅ Shard {shard_id} finished: {len(result['watched'])} watched, {len(result['failed'])} failed")
+                except Exception as e:
+                    # Whole worker died (browser crash, login failure...) - retry what it didn't finish
+                    completed = {video_key(v['video_url']) for v in db.get_completed_videos(platform)}
+                    remaining = [url for url in urls if video_key(url) not in completed]
+                    watched.extend(url for url in urls if video_key(url) in completed)
+                    
+                    if remaining and attempt < MAX_RETRIES:
+                        logger.warning(f"⚠️ Shard {shard_id} crashed ({str(e)}), retrying {len(remaining)} videos "
+                                       f"(attempt {attempt + 1}/{MAX_RETRIES})")
+                        retry = pool.submit(_watch_shard, shard_id, platform, playlist_url, remaining,
+                                            playback_speed, user_id, credentials, headless)
+                        running[retry] = (shard_id, remaining, attempt + 1)
+                    else:
+                        logger.error(f"❌ Shard {shard_id} failed: {str(e)}")
+                        db.add_log('sharded_run', f'Shard {shard_id} failed: {str(e)}', 'error')
+                        failed.extend(remaining)
+    
+    is_complete = not video_limit and not failed
+    db.set_playlist_complete(playlist_url, is_complete)  # Workers already added their videos to the count
+    db.add_log('automation_complete', f'Watched {len(watched)} videos from {playlist_url} ({len(shards)} browsers)', 'success')
+    logger.info(f"🎉 Sharded automation complete. Watched {len(watched)} videos, {len(failed)} failed")
+    
+    return {'watched': len(watched), 'failed': failed, 'shards': len(shards)}
@@ -0,0 +1,140 @@
+"""
+Summary Search Index Module
+Inverted index over video summaries for ranked, prefix-matching keyword search
+"""
+import bisect
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+STOP_WORDS = {
+    'the', 'a', 'an', 'and', 'or', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'from',
+    'is', 'are', 'was', 'be', 'it', 'its', 'this', 'that', 'as', 'can'
+}
+
+# Topic matches count more than a passing mention in the summary text
+FIELD_WEIGHTS = {'topics_covered': 3.0, 'key_takeaways': 1.5, 'quick_summary': 1.0}
+
+PREFIX_WEIGHT = 0.5  # A word that only starts with the query term scores half an exact match
+MAX_PREFIX_TERMS = 64  # Cap on vocabulary words one short prefix expands to
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOP_WORDS]
+
+
+def summary_terms(summary: Dict) -> Counter:
+    """Field-weighted term frequencies for one summary"""
+    weights = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        value = summary.get(field) or ''
+        text = ' '.join(v for v in value if isinstance(v, str)) if isinstance(value, list) else str(value)
+        for token in tokenize(text):
+            weights[token] += weight
+    return weights
+
+
+class SummarySearchIndex:
+    """
+    term -> {doc id: weight} postings plus a sorted vocabulary for prefix lookups
+    
+    Every query term must match (exactly or as a word prefix); matches are ranked by
+    TF-IDF with log-scaled, field-weighted term frequencies. Postings are plain dicts so
+    adds are cheap; each term's NumPy copy is made on its first query after a change,
+    and scoring is a few vector operations over all documents.
+    """
+    
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.vocabulary: List[str] = []  # Sorted, for prefix ranges
+        self.doc_ids: Dict[str, int] = {}
+        self.urls: List[Optional[str]] = []  # Doc id -> url (None once removed)
+        self.doc_terms: Dict[int, Set[str]] = {}
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+    
+    def add(self, url: str, summary: Dict):
+        """Index a summary (replacing whatever was indexed for the url)"""
+        self.remove(url)
+        doc_id = self.doc_ids[url] = len(self.urls)
+        self.urls.append(url)
+        
+        terms = summary_terms(summary)
+        for term, weight in terms.items():
+            if term not in self.postings:
+                self.postings[term] = {}
+                bisect.insort(self.vocabulary, term)
+            self.postings[term][doc_id] = 1 + math.log(weight)
+            self._arrays.pop(term, None)
+        self.doc_terms[doc_id] = set(terms)
+    
+    def remove(self, url: str):
+        doc_id = self.doc_ids.pop(url, None)
+        if doc_id is None:
+            return
+        self.urls[doc_id] = None
+        for term in self.doc_terms.pop(doc_id):
+            postings = self.postings[term]
+            postings.pop(doc_id, None)
+            self._arrays.pop(term, None)
+            if not postings:
+                del self.postings[term]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, term)]
+    
+    def _posting_arrays(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            postings = self.postings[term]
+            arrays = self._arrays[term] = (np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                                           np.fromiter(postings.values(), dtype=np.float64, count=len(postings)))
+        return arrays
+    
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        """Vocabulary words matching a query term, with their match weight"""
+        matches = [(term, 1.0)] if term in self.postings else []
+        start = bisect.bisect_left(self.vocabulary, term)
+        for word in self.vocabulary[start:start + MAX_PREFIX_TERMS + 1]:
+            if not word.startswith(term):
+                break
+            if word != term:
+                matches.append((word, PREFIX_WEIGHT))
+        return matches
+    
+    def search(self, query: str, limit: int = None) -> List[Tuple[str, float]]:
+        """[(url, score), ...] best first; every query term must match"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.doc_terms:
+            return []
+        
+        total_docs = len(self.doc_terms)
+        scores = np.zeros(len(self.urls))
+        matched = None
+        for term in terms:
+            expansions = self._expand(term)
+            if not expansions:
+                return []
+            
+            # A document's score for this term is its best matching word (exact beats prefix)
+            term_scores = np.zeros(len(self.urls))
+            for word, weight in expansions:
+                ids, tf = self._posting_arrays(word)
+                idf = math.log(1 + total_docs / len(ids))
+                term_scores[ids] = np.maximum(term_scores[ids], tf * (weight * idf))
+            
+            hits = term_scores > 0
+            matched = hits if matched is None else matched & hits
+            if not matched.any():
+                return []
+            scores += term_scores
+        
+        candidates = np.flatnonzero(matched)
+        if limit and limit < len(candidates):
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(self.urls[i], float(scores[i])) for i in candidates]
+    
+    def __len__(self):
+        return len(self.doc_terms)
@@ -0,0 +1,218 @@
+"""
+Summary Store Module
+SQLite-backed storage for video summaries: one row per video URL, indexed by URL and timestamp,
+with an in-memory copy that is reused until any process writes to the store
+"""
+import bisect
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from summary_index import SummarySearchIndex
+
+
+class SummaryStore:
+    """
+    Video summaries keyed by URL
+    
+    Every write is a single transaction, so a crash never leaves a half-written store
+    (the old JSON file was rewritten in full on every save). Summaries from the legacy
+    JSON file are imported once, the first time the store is opened.
+    
+    Reads are served from memory. Each write transaction bumps a counter in store_meta;
+    a read compares it with the counter the cache was built at (one indexed query), so
+    writes from other processes are picked up and our own are applied in place.
+    """
+    
+    def __init__(self, db_path: str, legacy_json: Optional[str] = None):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.init_store()
+        if legacy_json:
+            self.migrate_json(legacy_json)
+        
+        self.lock = threading.RLock()
+        self._reader = sqlite3.connect(db_path, timeout=30, check_same_thread=False)  # Counter checks only
+        self._cache: Optional[Dict[str, Dict]] = None
+        self._cache_writes = -1
+        self._recent: List[Tuple[str, int, str]] = []  # (timestamp, sequence, url), oldest first
+        self._recent_keys: Dict[str, Tuple[str, int, str]] = {}
+        self._sequence = 0
+        self._content_urls: Dict[str, str] = {}  # content_key -> url of the latest summary with that content
+        self._search_index: Optional[SummarySearchIndex] = None  # Built on the first search
+    
+    def get_connection(self):
+        # Same generous timeout as Database - several automations may save at once
+        return sqlite3.connect(self.db_path, timeout=30)
+    
+    def init_store(self):
+        conn = self.get_connection()
+        conn.execute('PRAGMA journal_mode=WAL')  # Readers don't block the writer
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS summaries (
+                url TEXT PRIMARY KEY,
+                timestamp TEXT,
+                data TEXT NOT NULL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_summaries_timestamp ON summaries(timestamp)')
+        conn.execute('CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT)')
+        conn.execute("INSERT OR IGNORE INTO store_meta (key, value) VALUES ('writes', '0')")
+        conn.commit()
+        conn.close()
+    
+    def migrate_json(self, json_path: str) -> int:
+        """One-time import of the old video_summaries.json (the file itself is left in place)"""
+        conn = self.get_connection()
+        try:
+            done = conn.execute("SELECT value FROM store_meta WHERE key = 'migrated_json'").fetchone()
+            if done or not os.path.exists(json_path):
+                return 0
+            
+            try:
+                with open(json_path, 'r') as f:
+                    summaries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Could not read {json_path} for migration: {str(e)}")
+                return 0
+            
+            with conn:  # One transaction: all summaries and the migration marker, or nothing
+                conn.executemany('INSERT OR IGNORE INTO summaries (url, timestamp, data) VALUES (?, ?, ?)',
+                                 [self._row(url, summary) for url, summary in summaries.items()])
+                conn.execute("INSERT INTO store_meta (key, value) VALUES ('migrated_json', ?)", (json_path,))
+                self._bump_writes(conn)
+            
+            if summaries:
+                print(f"📦 Migrated {len(summaries)} summaries from {json_path}")
+            return len(summaries)
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _row(url: str, summary: Dict) -> Tuple[str, str, str]:
+        return url, summary.get('timestamp', ''), json.dumps(summary)
+    
+    def put(self, url: str, summary: Dict):
+        """Insert or replace one summary (keeps its original position in get_all order)"""
+        self.put_many([(url, summary)])
+    
+    @staticmethod
+    def _bump_writes(conn) -> int:
+        """Count a write inside the caller's transaction; returns the new count"""
+        conn.execute("UPDATE store_meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'writes'")
+        return int(conn.execute("SELECT value FROM store_meta WHERE key = 'writes'").fetchone()[0])
+    
+    def _write_count(self) -> int:
+        with self.lock:
+            return int(self._reader.execute("SELECT value FROM store_meta WHERE key = 'writes'").fetchone()[0])
+    
+    def put_many(self, items: Iterable[Tuple[str, Dict]]):
+        items = list(items)
+        conn = self.get_connection()
+        try:
+            with conn:
+                conn.executemany('''
+                    INSERT INTO summaries (url, timestamp, data) VALUES (?, ?, ?)
+                    ON CONFLICT(url) DO UPDATE SET timestamp = excluded.timestamp, data = excluded.data
+                ''', [self._row(url, summary) for url, summary in items])
+                writes = self._bump_writes(conn)
+        finally:
+            conn.close()
+        
+        with self.lock:
+            if self._cache is not None and writes == self._cache_writes + 1:
+                # Nobody else wrote since the cache was built - apply ours instead of reloading
+                for url, summary in items:
+                    self._cache[url] = json.loads(json.dumps(summary))  # Same copy semantics as a reload
+                    self._index_recent(url, summary.get('timestamp', ''))
+                    self._index_content(url, summary)
+                    if self._search_index is not None:
+                        self._search_index.add(url, summary)
+                self._cache_writes = writes
+            else:
+                self._cache = None
+    
+    def _index_recent(self, url: str, timestamp: str):
+        old = self._recent_keys.pop(url, None)
+        if old is not None:
+            del self._recent[bisect.bisect_left(self._recent, old)]
+        entry = (timestamp or '', self._sequence, url)
+        self._sequence += 1
+        bisect.insort(self._recent, entry)
+        self._recent_keys[url] = entry
+    
+    def _index_content(self, url: str, summary: Dict):
+        if summary.get('content_key'):
+            self._content_urls[summary['content_key']] = url
+    
+    def _summaries(self) -> Dict[str, Dict]:
+        """The in-memory summaries, reloaded only if the store was written since they were read"""
+        with self.lock:
+            writes = self._write_count()  # Read before loading: a write that lands mid-load forces the next reload
+            if self._cache is None or writes != self._cache_writes:
+                conn = self.get_connection()
+                rows = conn.execute('SELECT url, timestamp, data FROM summaries ORDER BY rowid').fetchall()
+                conn.close()
+                
+                self._cache = {}
+                self._recent, self._recent_keys, self._sequence = [], {}, 0
+                self._content_urls = {}
+                for url, timestamp, data in rows:
+                    self._cache[url] = json.loads(data)
+                    self._index_content(url, self._cache[url])
+                    self._recent_keys[url] = (timestamp or '', self._sequence, url)
+                    self._sequence += 1
+                self._recent = sorted(self._recent_keys.values())
+                self._search_index = None
+                self._cache_writes = writes
+            return self._cache
+    
+    def get(self, url: str) -> Optional[Dict]:
+        return self._summaries().get(url)
+    
+    def get_by_content(self, content_key: str) -> Optional[Tuple[str, Dict]]:
+        """(url, summary) of a saved summary generated from the same content, if any"""
+        with self.lock:
+            summaries = self._summaries()
+            url = self._content_urls.get(content_key)
+            if url is None or summaries.get(url, {}).get('content_key') != content_key:
+                return None  # Never indexed, or that URL has since been re-summarized from other content
+            return url, summaries[url]
+    
+    def get_all(self) -> Dict[str, Dict]:
+        """Every summary by URL, in the order they were first saved (shared - treat as read-only)"""
+        return dict(self._summaries())
+    
+    def get_recent(self, limit: int = 10) -> List[Dict]:
+        """Newest summaries first (by their timestamp), each with its 'url' - read off the sorted index"""
+        with self.lock:
+            summaries = self._summaries()
+            newest = self._recent[-limit:] if limit > 0 else []
+            return [{**summaries[url], 'url': url} for _, _, url in reversed(newest)]
+    
+    def search(self, query: str, limit: int = None) -> List[Dict]:
+        """Summaries matching every query term (whole words or word prefixes), best match first"""
+        with self.lock:
+            summaries = self._summaries()
+            if self._search_index is None:
+                self._search_index = SummarySearchIndex()
+                for url, summary in summaries.items():
+                    self._search_index.add(url, summary)
+            return [{**summaries[url], 'url': url} for url, _ in self._search_index.search(query, limit)]
+    
+    def count(self) -> int:
+        return len(self._summaries())
+
+
+# One store per database file, so every VideoSummarizer in a process shares the cache
+_stores: Dict[str, SummaryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_summary_store(db_path: str, legacy_json: Optional[str] = None) -> SummaryStore:
+    key = os.path.abspath(db_path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = SummaryStore(db_path, legacy_json)
+        return _stores[key]
@@ -0,0 +1,41 @@
+"""
+Test Quiz Corpus
+Checks that every saved corpus page still extracts to its labelled questions and answers
+"""
+import sys
+
+print("🧪 TESTING QUIZ CORPUS")
+print("=" * 70)
+
+# Test 1: Load the corpus
+print("\n1️⃣ Loading quiz corpus...")
+try:
+    from benchmark_quiz_corpus import load_corpus, solver_platform
+    from quiz_solver import QuizSolver
+    pages = load_corpus()
+    print(f"   ✅ {len(pages)} pages, {sum(len(p['questions']) for p in pages)} labelled questions")
+except Exception as e:
+    print(f"   ❌ Could not load corpus: {e}")
+    sys.exit(1)
+
+# Test 2: Extraction matches the labels
+print("\n2️⃣ Extracting every page...")
+failures = 0
+for page in pages:
+    extracted = {q['question']: q for q in QuizSolver(solver_platform(page['platform'])).parse_quiz_html(page['html'])}
+    for label in page['questions']:
+        question = extracted.get(label['question'])
+        if question is None:
+            print(f"   ❌ {page['file']}: question not extracted: {label['question']}")
+            failures += 1
+        elif question['options'][label['answer_index']] != label['answer']:
+            print(f"   ❌ {page['file']}: labelled answer '{label['answer']}' is not option {label['answer_index']}")
+            failures += 1
+    if not failures:
+        print(f"   ✅ {page['file']}: {len(page['questions'])} question(s)")
+
+print("\n" + "=" * 70)
+if failures:
+    print(f"❌ {failures} corpus check(s) failed")
+    sys.exit(1)
+print("✅ Quiz corpus matches its labels")
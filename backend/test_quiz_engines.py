@@ -0,0 +1,73 @@
+"""
+Test Quiz Inference Engines
+Checks that the int8 and ONNX engines pick the same answers as fp32 on the fixture quiz bank
+"""
+import sys
+
+print("🧪 TESTING QUIZ INFERENCE ENGINES")
+print("=" * 70)
+
+# Test 1: Import modules
+print("\n1️⃣ Importing quiz solver...")
+try:
+    from quiz_solver import QuizSolver
+    from model_registry import _transformers_available, _onnx_available
+    from fixture_site import QUIZ_BANK
+    print("   ✅ Modules imported")
+except Exception as e:
+    print(f"   ❌ Import error: {e}")
+    sys.exit(1)
+
+if not _transformers_available:
+    print("\n⚠️  transformers not installed - skipping engine parity checks")
+    sys.exit(0)
+
+
+def answers_for(engine: str):
+    solver = QuizSolver('udemy', engine=engine)
+    if solver.qa_model is None:
+        return None
+    pairs = [(item['question'], f"{item['context']}. {option}") for item in QUIZ_BANK for option in item['options']]
+    scores = solver._score_options(pairs)  # No answer cache involved
+    
+    answers = []
+    offset = 0
+    for item in QUIZ_BANK:
+        option_scores = scores[offset:offset + len(item['options'])]
+        offset += len(item['options'])
+        answers.append(item['options'][option_scores.index(max(option_scores))])
+    return answers
+
+
+# Test 2: fp32 reference answers
+print("\n2️⃣ Answering the fixture quiz bank with fp32...")
+reference = answers_for('fp32')
+if reference is None:
+    print("   ❌ fp32 model could not be loaded")
+    sys.exit(1)
+correct = sum(answer == item['answer'] for answer, item in zip(reference, QUIZ_BANK))
+print(f"   ✅ fp32 answered {correct}/{len(QUIZ_BANK)} correctly")
+
+# Test 3: Parity of the other engines
+engines = ['int8'] + (['onnx'] if _onnx_available else [])
+for number, engine in enumerate(engines, 3):
+    print(f"\n{number}️⃣ Checking {engine} against fp32...")
+    answers = answers_for(engine)
+    if answers is None:
+        print(f"   ❌ {engine} model could not be loaded")
+        sys.exit(1)
+    
+    mismatches = [(item['question'], ref, ans) for item, ref, ans in zip(QUIZ_BANK, reference, answers) if ref != ans]
+    if not mismatches:
+        print(f"   ✅ {engine} matches fp32 on all {len(QUIZ_BANK)} questions")
+    else:
+        for question, ref, ans in mismatches:
+            print(f"   ❌ {question[:50]}... fp32: {ref}, {engine}: {ans}")
+        sys.exit(1)
+
+if not _onnx_available:
+    print("\n⚠️  optimum[onnxruntime] not installed - ONNX engine not checked")
+
+print("\n" + "=" * 70)
+print("✅ Quiz engines verified!")
+print("=" * 70)
@@ -0,0 +1,118 @@
+"""
+Test Selector Cache
+Verifies that the last winning selector is tried first, that misses demote selectors
+and that statistics persist
+"""
+import json
+import sys
+import os
+import tempfile
+
+print("🧪 TESTING SELECTOR CACHE")
+print("=" * 70)
+
+# Test 1: Import module
+print("\n1️⃣ Importing selector_cache...")
+try:
+    from selector_cache import SelectorCache
+    print("   ✅ SelectorCache imported")
+except Exception as e:
+    print(f"   ❌ Import error: {e}")
+    sys.exit(1)
+
+selectors = ['button.ytp-ad-skip-button', '.ytp-ad-skip-button', 'button[class*="skip"]']
+cache_file = os.path.join(tempfile.mkdtemp(), 'selector_stats.json')
+
+# Test 2: Winner moves to the front
+print("\n2️⃣ Checking learned ordering...")
+cache = SelectorCache(cache_file)
+if cache.order('youtube', 'ad_skip', selectors) == selectors:
+    print("   ✅ Unknown page type keeps the original order")
+else:
+    print("   ❌ Original order changed without statistics")
+    sys.exit(1)
+
+# Third selector wins after trying all three
+cache.record_hit('youtube', 'ad_skip', selectors, selectors[2], missed=selectors[:2])
+ordered = cache.order('youtube', 'ad_skip', selectors)
+if ordered[0] == selectors[2]:
+    print(f"   ✅ Winner is tried first: {ordered[0]}")
+else:
+    print(f"   ❌ Expected {selectors[2]} first, got {ordered[0]}")
+    sys.exit(1)
+
+# Test 3: Round trip counters
+print("\n3️⃣ Checking round trip counters...")
+cache.record_hit('youtube', 'ad_skip', selectors, selectors[2])
+counters = cache.get_counters()
+if counters['round_trips_saved'] == 2 and counters['first_try_hits'] == 1:
+    print(f"   ✅ Counters: {counters}")
+else:
+    print(f"   ❌ Unexpected counters: {counters}")
+    sys.exit(1)
+
+# Test 4: A DOM change moves the new winner to the front at once
+print("\n4️⃣ Checking that a new winner takes over after one miss...")
+for _ in range(20):
+    cache.record_hit('youtube', 'ad_skip', selectors, selectors[2])
+cache.record_hit('youtube', 'ad_skip', selectors, selectors[0], missed=[selectors[2]])
+ordered = cache.order('youtube', 'ad_skip', selectors)
+if ordered[0] == selectors[0]:
+    print(f"   ✅ New winner tried first despite 22 old hits: {ordered}")
+else:
+    print(f"   ❌ Old winner still first: {ordered}")
+    sys.exit(1)
+
+# Test 5: Misses demote selectors
+print("\n5️⃣ Checking that missing selectors sink...")
+cache.record_miss('youtube', 'next_button', ['a.next', 'button.next'])
+cache.record_miss('youtube', 'next_button', ['a.next'])
+ordered = cache.order('youtube', 'next_button', ['a.next', 'button.next', '.next-lesson'])
+if ordered == ['.next-lesson', 'button.next', 'a.next'] and cache.get_counters()['misses'] == 2:
+    print(f"   ✅ Untried selector first, most-missed last: {ordered}")
+else:
+    print(f"   ❌ Unexpected order: {ordered}")
+    sys.exit(1)
+
+# Test 6: Persistence
+print("\n6️⃣ Checking persistence between runs...")
+cache.save()
+reloaded = SelectorCache(cache_file)
+if reloaded.order('youtube', 'ad_skip', selectors)[0] == selectors[0]:
+    print("   ✅ Statistics reloaded from disk")
+else:
+    print("   ❌ Statistics were not persisted")
+    sys.exit(1)
+
+
+# Test 7: Files written before misses were tracked
+print("\n7️⃣ Loading an old-format statistics file...")
+old_file = os.path.join(tempfile.mkdtemp(), 'selector_stats.json')
+with open(old_file, 'w') as f:
+    json.dump({'youtube': {'ad_skip': {selectors[0]: 2, selectors[1]: 9}}}, f)
+if SelectorCache(old_file).order('youtube', 'ad_skip', selectors)[:2] == [selectors[1], selectors[0]]:
+    print("   ✅ Old hit counts still rank selectors")
+else:
+    print("   ❌ Old-format file not understood")
+    sys.exit(1)
+
+# Test 8: Workers sharing the file keep each other's statistics
+print("\n8️⃣ Saving from two caches that share one file...")
+shared_file = os.path.join(tempfile.mkdtemp(), 'selector_stats.json')
+shard_a, shard_b = SelectorCache(shared_file), SelectorCache(shared_file)
+shard_a.record_hit('youtube', 'ad_skip', selectors, selectors[1])
+shard_b.record_hit('youtube', 'next_button', ['a.next'], 'a.next')
+shard_b.record_hit('youtube', 'ad_skip', selectors, selectors[1], missed=[selectors[0]])
+shard_a.save()
+shard_b.save()
+merged = SelectorCache(shared_file).stats['youtube']
+leftovers = [name for name in os.listdir(os.path.dirname(shared_file)) if name.endswith('.tmp')]
+if merged['ad_skip']['hits'] == {selectors[1]: 2} and 'next_button' in merged and not leftovers:
+    print(f"   ✅ Both workers' statistics kept: {merged['ad_skip']['hits']}")
+else:
+    print(f"   ❌ Statistics lost on save: {merged} {leftovers}")
+    sys.exit(1)
+
+print("\n" + "=" * 70)
+print("✅ Selector cache verified!")
+print("=" * 70)
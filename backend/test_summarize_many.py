@@ -0,0 +1,154 @@
+"""
+Test Batch Summarization
+Runs VideoSummarizer.summarize_many against the local OpenAI stand-in: bounded concurrency,
+connection reuse, retries after throttling, the rate limiter and the content-addressed cache
+"""
+import os
+import sys
+import tempfile
+import time
+
+print("🧪 TESTING BATCH SUMMARIZATION")
+print("=" * 70)
+
+# Test 1: Import modules
+print("\n1️⃣ Importing summarizer and stand-in server...")
+try:
+    from openai_stub import OpenAIStub
+    from summary_store import SummaryStore
+    from video_summarizer import VideoSummarizer, RateLimiter
+    print("   ✅ Modules imported")
+except Exception as e:
+    print(f"   ❌ Import error: {e}")
+    sys.exit(1)
+
+workdir = tempfile.mkdtemp(prefix='summarize_many_')
+# Keep test summaries out of data/
+summarizer = VideoSummarizer(store=SummaryStore(os.path.join(workdir, 'video_summaries.db')))
+summarizer.openai_api_key = 'test-key'
+summarizer.rate_limiter = RateLimiter(0)
+videos = [{'title': f'Python Lesson {i}', 'platform': 'youtube', 'url': f'https://youtube.com/watch?v=batch{i}',
+           'duration': 600, 'transcript': f'Lesson {i} transcript'} for i in range(12)]
+
+# Test 2: Concurrent batch over pooled connections
+print("\n2️⃣ Summarizing 12 videos with 4 workers (0.2s per request)...")
+with OpenAIStub(latency=0.2) as stub:
+    summarizer.api_url = stub.completions_url
+    start = time.perf_counter()
+    summaries = summarizer.summarize_many(videos, workers=4)
+    elapsed = time.perf_counter() - start
+    stats = stub.get_stats()
+
+checks = [
+    [s['quick_summary'] for s in summaries] == [f"This video covers Python Lesson {i}." for i in range(12)],
+    all(s['method'] == 'openai_gpt4' for s in summaries),
+    stats['max_active'] <= 4,
+    stats['connections'] <= 4,  # Reused across requests, not one per video
+    summarizer.get_summary(videos[5]['url'])['quick_summary'] == 'This video covers Python Lesson 5.',
+    elapsed < 12 * 0.2 / 2
+]
+if not all(checks):
+    print(f"   ❌ Batch checks failed: {checks} {stats} {elapsed:.2f}s")
+    sys.exit(1)
+print(f"   ✅ {len(summaries)} summaries in order in {elapsed:.2f}s "
+      f"(peak {stats['max_active']} in flight, {stats['connections']} connections)")
+
+# Test 2b: More workers than SUMMARY_WORKERS still reuse their connections
+print("\n2️⃣b Summarizing 12 videos with 8 workers...")
+with OpenAIStub(latency=0.2) as stub:
+    summarizer.api_url = stub.completions_url
+    summarizer.summarize_many(videos, workers=8, force_refresh=True)
+    first_stats = stub.get_stats()
+    summarizer.summarize_many(videos, workers=8, force_refresh=True)
+    stats = stub.get_stats()
+if stats['connections'] != first_stats['connections'] or stats['connections'] > 8:
+    print(f"   ❌ Connections were not kept in the pool: {first_stats['connections']} then {stats['connections']}")
+    sys.exit(1)
+print(f"   ✅ Second batch reused all {stats['connections']} connections (peak {stats['max_active']} in flight)")
+
+# Test 3: Throttled requests are retried
+print("\n3️⃣ Throttling every 3rd request with a 429...")
+with OpenAIStub(fail_every=3) as stub:
+    summarizer.api_url = stub.completions_url
+    summaries = summarizer.summarize_many(videos[:6], workers=2, force_refresh=True)
+    stats = stub.get_stats()
+if not all(s['method'] == 'openai_gpt4' for s in summaries) or stats['failures'] == 0:
+    print(f"   ❌ Throttled requests were not retried: {stats}")
+    sys.exit(1)
+print(f"   ✅ {stats['failures']} throttled requests retried, every video summarized by the API")
+
+# Test 4: Exhausted retries fall back to the local summary
+print("\n4️⃣ Failing every request with a 503...")
+with OpenAIStub(fail_every=1, fail_status=503) as stub:
+    summarizer.api_url = stub.completions_url
+    summary = summarizer.summarize_many(videos[:1], force_refresh=True)[0]
+if summary['method'] != 'local_analysis':
+    print(f"   ❌ Expected the local fallback, got {summary['method']}")
+    sys.exit(1)
+print("   ✅ Local summary used once retries ran out")
+
+# Test 5: Rate limiter spaces requests
+print("\n5️⃣ Limiting to 20 requests per second...")
+summarizer.rate_limiter = RateLimiter(20)
+with OpenAIStub() as stub:
+    summarizer.api_url = stub.completions_url
+    start = time.perf_counter()
+    summarizer.summarize_many(videos[:6], workers=6, force_refresh=True)
+    elapsed = time.perf_counter() - start
+if elapsed < 5 / 20:
+    print(f"   ❌ 6 requests took only {elapsed:.2f}s")
+    sys.exit(1)
+print(f"   ✅ 6 requests spread over {elapsed:.2f}s")
+
+# Test 6: Identical content reuses the summary
+print("\n6️⃣ Summarizing the same content again under other URLs...")
+summarizer.rate_limiter = RateLimiter(0)
+fresh = {'title': 'Docker Volumes', 'platform': 'youtube', 'url': 'https://youtube.com/watch?v=dv',
+         'duration': 300, 'transcript': 'Volumes   persist container data.'}
+variant = dict(fresh, url='https://youtube.com/watch?v=dv&list=PL1&index=3', transcript='volumes persist\ncontainer data.')
+before = VideoSummarizer.get_cache_stats()
+with OpenAIStub() as stub:
+    summarizer.api_url = stub.completions_url
+    first = summarizer.summarize_video(fresh)
+    batch = summarizer.summarize_many([variant, fresh, dict(variant, url='https://youtube.com/watch?v=dv&index=4')])
+    requests_made = stub.get_stats()['requests']
+    refreshed = summarizer.summarize_video(fresh, force_refresh=True)
+    forced_requests = stub.get_stats()['requests'] - requests_made
+after = VideoSummarizer.get_cache_stats()
+checks = [
+    requests_made == 1,
+    all(s['quick_summary'] == first['quick_summary'] for s in batch),
+    summarizer.get_summary(variant['url'])['content_key'] == first['content_key'],
+    forced_requests == 1 and refreshed['timestamp'] != first['timestamp'],
+    after['hits'] - before['hits'] == 3 and after['api_calls_saved'] - before['api_calls_saved'] == 3,
+    after['refreshes'] - before['refreshes'] == 1
+]
+if not all(checks):
+    print(f"   ❌ Content cache checks failed: {checks} {after}")
+    sys.exit(1)
+print(f"   ✅ 1 API call for 4 requests of the same content; force_refresh regenerates (hit rate {after['hit_rate']:.0%})")
+
+# Test 7: A local fallback is not reused while the API is available
+print("\n7️⃣ Re-summarizing after a failed API call...")
+outage = {'title': 'Kubernetes Pods', 'platform': 'youtube', 'url': 'https://youtube.com/watch?v=kp',
+          'duration': 420, 'transcript': 'Pods group containers.'}
+with OpenAIStub(fail_every=1, fail_status=503) as stub:
+    summarizer.api_url = stub.completions_url
+    fallback = summarizer.summarize_video(outage)
+with OpenAIStub() as stub:
+    summarizer.api_url = stub.completions_url
+    recovered = summarizer.summarize_video(dict(outage, url='https://youtube.com/watch?v=kp&index=2'))
+    other_platform = summarizer.summarize_video(dict(outage, platform='udemy', url='https://udemy.com/lecture/kp'))
+    requests_made = stub.get_stats()['requests']
+checks = [
+    fallback['method'] == 'local_analysis' and 'content_key' not in fallback,
+    recovered['method'] == 'openai_gpt4',
+    other_platform['content_key'] != recovered['content_key'] and requests_made == 2
+]
+if not all(checks):
+    print(f"   ❌ Fallback checks failed: {checks}")
+    sys.exit(1)
+print("   ✅ API tried again after the outage; other platforms get their own summary")
+
+print("\n" + "=" * 70)
+print("✅ Batch summarization works")
@@ -0,0 +1,99 @@
+"""
+Test Summary Store
+Checks the one-time JSON migration, that lookups by URL and timestamp match the old JSON
+behaviour, that the in-memory cache notices writes from other processes, and keyword search
+"""
+import json
+import os
+import sys
+import tempfile
+
+print("🧪 TESTING SUMMARY STORE")
+print("=" * 70)
+
+# Test 1: Import module
+print("\n1️⃣ Importing summary store...")
+try:
+    from summary_store import SummaryStore
+    print("   ✅ Module imported")
+except Exception as e:
+    print(f"   ❌ Import error: {e}")
+    sys.exit(1)
+
+workdir = tempfile.mkdtemp(prefix='summary_store_')
+legacy_json = os.path.join(workdir, 'video_summaries.json')
+db_path = os.path.join(workdir, 'video_summaries.db')
+legacy = {
+    'https://youtube.com/watch?v=a': {'quick_summary': 'First', 'timestamp': '2024-01-01T10:00:00'},
+    'https://youtube.com/watch?v=b': {'quick_summary': 'Second', 'timestamp': '2024-03-01T10:00:00'},
+    'https://youtube.com/watch?v=c': {'quick_summary': 'Third', 'timestamp': '2024-02-01T10:00:00'}
+}
+with open(legacy_json, 'w') as f:
+    json.dump(legacy, f)
+
+# Test 2: Migration
+print("\n2️⃣ Migrating the legacy JSON file...")
+store = SummaryStore(db_path, legacy_json=legacy_json)
+if store.get_all() != legacy:
+    print("   ❌ Migrated summaries differ from the JSON file")
+    sys.exit(1)
+print(f"   ✅ {store.count()} summaries migrated in their original order")
+
+# Test 3: Migration only runs once
+print("\n3️⃣ Reopening the store...")
+with open(legacy_json, 'w') as f:
+    json.dump({'https://youtube.com/watch?v=stale': {'quick_summary': 'Stale'}}, f)
+store = SummaryStore(db_path, legacy_json=legacy_json)
+if store.count() != 3:
+    print("   ❌ JSON file was imported a second time")
+    sys.exit(1)
+print("   ✅ JSON file not imported again")
+
+# Test 4: Writes and lookups
+print("\n4️⃣ Saving and reading summaries...")
+store.put('https://youtube.com/watch?v=a', {'quick_summary': 'First (updated)', 'timestamp': '2024-04-01T10:00:00'})
+store.put('https://youtube.com/watch?v=d', {'quick_summary': 'Fourth', 'timestamp': '2024-01-15T10:00:00'})
+checks = [
+    store.get('https://youtube.com/watch?v=a')['quick_summary'] == 'First (updated)',
+    store.get('https://youtube.com/watch?v=missing') is None,
+    list(store.get_all())[0] == 'https://youtube.com/watch?v=a',  # Updating keeps the original position
+    [s['quick_summary'] for s in store.get_recent(2)] == ['First (updated)', 'Second'],
+    store.get_recent(1)[0]['url'] == 'https://youtube.com/watch?v=a'
+]
+if not all(checks):
+    print(f"   ❌ Lookup checks failed: {checks}")
+    sys.exit(1)
+print("   ✅ URL and recent lookups correct")
+
+# Test 5: Cache picks up writes from another process
+print("\n5️⃣ Writing through a second store on the same file...")
+other = SummaryStore(db_path)  # Stands in for another process
+store.get_all()
+other.put('https://youtube.com/watch?v=e', {'quick_summary': 'Fifth', 'timestamp': '2024-05-01T10:00:00'})
+if store.get_recent(1)[0]['url'] != 'https://youtube.com/watch?v=e' or store.count() != 5:
+    print("   ❌ Cached reads missed the other writer's summary")
+    sys.exit(1)
+print("   ✅ Cache reloaded after the other write")
+
+# Test 6: Keyword search
+print("\n6️⃣ Searching summaries...")
+store.put('https://youtube.com/watch?v=f', {'quick_summary': 'Intro to Docker volumes',
+                                             'topics_covered': ['docker', 'containers'],
+                                             'timestamp': '2024-06-01T10:00:00'})
+store.put('https://youtube.com/watch?v=g', {'quick_summary': 'Docker mentioned in passing',
+                                             'timestamp': '2024-06-02T10:00:00'})
+checks = [
+    [s['url'] for s in store.search('docker')] == ['https://youtube.com/watch?v=f', 'https://youtube.com/watch?v=g'],
+    [s['url'] for s in store.search('contain dock')] == ['https://youtube.com/watch?v=f'],  # Prefixes, every term
+    store.search('docker kubernetes') == [],
+    len(store.search('docker', limit=1)) == 1
+]
+store.put('https://youtube.com/watch?v=g', {'quick_summary': 'Now about Kubernetes', 'timestamp': '2024-06-02T10:00:00'})
+checks.append([s['url'] for s in store.search('docker')] == ['https://youtube.com/watch?v=f'])
+if not all(checks):
+    print(f"   ❌ Search checks failed: {checks}")
+    sys.exit(1)
+print("   ✅ Ranked prefix search correct and kept up to date")
+
+print("\n" + "=" * 70)
+print("✅ Summary store works")
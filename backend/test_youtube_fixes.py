@@ -23,10 +23,10 @@ print("\n2️⃣ Checking enhanced functions...")
 try:
     import inspect
     
-    # Check if _skip_ads has enhanced logic
-    source = inspect.getsource(VideoAutomator._skip_ads)
-    if 'ad_skip_selectors' in source and 'ytp-ad-skip-button-modern' in source:
-        print("   ✅ Enhanced ad skipping logic present")
+    # Check that ads are skipped in-page by the MutationObserver script
+    from video_automator import AD_SKIPPER_SCRIPT, AD_SKIP_SELECTORS
+    if 'MutationObserver' in AD_SKIPPER_SCRIPT.template and 'button.ytp-ad-skip-button-modern' in AD_SKIP_SELECTORS:
+        print("   ✅ In-page ad skipper present")
     else:
         print("   ⚠️  Ad skipping may not be fully enhanced")
     
@@ -54,9 +54,9 @@ print("=" * 70)
 print("\n📋 FIXES APPLIED:")
 print("   1. ✅ Enhanced Ad Skipping:")
 print("      • Multiple ad skip button selectors")
-print("      • Auto-waits for skip button to appear (up to 6 seconds)")
-print("      • Detects ad indicators")
-print("      • Recursive checking during video playback")
+print("      • In-page observer clicks the skip button the moment it appears")
+print("      • Fast-forwards unskippable ads")
+print("      • Restores playback speed when the ad ends")
 
 print("\n   2. ✅ Auto-Play to Next Video:")
 print("      • Tries multiple next button selectors")
@@ -68,7 +68,6 @@ print("      • Verifies URL change to confirm navigation")
 print("\n   3. ✅ Enhanced Video Playback:")
 print("      • Detects if video is paused")
 print("      • Auto-resumes if paused by ad")
-print("      • Continuous ad monitoring every 5 seconds")
 print("      • Multiple play button selectors")
 
 print("\n   4. ✅ YouTube Autoplay Enablement:")
@@ -92,7 +91,7 @@ print("   • Click 'Start Automation'")
 
 print("\n3. Expected Behavior:")
 print("   ✅ Video starts playing automatically")
-print("   ✅ Ads are skipped within 5-6 seconds")
+print("   ✅ Ads are skipped as soon as the skip button appears")
 print("   ✅ Video continues if ad appears mid-playback")
 print("   ✅ Moves to next video automatically when current finishes")
 print("   ✅ Continues through entire playlist")
@@ -101,7 +100,7 @@ print("   ✅ No manual intervention needed")
 print("\n" + "=" * 70)
 print("💡 TROUBLESHOOTING:")
 print("=" * 70)
-print("• If ads still appear: They will auto-skip after 5 seconds")
+print("• If ads still appear: Check the '📺 Ads handled' line in the log")
 print("• If video pauses: It will auto-resume within 2 seconds")
 print("• If doesn't move to next: Autoplay will trigger within 10 seconds")
 print("• If autoplay fails: Next button will be clicked")
@@ -0,0 +1,147 @@
+"""
+Pipeline Tracing Module
+Lightweight timing spans for every automation phase, kept in a ring buffer
+and exportable as Chrome trace-event JSON (open in chrome://tracing or Perfetto)
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+from config import TRACING_ENABLED, TRACE_BUFFER_SIZE
+
+
+class _NullSpan:
+    """Returned when tracing is disabled - entering and leaving it does nothing"""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'category', 'args', 'start')
+    
+    def __init__(self, tracer, name: str, category: str, args: Optional[Dict]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+    
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args = dict(self.args or {}, error=exc_type.__name__)
+        self.tracer.record(self.name, self.category, self.start, end - self.start, self.args)
+        return False
+
+
+class Tracer:
+    """
+    Records completed spans as compact tuples:
+    (name, category, start_ns, duration_ns, thread_id, args)
+    """
+    
+    def __init__(self, enabled: bool = TRACING_ENABLED, capacity: int = TRACE_BUFFER_SIZE):
+        self.enabled = enabled
+        self.spans = deque(maxlen=capacity)  # Oldest spans drop off on long runs
+        self.lock = threading.Lock()
+    
+    def span(self, name: str, category: str = 'automation', **args):
+        """Context manager timing one phase: `with tracer.span('video.play'):`"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category, args or None)
+    
+    def record(self, name: str, category: str, start_ns: int, duration_ns: int, args: Optional[Dict] = None):
+        with self.lock:
+            self.spans.append((name, category, start_ns, duration_ns, threading.get_ident(), args))
+    
+    def clear(self):
+        with self.lock:
+            self.spans.clear()
+    
+    def summarize(self) -> List[Dict]:
+        """Per-phase count, total, average and max time (ms), slowest total first"""
+        with self.lock:
+            spans = list(self.spans)
+        
+        phases: Dict[str, Dict] = {}
+        for name, category, _, duration_ns, _, _ in spans:
+            phase = phases.setdefault(name, {'phase': name, 'category': category,
+                                             'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            duration_ms = duration_ns / 1e6
+            phase['count'] += 1
+            phase['total_ms'] += duration_ms
+            phase['max_ms'] = max(phase['max_ms'], duration_ms)
+        
+        summary = []
+        for phase in phases.values():
+            phase['avg_ms'] = round(phase['total_ms'] / phase['count'], 2)
+            phase['total_ms'] = round(phase['total_ms'], 2)
+            phase['max_ms'] = round(phase['max_ms'], 2)
+            summary.append(phase)
+        
+        return sorted(summary, key=lambda p: p['total_ms'], reverse=True)
+    
+    def to_chrome_trace(self) -> Dict:
+        """Spans in Chrome trace-event format (complete 'X' events, microsecond timestamps)"""
+        with self.lock:
+            spans = list(self.spans)
+        
+        pid = os.getpid()
+        events = []
+        for name, category, start_ns, duration_ns, tid, args in spans:
+            event = {
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': start_ns / 1000,
+                'dur': duration_ns / 1000,
+                'pid': pid,
+                'tid': tid
+            }
+            if args:
+                event['args'] = {k: str(v) for k, v in args.items()}
+            events.append(event)
+        
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+    
+    def export_chrome_trace(self, path: str) -> str:
+        """Write the trace JSON file and return its path"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+        return path
+
+
+# One tracer per process
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def traced(name: str, category: str = 'automation'):
+    """Decorator form of Tracer.span - costs one attribute check when tracing is off"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return func(*args, **kwargs)
+            with _Span(_tracer, name, category, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
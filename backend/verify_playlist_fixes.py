@@ -56,6 +56,8 @@ try:
     functions_to_check = [
         'increment_video_count',
         'update_playlist_progress',
+        'add_videos_watched',
+        'set_playlist_complete',
         'get_playlist_progress'
     ]
     
@@ -80,7 +82,7 @@ try:
         ('30-second autoplay timeout', 'range(30)' in content),
         ('Video ID comparison', 'video_id_old' in content and 'video_id_new' in content),
         ('Playlist end detection', 'ytp-button-disabled' in content),
-        ('Progress tracking calls', 'increment_video_count' in content and 'update_playlist_progress' in content),
+        ('Progress tracking calls', 'add_videos_watched' in content and 'set_playlist_complete' in content),
         ('Enhanced logging with emojis', '✅' in content and '❌' in content),
         ('15-second video load timeout', 'WebDriverWait(self.driver, 15)' in content),
     ]
@@ -6,7 +6,7 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -14,32 +14,277 @@ import time
 import logging
 import os
 import tempfile
-import platform
-import getpass
-from typing import Dict, Optional
-from config import PLATFORMS, DEFAULT_WAIT_TIME, VIDEO_CHECK_INTERVAL
+import json
+from string import Template
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+from config import (PLATFORMS, DEFAULT_WAIT_TIME, VIDEO_CHECK_INTERVAL, MACHINE_ID,
+                    LEAN_MODE, LEAN_BLOCKED_URLS, LEAN_QUALITY_MENUS,
+                    BROWSER_MEMORY_LIMIT_MB, MEMORY_CHECK_INTERVAL)
 from database import Database
+from selector_cache import get_selector_cache
+from tracing import traced
+
+# psutil is optional - only needed for browser resource measurements
+_psutil_available = True
+try:
+    import psutil
+except ImportError:
+    _psutil_available = False
+
+
+# Reads the current video's playback state in one call
+VIDEO_STATUS_SCRIPT = """
+const video = document.querySelector(arguments[0]);
+if (!video) return null;
+return {
+    currentTime: video.currentTime,
+    duration: video.duration,
+    paused: video.paused,
+    ended: video.ended
+};
+"""
+
+# Playlist enumeration from page data (falls back to the 'playlist_item' selector)
+# ytInitialData only holds the first batch of items (~100); the rest is fetched page by page
+# with the playlist's continuation tokens, as YouTube's own infinite scroll does. The body
+# may await (CDP evaluates it as is; Selenium runs it through YOUTUBE_PLAYLIST_ASYNC_SCRIPT).
+YOUTUBE_PLAYLIST_SCRIPT = """
+const listId = new URLSearchParams(location.search).get('list') || '';
+const items = [];
+const seen = new Set();
+const tokens = [];
+const walk = (node, inList) => {
+    if (!node || typeof node !== 'object') return;
+    if (Array.isArray(node)) { node.forEach(n => walk(n, inList)); return; }
+    const r = node.playlistPanelVideoRenderer || node.playlistVideoRenderer;
+    if (r && r.videoId) {
+        if (!seen.has(r.videoId)) {
+            seen.add(r.videoId);
+            const t = r.title || {};
+            items.push({
+                url: location.origin + location.pathname.replace(/playlist$/, 'watch') + '?v=' + r.videoId + (listId ? '&list=' + listId : ''),
+                title: t.simpleText || (t.runs || []).map(x => x.text).join('')
+            });
+        }
+        return;
+    }
+    if (node.continuationItemRenderer) {
+        // Only the playlist's own continuation - not comments or recommendations
+        const command = ((node.continuationItemRenderer.continuationEndpoint || {}).continuationCommand || {});
+        if (inList && command.token) tokens.push(command.token);
+        return;
+    }
+    for (const key in node) walk(node[key], inList || key === 'playlistVideoListRenderer');
+};
+walk(window.ytInitialData, false);
+
+const cfg = (window.ytcfg && window.ytcfg.data_) || {};
+for (let page = 0; tokens.length && cfg.INNERTUBE_API_KEY && page < 100; page++) {
+    try {
+        const response = await fetch('/youtubei/v1/browse?prettyPrint=false&key=' + cfg.INNERTUBE_API_KEY, {
+            method: 'POST',
+            credentials: 'include',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({context: cfg.INNERTUBE_CONTEXT, continuation: tokens.shift()})
+        });
+        walk((await response.json()).onResponseReceivedActions, true);
+    } catch (e) {
+        break;  // Keep what we have; automate_playlist re-enumerates when the list runs out
+    }
+}
+return items;
+"""
+YOUTUBE_PLAYLIST_ASYNC_SCRIPT = (
+    "const done = arguments[arguments.length - 1];\n"
+    "(async function() {" + YOUTUBE_PLAYLIST_SCRIPT + "})().then(done, () => done(null));"
+)
+
+UDEMY_CURRICULUM_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const slug = (location.pathname.match(/\\/course\\/([^/]+)/) || [])[1];
+const holder = document.querySelector('[data-clp-course-id]');
+const courseId = holder && holder.getAttribute('data-clp-course-id');
+if (!slug || !courseId) { done(null); return; }
+fetch('/api-2.0/courses/' + courseId + '/subscriber-curriculum-items/?page_size=1400&fields[lecture]=title', {credentials: 'include'})
+    .then(r => r.json())
+    .then(data => done((data.results || [])
+        .filter(i => i._class === 'lecture')
+        .map(i => ({url: location.origin + '/course/' + slug + '/learn/lecture/' + i.id, title: i.title}))))
+    .catch(() => done(null));
+"""
+
+PLAYLIST_ITEM_LINKS_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0]), a => ({url: a.href, title: (a.textContent || '').trim()}));
+"""
+
+# Skip buttons and overlays watched by the in-page ad skipper
+AD_SKIP_SELECTORS = [
+    'button.ytp-ad-skip-button',
+    'button.ytp-ad-skip-button-modern',
+    '.ytp-ad-skip-button',
+    'button[class*="skip"]',
+    '.videoAdUiSkipButton'
+]
+AD_OVERLAY_SELECTORS = ['.ad-showing', '.ytp-ad-player-overlay', '.video-ads']
+
+# Installed once per document (CDP) - a MutationObserver clicks the skip button the moment it
+# appears, fast-forwards unskippable ads and restores the playback rate when the ad ends.
+# Counters live in window.__smartAdSkipper so Python can read them in one call.
+AD_SKIPPER_SCRIPT = Template("""
+(() => {
+    if (window.__smartAdSkipper) return;
+    const SKIP = $skip_selectors;
+    const OVERLAY = $overlay_selectors;
+    const VIDEO = $video_selector;
+    const state = window.__smartAdSkipper = {
+        ads: 0, skipped: 0, fastForwarded: 0, adSeconds: 0, active: false, clicked: false, rate: null, startedAt: 0
+    };
+    // Like Selenium's is_displayed: an empty (zero-size) ad container, always on the page, is not an ad
+    const visible = (el) => !!el && el.offsetWidth > 0 && el.offsetHeight > 0;
+    const first = (selectors, test) => {
+        for (const s of selectors) {
+            for (const el of document.querySelectorAll(s)) {
+                if (test(el)) return el;
+            }
+        }
+        return null;
+    };
+    const check = () => {
+        const skip = first(SKIP, (el) => visible(el) && !el.disabled);
+        const overlay = first(OVERLAY, visible);
+        if (skip || overlay) {
+            if (!state.active) {
+                state.active = true;
+                state.clicked = false;
+                state.ads += 1;
+                state.startedAt = performance.now();
+            }
+            if (skip) {
+                skip.click();
+                if (!state.clicked) state.skipped += 1;  // The button may linger for a few ticks
+                state.clicked = true;
+            } else {
+                // Only the ad's own video is fast-forwarded, never the lecture
+                const ad = overlay.querySelector('video') || document.querySelector('.ad-showing video');
+                if (ad && isFinite(ad.duration) && ad.currentTime < ad.duration - 0.25) {
+                    ad.muted = true;
+                    ad.currentTime = ad.duration;
+                    state.fastForwarded += 1;
+                }
+            }
+        } else if (state.active) {
+            state.active = false;
+            state.adSeconds += (performance.now() - state.startedAt) / 1000;
+            const video = document.querySelector(VIDEO);
+            if (video && state.rate) {
+                video.playbackRate = state.rate;
+                if (video.paused && !video.ended) video.play();
+            }
+        }
+    };
+    let scheduled = false;
+    const schedule = () => {
+        if (scheduled) return;
+        scheduled = true;
+        setTimeout(() => { scheduled = false; check(); }, 50);
+    };
+    new MutationObserver(schedule).observe(document, {
+        childList: true, subtree: true, attributes: true, attributeFilter: ['class', 'style', 'disabled', 'hidden']
+    });
+    check();
+})();
+""")
+
+# Installs the skipper on the current document if needed, then hands it the playback rate
+AD_SKIPPER_STATS_SCRIPT = """
+const state = window.__smartAdSkipper;
+if (!state) return null;
+if (arguments[0]) state.rate = arguments[0];
+return {page: performance.timeOrigin, ads: state.ads, skipped: state.skipped,
+        fastForwarded: state.fastForwarded, adSeconds: state.adSeconds, active: state.active};
+"""
+
+# YouTube's player API: pick the last (lowest) available quality level
+YOUTUBE_LOWEST_QUALITY_SCRIPT = """
+const player = document.getElementById('movie_player');
+if (!player || !player.getAvailableQualityLevels) return null;
+const levels = player.getAvailableQualityLevels().filter(q => q !== 'auto');
+if (!levels.length) return null;
+const lowest = levels[levels.length - 1];
+if (player.setPlaybackQualityRange) player.setPlaybackQualityRange(lowest, lowest);
+player.setPlaybackQuality(lowest);
+return lowest;
+"""
+
+
+def playlist_page_url(url: str) -> str:
+    """The page that lists a whole playlist: YouTube watch?v=...&list=ID URLs map to its playlist?list=ID page"""
+    parsed = urlparse(url)
+    list_id = parse_qs(parsed.query).get('list')
+    if list_id and parsed.path.endswith('/watch'):
+        return parsed._replace(path=parsed.path[:-len('watch')] + 'playlist', query=f'list={list_id[0]}').geturl()
+    return url
+
+
+def video_key(url: str) -> str:
+    """Identity of a video independent of playlist/index/tracking parameters"""
+    parsed = urlparse(url)
+    video_id = parse_qs(parsed.query).get('v')
+    if video_id:
+        return video_id[0]  # YouTube
+    return f"{parsed.netloc}{parsed.path.rstrip('/')}"
 
 
 class VideoAutomator:
     """Automates video playback on various learning platforms"""
     
-    def __init__(self, platform: str, headless: bool = False, playback_speed: float = 1.0, user_id: int = None):
+    def __init__(self, platform: str, headless: bool = False, playback_speed: float = 1.0, user_id: int = None,
+                 profile_suffix: str = None, lean: bool = LEAN_MODE):
         self.platform = platform.lower()
         self.db = Database(user_id=user_id)  # User-specific database
         self.user_id = user_id
         self.driver = None
         self.headless = headless
         self.playback_speed = playback_speed
+        self.profile_suffix = profile_suffix  # Separate Chrome profile per parallel worker
+        self.lean = lean  # Block heavy resources, mute, lowest video quality
+        self.selector_cache = get_selector_cache()  # Tries the selector that worked last time first
+        self.memory_limit_mb = BROWSER_MEMORY_LIMIT_MB  # Watchdog threshold (0 = never recycle)
+        self.memory_check_interval = MEMORY_CHECK_INTERVAL
+        self._last_memory_check = time.time()
+        self.driver_recycles = 0
+        self.checkpoint = None  # Last video URL + position saved before a browser restart
         self.logger = logging.getLogger(__name__)
         
         if self.platform not in PLATFORMS:
             raise ValueError(f"Unsupported platform: {platform}")
         
         self.config = PLATFORMS[self.platform]
+        self.ad_skipper_script = AD_SKIPPER_SCRIPT.substitute(
+            skip_selectors=json.dumps(AD_SKIP_SELECTORS),
+            overlay_selectors=json.dumps(AD_OVERLAY_SELECTORS),
+            video_selector=json.dumps(self.config['selectors']['video_player'])
+        )
+        self.ad_stats = {'ads': 0, 'skipped': 0, 'fastForwarded': 0, 'adSeconds': 0.0}  # Totals over closed pages
+        self._page_ad_stats = None  # Counters of the page currently open
     
-    def init_driver(self):
-        """Initialize Selenium WebDriver"""
+    def _profile_dir(self) -> str:
+        """Chrome user data directory for this user and machine"""
+        # IMPORTANT: Unique user data directory per user AND machine to prevent cross-device/user conflicts
+        # Add user_id to make it unique per user
+        if self.user_id:
+            profile_name = f'selenium_profile_user{self.user_id}_{MACHINE_ID}'
+        else:
+            profile_name = f'selenium_profile_{MACHINE_ID}'
+        
+        if self.profile_suffix:
+            profile_name += f'_{self.profile_suffix}'
+        
+        return os.path.join(tempfile.gettempdir(), profile_name)
+    
+    def _build_chrome_options(self) -> Options:
+        """Build Chrome options (subclasses can add their own flags)"""
         chrome_options = Options()
         
         if self.headless:
@@ -52,31 +297,179 @@ class VideoAutomator:
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
         
-        # IMPORTANT: Unique user data directory per user AND machine to prevent cross-device/user conflicts
-        import tempfile
-        import platform
-        import getpass
-        machine_id = f"{platform.node()}_{getpass.getuser()}".replace(" ", "_")
-        
-        # Add user_id to make it unique per user
-        if self.user_id:
-            profile_name = f'selenium_profile_user{self.user_id}_{machine_id}'
-        else:
-            profile_name = f'selenium_profile_{machine_id}'
-        
-        user_data_dir = os.path.join(tempfile.gettempdir(), profile_name)
-        chrome_options.add_argument(f'--user-data-dir={user_data_dir}')
+        chrome_options.add_argument(f'--user-data-dir={self._profile_dir()}')
         
         # User agent to avoid detection
         chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
         
+        if self.lean:
+            # Lean mode: no audio, no GPU compositing, no images
+            chrome_options.add_argument('--mute-audio')
+            chrome_options.add_argument('--disable-gpu')
+            chrome_options.add_argument('--disable-gpu-compositing')
+            chrome_options.add_argument('--disable-software-rasterizer')
+            chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+            chrome_options.add_argument('--disable-extensions')
+        return chrome_options
+    
+    @traced('video.driver_start')
+    def init_driver(self):
+        """Initialize Selenium WebDriver"""
+        chrome_options = self._build_chrome_options()
+        
         service = Service(ChromeDriverManager().install())
         self.driver = webdriver.Chrome(service=service, options=chrome_options)
         self.driver.maximize_window()
         
-        self.logger.info(f"WebDriver initialized for {self.platform} on {machine_id} (user: {self.user_id})")
+        if self.lean:
+            self._block_heavy_resources()
+        self._install_ad_skipper()
+        
+        self.logger.info(f"WebDriver initialized for {self.platform} on {MACHINE_ID} (user: {self.user_id})")
         self.db.add_log('driver_init', f'WebDriver initialized for {self.platform}', 'success')
     
+    def _block_heavy_resources(self):
+        """Lean mode: drop images, fonts, thumbnails and ad/tracker requests at the network layer (CDP)"""
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+            self.logger.info(f"🪶 Lean mode: blocking {len(LEAN_BLOCKED_URLS)} URL patterns")
+        except Exception as e:
+            self.logger.warning(f"Could not enable request blocking: {str(e)}")
+    
+    def _install_ad_skipper(self):
+        """Register the in-page ad skipper so it runs on every document before the page's own scripts"""
+        try:
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': self.ad_skipper_script})
+        except Exception as e:
+            # _skip_ads() still injects it into each page it is called on
+            self.logger.warning(f"Could not register ad skipper: {str(e)}")
+    
+    @traced('video.set_quality')
+    def set_lowest_quality(self) -> bool:
+        """Switch the current video to its lowest available quality"""
+        try:
+            if self.platform == 'youtube':
+                quality = self.driver.execute_script(YOUTUBE_LOWEST_QUALITY_SCRIPT)
+                if quality:
+                    self.logger.info(f"🪶 Video quality set to {quality}")
+                    return True
+                return False
+            
+            menu = LEAN_QUALITY_MENUS.get(self.platform)
+            if not menu:
+                return False
+            
+            self.driver.find_element(By.CSS_SELECTOR, menu['menu_button']).click()
+            options = self.driver.find_elements(By.CSS_SELECTOR, menu['options'])
+            if not options:
+                # Close the menu again
+                self.driver.find_element(By.CSS_SELECTOR, menu['menu_button']).click()
+                return False
+            
+            options[-1].click()
+            self.logger.info(f"🪶 Video quality set to {options[-1].text or 'lowest'}")
+            return True
+        except Exception as e:
+            self.logger.debug(f"Could not set lowest quality: {str(e)}")
+            return False
+    
+    def get_browser_resource_usage(self) -> Optional[Dict]:
+        """
+        Memory and CPU used by this session's browser (chromedriver + every Chrome process under it)
+        Returns None if psutil is not installed or the browser is not running
+        """
+        if not _psutil_available or not self.driver:
+            return None
+        
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+        except Exception:
+            return None
+        
+        rss = 0
+        cpu_seconds = 0.0
+        for proc in processes:
+            try:
+                rss += proc.memory_info().rss
+                cpu_times = proc.cpu_times()
+                cpu_seconds += cpu_times.user + cpu_times.system
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        
+        return {
+            'rss_mb': round(rss / (1024 * 1024), 1),
+            'cpu_seconds': round(cpu_seconds, 2),
+            'processes': len(processes)
+        }
+    
+    def _memory_watchdog(self) -> bool:
+        """
+        Sample the browser's memory every memory_check_interval seconds and recycle it above the limit
+        Returns True if the browser was restarted
+        """
+        if not self.memory_limit_mb or time.time() - self._last_memory_check < self.memory_check_interval:
+            return False
+        self._last_memory_check = time.time()
+        
+        usage = self.get_browser_resource_usage()
+        if not usage or usage['rss_mb'] <= self.memory_limit_mb:
+            return False
+        
+        self.logger.warning(f"🧠 Browser using {usage['rss_mb']} MB (limit {self.memory_limit_mb} MB) - restarting it")
+        return self.recycle_driver()
+    
+    def checkpoint_playback(self) -> Optional[Dict]:
+        """Remember the current video URL and playback position"""
+        try:
+            status = self.driver.execute_script(VIDEO_STATUS_SCRIPT, self.config['selectors']['video_player']) or {}
+            self.checkpoint = {
+                'url': self.driver.current_url,
+                'position': status.get('currentTime') or 0
+            }
+        except Exception as e:
+            self.logger.error(f"Could not checkpoint playback: {str(e)}")
+            self.checkpoint = None
+        return self.checkpoint
+    
+    @traced('video.recycle')
+    def recycle_driver(self) -> bool:
+        """
+        Restart the browser from the same profile and resume the current video where it left off
+        (logins and cookies survive because the profile directory is reused)
+        """
+        checkpoint = self.checkpoint_playback()
+        if not checkpoint:
+            return False
+        
+        self._skip_ads()
+        self._collect_ad_stats()
+        try:
+            self.driver.quit()
+        except Exception:
+            pass  # The renderer may already be gone
+        self.driver = None
+        
+        self.init_driver()
+        self.driver.get(checkpoint['url'])
+        self.play_video()
+        
+        try:
+            self.driver.execute_script(
+                "const v = document.querySelector(arguments[0]); if (v) v.currentTime = arguments[1];",
+                self.config['selectors']['video_player'], checkpoint['position']
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not seek to {checkpoint['position']:.0f}s: {str(e)}")
+        
+        self.driver_recycles += 1
+        self._last_memory_check = time.time()
+        self.logger.info(f"♻️ Browser restarted, resumed at {checkpoint['position']:.0f}s of {checkpoint['url']}")
+        self.db.add_log('driver_recycle', f"Browser restarted at {checkpoint['position']:.0f}s of {checkpoint['url']}", 'info')
+        return True
+    
+    @traced('video.login')
     def login(self, credentials: Dict[str, str]):
         """
         Login to the learning platform
@@ -134,6 +527,31 @@ class VideoAutomator:
             self.db.add_log('login', f'Login failed: {str(e)}', 'error')
             raise
     
+    def _find_first(self, page_type: str, selectors: List[str], condition=None):
+        """
+        Return the first element matched by `selectors`, trying the historically
+        successful selector first. condition: optional check the element must pass
+        """
+        ordered = self.selector_cache.order(self.platform, page_type, selectors)
+        missed = []
+        
+        for selector in ordered:
+            try:
+                element = self.driver.find_element(By.CSS_SELECTOR, selector)
+                if condition and not condition(element):
+                    missed.append(selector)
+                    continue
+            except Exception:
+                missed.append(selector)
+                continue
+            
+            self.selector_cache.record_hit(self.platform, page_type, selectors, selector, missed)
+            return element
+        
+        self.selector_cache.record_miss(self.platform, page_type, missed)
+        return None
+    
+    @traced('video.navigate')
     def navigate_to_playlist(self, playlist_url: str):
         """Navigate to a playlist/course and enable autoplay"""
         if not self.driver:
@@ -155,27 +573,96 @@ class VideoAutomator:
                     'button[aria-label*="Autoplay"]'
                 ]
                 
-                for selector in autoplay_selectors:
-                    try:
-                        autoplay_toggle = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        aria_checked = autoplay_toggle.get_attribute('aria-checked')
-                        
-                        if aria_checked == 'false':
-                            autoplay_toggle.click()
-                            self.logger.info("✅ Enabled YouTube autoplay")
-                            time.sleep(1)
-                            break
-                        else:
-                            self.logger.info("✅ YouTube autoplay already enabled")
-                            break
-                    except NoSuchElementException:
-                        continue
+                autoplay_toggle = self._find_first('autoplay_toggle', autoplay_selectors)
+                if autoplay_toggle:
+                    aria_checked = autoplay_toggle.get_attribute('aria-checked')
+                    
+                    if aria_checked == 'false':
+                        autoplay_toggle.click()
+                        self.logger.info("✅ Enabled YouTube autoplay")
+                        time.sleep(1)
+                    else:
+                        self.logger.info("✅ YouTube autoplay already enabled")
             except Exception as e:
                 self.logger.debug(f"Could not toggle autoplay: {str(e)}")
         
         self.logger.info(f"Navigated to: {playlist_url}")
         self.db.add_log('navigation', f'Navigated to playlist: {playlist_url}', 'info')
     
+    def _scrape_playlist_items(self) -> List[Dict]:
+        """Read the playlist items from the current page: page data first, then item links"""
+        items = None
+        try:
+            if self.platform == 'youtube':
+                self.driver.set_script_timeout(60)  # Large playlists take one request per 100 items
+                items = self.driver.execute_async_script(YOUTUBE_PLAYLIST_ASYNC_SCRIPT)
+            elif self.platform == 'udemy':
+                self.driver.set_script_timeout(15)
+                items = self.driver.execute_async_script(UDEMY_CURRICULUM_SCRIPT)
+        except Exception as e:
+            self.logger.debug(f"Page data enumeration failed: {str(e)}")
+        
+        if not items:
+            item_selector = self.config['selectors'].get('playlist_item')
+            if item_selector:
+                try:
+                    # One round trip instead of a find_element + get_attribute per item
+                    items = self.driver.execute_script(PLAYLIST_ITEM_LINKS_SCRIPT, item_selector)
+                except Exception as e:
+                    self.logger.error(f"Error collecting playlist items: {str(e)}")
+        
+        # Drop duplicates while keeping playlist order
+        unique = {}
+        for item in items or []:
+            if item.get('url'):
+                unique.setdefault(video_key(item['url']), item)
+        return list(unique.values())
+    
+    @traced('video.enumerate_playlist')
+    def enumerate_playlist(self, playlist_url: str, refresh: bool = False) -> List[Dict]:
+        """
+        Ordered list of every video in the playlist: [{'position', 'url', 'title'}, ...]
+        Enumerated from the page once, then served from the database
+        refresh: Re-read the playlist page even if a stored list exists
+        """
+        if not refresh:
+            items = self.db.get_playlist_items(playlist_url)
+            if items:
+                return items
+        
+        if not self.driver:
+            self.init_driver()
+        self.driver.get(playlist_page_url(playlist_url) if self.platform == 'youtube' else playlist_url)
+        time.sleep(3)
+        
+        items = self._scrape_playlist_items()
+        if items:
+            self.db.save_playlist_items(playlist_url, items)
+            self.db.add_log('playlist_enumerated', f'Found {len(items)} videos in {playlist_url}', 'info')
+        self.logger.info(f"Found {len(items)} videos in playlist")
+        return self.db.get_playlist_items(playlist_url) if items else []
+    
+    def get_pending_items(self, playlist_url: str, refresh: bool = False) -> List[Dict]:
+        """
+        Playlist items not completed yet, in playlist order
+        The stored list is only a hint: when every stored item is done, the playlist is read
+        again before reporting nothing pending (videos may have been added since)
+        """
+        items = self.enumerate_playlist(playlist_url, refresh=refresh)
+        pending = self._unwatched(items)
+        if items and not pending and not refresh:
+            return self.get_pending_items(playlist_url, refresh=True)
+        return pending
+    
+    def _unwatched(self, items: List[Dict]) -> List[Dict]:
+        completed = {video_key(v['video_url']) for v in self.db.get_completed_videos(self.platform)}
+        return [item for item in items if video_key(item['url']) not in completed]
+    
+    def get_playlist_items(self, playlist_url: str) -> List[str]:
+        """Video URLs of the playlist's unwatched items (in playlist order)"""
+        return [item['url'] for item in self.get_pending_items(playlist_url)]
+    
+    @traced('video.set_speed')
     def set_playback_speed(self, speed: float = None):
         """
         Set video playback speed
@@ -198,6 +685,7 @@ class VideoAutomator:
             self.logger.error(f"Error setting playback speed: {str(e)}")
             return False
     
+    @traced('video.play')
     def play_video(self):
         """Start playing the current video - Enhanced version with manual pause detection"""
         try:
@@ -234,6 +722,9 @@ class VideoAutomator:
             self.set_playback_speed()
             self.logger.info(f"✅ Playback speed set to {self.playback_speed}x")
             
+            if self.lean:
+                self.set_lowest_quality()
+            
             # Click play if paused (try multiple selectors)
             play_button_selectors = [
                 'button.ytp-play-button',
@@ -242,18 +733,16 @@ class VideoAutomator:
                 '.ytp-large-play-button'
             ]
             
-            for selector in play_button_selectors:
-                try:
-                    play_button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    # Check if video is paused
-                    paused = self.driver.execute_script("return arguments[0].paused", video_element)
-                    if paused:
+            try:
+                # Only look for a play button if the video is paused
+                if self.driver.execute_script("return arguments[0].paused", video_element):
+                    play_button = self._find_first('play_button', play_button_selectors)
+                    if play_button:
                         play_button.click()
                         self.logger.info("Clicked play button")
                         time.sleep(1)
-                        break
-                except:
-                    continue
+            except:
+                pass
             
             # Alternative: Click on video player itself to play
             try:
@@ -292,47 +781,53 @@ class VideoAutomator:
             self.logger.error(f"Error playing video: {str(e)}")
             self.db.add_log('video_play', f'Error: {str(e)}', 'error')
     
-    def _skip_ads(self):
-        """Skip ads if present - Enhanced version"""
+    @traced('video.skip_ads')
+    def _skip_ads(self) -> Optional[Dict]:
+        """
+        Make sure the in-page ad skipper is running and read its counters (one round trip)
+        The skipper itself reacts to ads as they appear - nothing here polls for them
+        """
         try:
-            # YouTube ad skip button (appears after 5 seconds)
-            ad_skip_selectors = [
-                'button.ytp-ad-skip-button',
-                'button.ytp-ad-skip-button-modern',
-                '.ytp-ad-skip-button',
-                'button[class*="skip"]',
-                '.videoAdUiSkipButton'
-            ]
-            
-            for selector in ad_skip_selectors:
-                try:
-                    skip_button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    if skip_button.is_displayed() and skip_button.is_enabled():
-                        skip_button.click()
-                        self.logger.info("Ad skipped successfully")
-                        time.sleep(1)
-                        return True
-                except (NoSuchElementException, Exception):
-                    continue
-            
-            # Check if ad is playing (YouTube specific)
-            try:
-                ad_indicator = self.driver.find_element(By.CSS_SELECTOR, '.ytp-ad-player-overlay, .video-ads')
-                if ad_indicator.is_displayed():
-                    self.logger.info("Ad detected, waiting for skip button...")
-                    # Wait up to 6 seconds for skip button
-                    for _ in range(6):
-                        time.sleep(1)
-                        if self._skip_ads():  # Recursive check
-                            return True
-            except NoSuchElementException:
-                pass  # No ad present
-                
+            stats = self.driver.execute_script(AD_SKIPPER_STATS_SCRIPT, self.playback_speed)
+            if stats is None:
+                # Page loaded before the CDP registration (or CDP unavailable) - inject directly
+                self.driver.execute_script(self.ad_skipper_script)
+                stats = self.driver.execute_script(AD_SKIPPER_STATS_SCRIPT, self.playback_speed)
         except Exception as e:
-            self.logger.debug(f"Ad skip check: {str(e)}")
+            self.logger.debug(f"Ad skipper check: {str(e)}")
+            return None
         
-        return False
+        if stats and self._page_ad_stats and stats['page'] != self._page_ad_stats['page']:
+            self._collect_ad_stats()  # New document - bank the previous page's counters
+        self._page_ad_stats = stats
+        return stats
+    
+    def _collect_ad_stats(self):
+        """Add the last page's ad counters to the run totals"""
+        if self._page_ad_stats:
+            for key in self.ad_stats:
+                self.ad_stats[key] += self._page_ad_stats.get(key) or 0
+        self._page_ad_stats = None
+    
+    def _log_ad_stats(self):
+        """Refresh the page's ad counters and log any ads handled during the video"""
+        before = self.get_ad_stats()['ads']
+        self._skip_ads()
+        handled = self.get_ad_stats()['ads'] - before
+        if handled:
+            self.logger.info(f"📺 {handled} ad(s) skipped in-page")
+            self.db.add_log('ad_skip', f'{handled} ad(s) skipped', 'info')
     
+    def get_ad_stats(self) -> Dict:
+        """Ads handled so far in this run (the current page's counters included)"""
+        totals = dict(self.ad_stats)
+        if self._page_ad_stats:
+            for key in totals:
+                totals[key] += self._page_ad_stats.get(key) or 0
+        totals['adSeconds'] = round(totals['adSeconds'], 1)
+        return totals
+    
+    @traced('video.completion_poll')
     def is_video_complete(self) -> bool:
         """Check if current video has finished"""
         try:
@@ -362,6 +857,7 @@ class VideoAutomator:
             self.logger.debug(f"Error checking video completion: {str(e)}")
             return False
     
+    @traced('video.next')
     def next_video(self):
         """Move to next video in playlist - Enhanced for YouTube autoplay with longer timeout"""
         try:
@@ -379,7 +875,10 @@ class VideoAutomator:
                     'a[aria-label*="Next"]'
                 ]
                 
-                for selector in next_button_selectors:
+                # Each miss costs a 3s wait, so try the selector that worked last time first
+                ordered = self.selector_cache.order(self.platform, 'next_button', next_button_selectors)
+                missed = []
+                for selector in ordered:
                     try:
                         next_button = WebDriverWait(self.driver, 3).until(
                             EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
@@ -390,10 +889,14 @@ class VideoAutomator:
                         
                         # Check if URL changed
                         if self.driver.current_url != current_url:
+                            self.selector_cache.record_hit(self.platform, 'next_button', next_button_selectors,
+                                                           selector, missed)
                             self.db.add_log('video_next', 'Moved to next video via button', 'success')
                             return True
                     except:
-                        continue
+                        pass
+                    missed.append(selector)
+                self.selector_cache.record_miss(self.platform, 'next_button', missed)
                 
                 # Method 2: Wait for autoplay (YouTube usually autoplays next video)
                 # Increased timeout for large playlists
@@ -464,6 +967,45 @@ class VideoAutomator:
             self.logger.error(f"Error moving to next video: {str(e)}")
             return False
     
+    @traced('video.watch')
+    def watch_video(self, video_url: str, max_stalled_checks: int = 15) -> bool:
+        """
+        Open a single video, play it to the end and mark it completed
+        Returns False if the video never became playable
+        """
+        self.driver.get(video_url)
+        self.play_video()
+        current_url = self.driver.current_url
+        video_selector = self.config['selectors']['video_player']
+        
+        stalled_checks = 0
+        
+        while not self.is_video_complete():
+            time.sleep(VIDEO_CHECK_INTERVAL)
+            self._memory_watchdog()
+            
+            status = self.driver.execute_script(VIDEO_STATUS_SCRIPT, video_selector)
+            if not status:
+                stalled_checks += 1
+                if stalled_checks >= max_stalled_checks:
+                    self.logger.error(f"❌ No playable video at {video_url}")
+                    self.db.add_log('video_play', f'No playable video: {video_url}', 'error')
+                    return False
+                continue
+            stalled_checks = 0
+            
+            if status.get('paused') and not status.get('ended'):
+                self.driver.execute_script(
+                    "const v = document.querySelector(arguments[0]); v.play(); v.playbackRate = arguments[1];",
+                    video_selector, self.playback_speed
+                )
+        
+        self.db.mark_video_completed(current_url)
+        self.logger.info(f"✅ Completed: {self.driver.title}")
+        self._log_ad_stats()
+        return True
+    
+    @traced('video.playlist')
     def automate_playlist(self, playlist_url: str, video_limit: int = None, playback_speed: float = None):
         """
         Automate watching entire playlist - Enhanced with better ad handling and error recovery
@@ -473,10 +1015,26 @@ class VideoAutomator:
         if playback_speed:
             self.playback_speed = playback_speed
         
-        self.navigate_to_playlist(playlist_url)
+        # Enumerate once and jump straight to the first unwatched item
+        pending = self.get_pending_items(playlist_url)
+        if pending:
+            start_url = pending[0]['url']
+            self.logger.info(f"⏩ Resuming at item {pending[0]['position'] + 1}: {pending[0]['title'] or start_url}")
+        elif self.db.get_playlist_items(playlist_url):
+            self.logger.info("🏁 Every video in this playlist is already completed")
+            self.db.set_playlist_complete(playlist_url, True)
+            return
+        else:
+            # Playlist could not be enumerated - resume from the last video we were on, if any
+            progress = self.db.get_playlist_progress(playlist_url)
+            start_url = (progress or {}).get('last_video_url') or playlist_url
+        
+        self.navigate_to_playlist(start_url)
         videos_watched = 0
         consecutive_errors = 0
         max_consecutive_errors = 3
+        reached_end = False  # Set once a fresh read of the playlist shows nothing left
+        played = set()  # Videos started this run, never queued again after a re-read
         
         self.logger.info(f"Starting playlist automation (limit: {video_limit if video_limit else 'unlimited'})")
         
@@ -491,29 +1049,23 @@ class VideoAutomator:
                 self.logger.info(f"▶️ Playing video {videos_watched + 1}...")
                 self.play_video()
                 
-                # Update progress immediately after starting video (FIX BUG #3)
+                # Remember where we are immediately after starting video (FIX BUG #3)
                 current_url = self.driver.current_url
+                played.add(video_key(current_url))
                 videos_watched += 1
-                self.db.increment_video_count(playlist_url, videos_watched)
-                self.logger.info(f"📊 Progress updated: {videos_watched} videos watched")
+                self.db.set_last_video(playlist_url, current_url)
                 
-                # Monitor video playback with continuous ad checking and manual pause detection
-                last_check_time = time.time()
-                ad_check_interval = 5  # Check for ads every 5 seconds
+                # Monitor video playback with manual pause detection (ads are handled in-page)
                 last_user_pause_check = time.time()
                 user_pause_check_interval = 2  # Check for manual pause every 2 seconds (FIX BUG #1)
                 
                 while not self.is_video_complete():
                     # Regular interval check
                     time.sleep(VIDEO_CHECK_INTERVAL)
-                    
-                    # Periodic ad skip check
                     current_time = time.time()
-                    if current_time - last_check_time >= ad_check_interval:
-                        self._skip_ads()
-                        # Re-apply playback speed after ad (FIX BUG #2)
-                        self.set_playback_speed()
-                        last_check_time = current_time
+                    
+                    # Restart the browser (same profile, same position) if its memory has grown too far
+                    self._memory_watchdog()
                     
                     # Check for manual user pause (FIX BUG #1)
                     if current_time - last_user_pause_check >= user_pause_check_interval:
@@ -579,12 +1131,34 @@ class VideoAutomator:
                 consecutive_errors = 0  # Reset error count on successful completion
                 self.logger.info(f"✅ Completed video {videos_watched}")
                 
-                # Mark video as completed
+                # Mark video as completed and add it to the playlist's total (kept across resumed runs)
                 self.db.mark_video_completed(current_url)
+                self.db.add_videos_watched(playlist_url)
+                self.logger.info(f"📊 Progress updated: {videos_watched} videos watched this run")
+                self._log_ad_stats()
                 
-                # Move to next video
+                # Move to next video - straight to the next unwatched item when the playlist is known
                 self.logger.info(f"Moving to next video...")
-                if not self.next_video():
+                if pending:
+                    # pending[0] is the item we just played
+                    pending = [item for item in pending[1:] if video_key(item['url']) != video_key(current_url)]
+                    if not pending:
+                        # Re-read the playlist before ending - items may have been added or not enumerated
+                        refreshed = self.enumerate_playlist(playlist_url, refresh=True)
+                        pending = [item for item in self._unwatched(refreshed) if video_key(item['url']) not in played]
+                        if refreshed and not pending:
+                            self.logger.info("🏁 Reached end of playlist (no more videos)")
+                            reached_end = True
+                            break
+                    if pending:
+                        self.driver.get(pending[0]['url'])
+                    else:
+                        # Playlist page unreadable - go back and follow the player's next/autoplay
+                        self.driver.get(current_url)
+                        if not self.next_video():
+                            self.logger.info("🏁 Reached end of playlist (no more videos)")
+                            break
+                elif not self.next_video():
                     self.logger.info("🏁 Reached end of playlist (no more videos)")
                     break
                 
@@ -627,12 +1201,28 @@ class VideoAutomator:
                 time.sleep(5)
                 continue
         
+        ad_stats = self.get_ad_stats()
+        if ad_stats['ads']:
+            self.logger.info(f"📺 Ads handled: {ad_stats['ads']} ({ad_stats['skipped']} skipped, "
+                             f"{ad_stats['fastForwarded']} fast-forwarded, {ad_stats['adSeconds']}s of ad time)")
         self.logger.info(f"🎉 Automation complete. Watched {videos_watched} videos")
         self.db.add_log('automation_complete', f'Watched {videos_watched} videos from {playlist_url}', 'success')
-        self.db.update_playlist_progress(playlist_url, videos_watched)
+        self.db.set_playlist_complete(playlist_url,
+                                      reached_end or (bool(self.db.get_playlist_items(playlist_url))
+                                                      and not self.get_pending_items(playlist_url)))
     
+    @traced('video.close')
     def close(self):
         """Close the browser"""
+        self.selector_cache.save()
+        counters = self.selector_cache.get_counters()
+        if counters['lookups']:
+            self.logger.info(f"🎯 Selector cache: {counters['lookups']} lookups, "
+                             f"{counters['first_try_hits']} first-try hits, "
+                             f"{counters['round_trips_saved']} round trips saved")
+        if self.driver_recycles:
+            self.logger.info(f"♻️ Browser was restarted {self.driver_recycles} time(s) to keep memory in check")
+        
         if self.driver:
             self.driver.quit()
             self.logger.info("Browser closed")
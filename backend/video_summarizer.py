@@ -3,10 +3,100 @@ Video Summarization Module
 Automatically generates AI-powered summaries of completed videos
 """
 import os
+import hashlib
 import json
+import random
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
+from requests.adapters import HTTPAdapter
+from config import (OPENAI_API_URL, OPENAI_MODEL, SUMMARY_WORKERS, SUMMARY_RATE_LIMIT, SUMMARY_MAX_RETRIES,
+                    SUMMARY_BACKOFF_BASE, SUMMARY_BACKOFF_MAX, SUMMARY_REQUEST_TIMEOUT)
+from summary_store import SummaryStore, get_summary_store
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}  # Throttled or a transient server error - worth another try
+
+
+class RateLimiter:
+    """Spaces requests at least 1/rate seconds apart across all threads (rate <= 0 = unlimited)"""
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+    
+    def acquire(self) -> float:
+        """Block until this caller's slot comes up; returns the seconds waited"""
+        if not self.interval:
+            return 0.0
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before retry `attempt` (0-based): the server's Retry-After, else full-jitter exponential"""
+    try:
+        return min(SUMMARY_BACKOFF_MAX, max(0.0, float(retry_after)))
+    except (TypeError, ValueError):
+        return random.uniform(0, min(SUMMARY_BACKOFF_MAX, SUMMARY_BACKOFF_BASE * 2 ** attempt))
+
+
+def normalize_content(text) -> str:
+    """Lowercase with whitespace collapsed, so formatting differences don't change the content key"""
+    return ' '.join(str(text or '').lower().split())
+
+
+def content_key(video_data: Dict) -> str:
+    """
+    Hash of what a summary is generated from: normalized transcript, title, duration and platform
+    The same lecture under another URL (e.g. a playlist-index variant) gets the same key
+    """
+    try:
+        duration = round(float(video_data.get('duration') or 0))
+    except (TypeError, ValueError):
+        duration = 0
+    content = '\x1f'.join([normalize_content(video_data.get('transcript')), normalize_content(video_data.get('title')),
+                           str(duration), normalize_content(video_data.get('platform'))])
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+# One connection pool and one rate limit per process, shared by every VideoSummarizer
+_http_session = None
+_http_pool_size = 0
+_rate_limiter = None
+_http_lock = threading.Lock()
+
+
+def get_http_session(pool_size: int = SUMMARY_WORKERS) -> requests.Session:
+    """Shared keep-alive session, with a connection per summary worker (the pool grows to `pool_size`)"""
+    global _http_session, _http_pool_size
+    with _http_lock:
+        if _http_session is None:
+            _http_session = requests.Session()
+        if pool_size > _http_pool_size:
+            _http_pool_size = max(1, pool_size)
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=_http_pool_size)
+            _http_session.mount('https://', adapter)
+            _http_session.mount('http://', adapter)
+        return _http_session
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _rate_limiter
+    with _http_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(SUMMARY_RATE_LIMIT)
+        return _rate_limiter
+
 
 class VideoSummarizer:
     """
@@ -15,21 +105,32 @@ class VideoSummarizer:
     2. Local summarization (fallback)
     """
     
-    def __init__(self):
+    _save_listeners: List[Callable] = []  # Shared by every instance (e.g. the quiz retrieval index)
+    _cache_stats = {'hits': 0, 'misses': 0, 'refreshes': 0, 'api_calls_saved': 0}  # Content cache, per process
+    _cache_stats_lock = threading.Lock()
+    
+    def __init__(self, store: Optional[SummaryStore] = None):
+        """store: Where summaries are kept (default: the shared data/video_summaries.db)"""
         self.openai_api_key = os.getenv('OPENAI_API_KEY', '')
-        self.summaries_file = 'data/video_summaries.json'
-        self.ensure_data_directory()
+        self.api_url = OPENAI_API_URL
+        self.session = get_http_session()
+        self.rate_limiter = get_rate_limiter()
+        self.summaries_file = 'data/video_summaries.json'  # Legacy store, imported once into summaries_db
+        self.summaries_db = 'data/video_summaries.db'
+        if store is None:
+            self.ensure_data_directory()
+            store = get_summary_store(self.summaries_db, legacy_json=self.summaries_file)
+        self.store = store
         
     def ensure_data_directory(self):
         """Create data directory if it doesn't exist"""
         os.makedirs('data', exist_ok=True)
-        if not os.path.exists(self.summaries_file):
-            with open(self.summaries_file, 'w') as f:
-                json.dump({}, f)
     
-    def summarize_video(self, video_data: Dict) -> Dict:
+    def summarize_video(self, video_data: Dict, force_refresh: bool = False) -> Dict:
         """
         Generate comprehensive summary of a video
+        A summary already generated from the same transcript, title and duration is reused
+        (under any URL) unless force_refresh is set
         
         Args:
             video_data: Dict containing video information
@@ -38,6 +139,7 @@ class VideoSummarizer:
                 - url: Video URL
                 - duration: Video duration in seconds
                 - transcript: Video transcript (optional)
+            force_refresh: Always generate a new summary
                 
         Returns:
             Dict containing:
@@ -53,21 +155,128 @@ class VideoSummarizer:
         title = video_data.get('title', 'Unknown Video')
         platform = video_data.get('platform', 'unknown')
         transcript = video_data.get('transcript', '')
+        key = content_key(video_data)
+        
+        use_api = bool(self.openai_api_key and transcript)
+        
+        if not force_refresh:
+            cached = self.store.get_by_content(key)
+            # A local summary is no substitute for an API one while the API can be tried
+            if cached and not (use_api and cached[1].get('method') == 'local_analysis'):
+                return self._reuse_summary(video_data, *cached)
+        self._count_cache('refreshes' if force_refresh else 'misses')
         
         print(f"📝 Generating summary for: {title}")
         
         # Try OpenAI first if API key is available
-        if self.openai_api_key and transcript:
+        if use_api:
             summary = self._summarize_with_openai(video_data)
         else:
             # Fallback to local summarization
             summary = self._generate_local_summary(video_data)
         
+        # Local fallback after an API error: don't index it, so the next request tries the API again
+        if not (use_api and summary.get('method') == 'local_analysis'):
+            summary['content_key'] = key
+        
         # Save summary
-        self._save_summary(video_data['url'], summary)
+        self._save_summary(video_data['url'], summary, video_data)
         
         return summary
     
+    def _reuse_summary(self, video_data: Dict, cached_url: str, cached: Dict) -> Dict:
+        """Return the summary saved for identical content, saving it under this URL too if it is a new one"""
+        
+        self._count_cache('hits', api_call_saved=cached.get('method') == 'openai_gpt4')
+        summary = dict(cached)
+        if cached_url != video_data['url']:
+            print(f"♻️ Reusing summary of {cached_url} for: {video_data.get('title', 'Unknown Video')}")
+            self._save_summary(video_data['url'], summary, video_data)
+        return summary
+    
+    @classmethod
+    def _count_cache(cls, outcome: str, api_call_saved: bool = False):
+        with cls._cache_stats_lock:
+            cls._cache_stats[outcome] += 1
+            cls._cache_stats['api_calls_saved'] += api_call_saved
+    
+    @classmethod
+    def get_cache_stats(cls) -> Dict:
+        """Content cache counters for this process, with the hit rate over non-forced lookups"""
+        with cls._cache_stats_lock:
+            stats = dict(cls._cache_stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
+    
+    def summarize_many(self, videos: List[Dict], workers: int = SUMMARY_WORKERS,
+                       force_refresh: bool = False) -> List[Optional[Dict]]:
+        """
+        Summarize several videos concurrently - results are in the same order as `videos`
+        At most `workers` videos are in progress at once; they share the connection pool and
+        rate limit. A video that fails outright gets None instead of stopping the batch.
+        Videos with identical content are summarized once; the repeats reuse that summary.
+        """
+        
+        if not videos:
+            return []
+        if self.session is _http_session:
+            # Connections beyond the pool size would be discarded after each request ("pool is full")
+            get_http_session(workers)
+        
+        def summarize(video_data: Dict, refresh: bool) -> Optional[Dict]:
+            try:
+                return self.summarize_video(video_data, force_refresh=refresh)
+            except Exception as e:
+                print(f"⚠️ Could not summarize {video_data.get('url', video_data.get('title'))}: {str(e)}")
+                return None
+        
+        # Only the first video with each content key goes to the pool, so repeats can't race it to the API
+        first_seen: Dict[str, int] = {}
+        for i, video_data in enumerate(videos):
+            first_seen.setdefault(content_key(video_data), i)
+        unique = sorted(first_seen.values())
+        
+        results: List[Optional[Dict]] = [None] * len(videos)
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(unique))), thread_name_prefix='summarize') as pool:
+            for i, summary in zip(unique, pool.map(lambda i: summarize(videos[i], force_refresh), unique)):
+                results[i] = summary
+        
+        for i in sorted(set(range(len(videos))) - set(unique)):
+            results[i] = summarize(videos[i], False)
+        return results
+    
+    def _post_completion(self, payload: Dict) -> requests.Response:
+        """
+        POST to the chat completions endpoint over the shared session
+        Throttling (429), 5xx and connection errors are retried with jittered exponential back-off;
+        the last response is returned (or the last connection error raised) once retries run out
+        """
+        
+        for attempt in range(SUMMARY_MAX_RETRIES + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.post(
+                    self.api_url,
+                    headers={
+                        'Authorization': f'Bearer {self.openai_api_key}',
+                        'Content-Type': 'application/json'
+                    },
+                    json=payload,
+                    timeout=SUMMARY_REQUEST_TIMEOUT
+                )
+                if response.status_code not in RETRY_STATUS_CODES or attempt == SUMMARY_MAX_RETRIES:
+                    return response
+                error, retry_after = f"HTTP {response.status_code}", response.headers.get('Retry-After')
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == SUMMARY_MAX_RETRIES:
+                    raise
+                error, retry_after = type(e).__name__, None
+            
+            delay = backoff_delay(attempt, retry_after)
+            print(f"⏳ OpenAI {error}, retrying in {delay:.1f}s ({attempt + 1}/{SUMMARY_MAX_RETRIES})")
+            time.sleep(delay)
+    
     def _summarize_with_openai(self, video_data: Dict) -> Dict:
         """Use OpenAI GPT-4 for advanced summarization"""
         
@@ -92,23 +301,15 @@ class VideoSummarizer:
         """
         
         try:
-            response = requests.post(
-                'https://api.openai.com/v1/chat/completions',
-                headers={
-                    'Authorization': f'Bearer {self.openai_api_key}',
-                    'Content-Type': 'application/json'
-                },
-                json={
-                    'model': 'gpt-4',
-                    'messages': [
-                        {'role': 'system', 'content': 'You are an expert at summarizing educational content.'},
-                        {'role': 'user', 'content': prompt}
-                    ],
-                    'temperature': 0.7,
-                    'max_tokens': 1000
-                },
-                timeout=30
-            )
+            response = self._post_completion({
+                'model': OPENAI_MODEL,
+                'messages': [
+                    {'role': 'system', 'content': 'You are an expert at summarizing educational content.'},
+                    {'role': 'user', 'content': prompt}
+                ],
+                'temperature': 0.7,
+                'max_tokens': 1000
+            })
             
             if response.status_code == 200:
                 result = response.json()
@@ -265,22 +466,27 @@ class VideoSummarizer:
         
         return questions
     
-    def _save_summary(self, video_url: str, summary: Dict):
+    @classmethod
+    def add_save_listener(cls, callback: Callable[[str, Dict, Optional[Dict]], None]):
+        """Call `callback(video_url, summary, video_data)` whenever any summarizer saves a summary"""
+        if callback not in cls._save_listeners:
+            cls._save_listeners.append(callback)
+    
+    def _notify_listeners(self, video_url: str, summary: Dict, video_data: Optional[Dict]):
+        for callback in list(self._save_listeners):
+            try:
+                callback(video_url, summary, video_data)
+            except Exception as e:
+                print(f"⚠️ Summary listener failed: {str(e)}")
+    
+    def _save_summary(self, video_url: str, summary: Dict, video_data: Optional[Dict] = None):
         """Save summary to persistent storage"""
         
         try:
-            # Load existing summaries
-            with open(self.summaries_file, 'r') as f:
-                summaries = json.load(f)
-            
-            # Add new summary
-            summaries[video_url] = summary
-            
-            # Save back
-            with open(self.summaries_file, 'w') as f:
-                json.dump(summaries, f, indent=2)
+            self.store.put(video_url, summary)
             
             print(f"💾 Summary saved for: {video_url}")
+            self._notify_listeners(video_url, summary, video_data)
             
         except Exception as e:
             print(f"⚠️ Error saving summary: {str(e)}")
@@ -289,9 +495,7 @@ class VideoSummarizer:
         """Retrieve saved summary for a video"""
         
         try:
-            with open(self.summaries_file, 'r') as f:
-                summaries = json.load(f)
-            return summaries.get(video_url)
+            return self.store.get(video_url)
         except:
             return None
     
@@ -299,49 +503,31 @@ class VideoSummarizer:
         """Get all saved summaries"""
         
         try:
-            with open(self.summaries_file, 'r') as f:
-                return json.load(f)
+            return self.store.get_all()
         except:
             return {}
     
     def get_recent_summaries(self, limit: int = 10) -> List[Dict]:
-        """Get most recent summaries"""
+        """Get most recent summaries (newest first, from the timestamp index)"""
         
-        summaries = self.get_all_summaries()
-        
-        # Convert to list with URLs
-        summary_list = [
-            {**data, 'url': url}
-            for url, data in summaries.items()
-        ]
-        
-        # Sort by timestamp (newest first)
-        summary_list.sort(
-            key=lambda x: x.get('timestamp', ''),
-            reverse=True
-        )
-        
-        return summary_list[:limit]
+        try:
+            return self.store.get_recent(limit)
+        except:
+            return []
     
-    def search_summaries(self, query: str) -> List[Dict]:
-        """Search summaries by keyword"""
-        
-        query_lower = query.lower()
-        summaries = self.get_all_summaries()
-        
-        results = []
-        for url, data in summaries.items():
-            # Search in summary text, topics, and takeaways
-            searchable_text = (
-                data.get('quick_summary', '') + ' ' +
-                ' '.join(data.get('topics_covered', [])) + ' ' +
-                ' '.join(data.get('key_takeaways', []))
-            ).lower()
-            
-            if query_lower in searchable_text:
-                results.append({**data, 'url': url})
+    def search_summaries(self, query: str, limit: int = None) -> List[Dict]:
+        """
+        Search summaries by keyword (summary text, topics and takeaways)
+        Every word must match, whole or as a prefix; best matches first
+        """
         
-        return results
+        if not query.strip():
+            return [{**data, 'url': url} for url, data in self.get_all_summaries().items()]
+        
+        try:
+            return self.store.search(query, limit)
+        except:
+            return []
 
 
 # Example usage